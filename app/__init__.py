@@ -1,3 +1,26 @@
-from .goldbar import GoldBarWeighing
-from .web_driver_utilities import WebDriverUtility
-from .web_driver_config import WebDriver
\ No newline at end of file
+import importlib
+
+# Modules are loaded on first use, so solver-only code does not load Selenium
+_EXPORTS = {
+    "GoldBarWeighing": ".goldbar",
+    "WebDriverUtility": ".web_driver_utilities",
+    "WebDriver": ".web_driver_config",
+    "OddBarPlanner": ".planner",
+    "TernarySearchPlanner": ".planner",
+    "Scale": ".scale",
+    "SimulatedScale": ".scale",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
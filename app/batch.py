@@ -0,0 +1,243 @@
+# batch.py
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .goldbar import GoldBarWeighing
+from .governor import ResourceGovernor
+from .logger import game_logger
+from .metrics import PhaseTimer
+
+# Phases of each game, in the order they run
+BATCH_PHASES = ["load", "solve", "validate", "history"]
+SCENARIO_KEYS = ("left_bar", "right_bar", "remaining")
+
+
+def load_scenarios(path: str) -> Iterator[Tuple[Any, Dict[str, List[int]]]]:
+    """
+    Reads scenarios from a JSONL file, one per line, like the bars of config.json:
+    {"id": "a", "left_bar": [0, 1, 2], "right_bar": [3, 4, 5], "remaining": [6, 7, 8]}
+
+    Args:
+    path (str): The scenario file. Blank lines are skipped.
+
+    Returns:
+    Iterator[Tuple[Any, Dict[str, List[int]]]]: The ID of each scenario, its "id" or else its
+    line number, and the scenario.
+
+    Raises:
+    ValueError: If a line is not a scenario.
+    """
+    with open(path, "r") as scenario_file:
+        for number, line in enumerate(scenario_file, 1):
+            if not line.strip():
+                continue
+            scenario = json.loads(line)
+            missing = [key for key in SCENARIO_KEYS if key not in scenario]
+            if missing:
+                raise ValueError(f"Line {number} of {path} has no {', '.join(missing)}")
+            yield scenario.get("id", number), scenario
+
+
+def completed_ids(path: str) -> Set[Any]:
+    """
+    Reads the IDs of the games already in an output file. A line cut off by a killed run is
+    skipped, so that game is played again.
+
+    Args:
+    path (str): The output file of an earlier run.
+
+    Returns:
+    Set[Any]: The IDs of the games with a result.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r") as output_file:
+        for line in output_file:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+def learn_prior(path: str, n: int, smoothing: float = 1.0) -> List[float]:
+    """
+    Learns how likely each bar is to be the fake one from the results of earlier runs.
+
+    Args:
+    path (str): An output file of BatchRunner.
+    n (int): Number of bars.
+    smoothing (float): Added to the count of every bar, so bars never seen fake stay possible.
+
+    Returns:
+    List[float]: The probability of each bar.
+    """
+    counts = [smoothing] * n
+    with open(path, "r") as results_file:
+        for line in results_file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("found") and isinstance(result.get("fake_bar"), int) and 0 <= result["fake_bar"] < n:
+                counts[result["fake_bar"]] += 1
+    total = sum(counts)
+    if total <= 0:
+        raise ValueError(f"No fake bar found in {path}, and no smoothing")
+    return [count / total for count in counts]
+
+
+class BatchRunner:
+
+    def __init__(self,
+                 gb: GoldBarWeighing,
+                 url: str,
+                 governor: Optional[ResourceGovernor] = None,
+                 factory: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Plays scenarios one after another in a single browser session. Each game reloads the
+        game page, which is far cheaper than a browser launch.
+
+        Args:
+        gb (GoldBarWeighing): The game session to play in.
+        url (str): The game page, loaded again for each game.
+        governor (Optional[ResourceGovernor]): Samples the memory and CPU of the browser between
+        games. A browser over a limit is quit and replaced, if there is a factory.
+        factory (Optional[Callable[[], WebDriver]]): Launches the driver that replaces one over a limit.
+        """
+        self.gb = gb
+        self.url = url
+        self.governor = governor
+        self.factory = factory
+        self.timer = PhaseTimer()
+        self.restarts = 0
+
+    def play(self, game_id: Any, scenario: Dict[str, List[int]]) -> Dict[str, Any]:
+        """
+        Plays one scenario.
+
+        Args:
+        game_id (Any): Identifies the game in the output and the logs.
+        scenario (Dict[str, List[int]]): The 'left_bar', 'right_bar' and 'remaining' bars of
+        the first weighing.
+
+        Returns:
+        Dict[str, Any]: The ID, the fake bar found, whether the answer was right, the weighings,
+        the milliseconds of each phase and of the game, and the error, if any.
+        """
+        result: Dict[str, Any] = {"id": game_id, "fake_bar": None, "found": False, "weighings": None,
+                                  "phases": {}, "error": None}
+        self.gb.logger = game_logger(game_id)
+        # Each phase and the result it fills, if any
+        steps = {
+            "load": (None, lambda: self.gb.open_game(self.url)),
+            "solve": ("fake_bar", lambda: self.gb.find_fake_bar(
+                left=scenario['left_bar'],
+                right=scenario['right_bar'],
+                remaining=scenario['remaining'])),
+            "validate": ("found", lambda: bool(self.gb.validate_answer(result["fake_bar"]))),
+            "history": ("weighings", lambda: [list(record) for record in self.gb.scale.weighing_records()]),
+        }
+        start = time.perf_counter()
+        phase_start = start
+        try:
+            for phase in BATCH_PHASES:
+                key, step = steps[phase]
+                value = step()
+                if key is not None:
+                    result[key] = value
+                now = time.perf_counter()
+                result["phases"][phase] = (now - phase_start) * 1000
+                self.timer.record(phase, result["phases"][phase])
+                phase_start = now
+        except Exception as e:
+            self.gb.logger.error(f"Some error occurred while playing the game: {e}")
+            result["error"] = str(e)
+        result["total"] = (time.perf_counter() - start) * 1000
+        if self.governor is not None and self.governor.after_game(self.gb.driver):
+            self.restart()
+        return result
+
+    def restart(self) -> None:
+        """
+        Quits the browser and plays the next games in a fresh one from the factory.
+        Without a factory the browser is kept.
+        """
+        if self.factory is None:
+            return
+        driver = self.gb.driver
+        if self.governor is not None:
+            self.governor.forget(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.gb.logger.error(f"Some error occurred while quitting the browser: {e}")
+        self.gb.use_driver(self.factory())
+        self.restarts += 1
+
+    def run(self, scenarios_path: str, output_path: str, resume: bool = True) -> Dict[str, Any]:
+        """
+        Plays every scenario of a file and appends each result to the output file as soon as
+        it is known. Run again with resume, it skips the games already in the output.
+
+        Args:
+        scenarios_path (str): The JSONL scenario file.
+        output_path (str): The JSONL result file.
+        resume (bool): Keep the results of an earlier run. Without resume the output starts empty.
+
+        Returns:
+        Dict[str, Any]: The games played and skipped, how many were found and failed, the games
+        per second, for each phase its share of the time and its latency percentiles, the
+        percentiles of each weighing path and in-page step, and the browser restarts.
+        """
+        done = completed_ids(output_path) if resume else set()
+        games = skipped = found = errors = 0
+        start = time.perf_counter()
+        with open(output_path, "a" if resume else "w") as output_file:
+            if output_file.tell() and not self._ends_with_newline(output_path):
+                # The last result of a killed run was cut off
+                output_file.write("\n")
+            for game_id, scenario in load_scenarios(scenarios_path):
+                if game_id in done:
+                    skipped += 1
+                    continue
+                result = self.play(game_id, scenario)
+                output_file.write(json.dumps(result) + "\n")
+                output_file.flush()
+                done.add(game_id)
+                games += 1
+                found += result["found"]
+                errors += result["error"] is not None
+        elapsed = time.perf_counter() - start
+
+        phases = self.timer.summary()
+        phase_time = sum(sum(values) for values in self.timer.samples.values())
+        for phase, stats in phases.items():
+            stats["share"] = sum(self.timer.samples[phase]) / phase_time if phase_time else 0.0
+        return {
+            "games": games,
+            "skipped": skipped,
+            "found": found,
+            "errors": errors,
+            "seconds": elapsed,
+            "games_per_second": games / elapsed if elapsed else 0.0,
+            "phases": phases,
+            "weigh": self.gb.weigh_timer.summary(),
+            "restarts": self.restarts,
+        }
+
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as output_file:
+            output_file.seek(-1, os.SEEK_END)
+            return output_file.read(1) == b"\n"
+
+
+if __name__ == "__main__":
+    from .cli import main
+    sys.exit(main(["batch"] + sys.argv[1:]))
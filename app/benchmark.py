@@ -0,0 +1,142 @@
+# benchmark.py
+
+import contextlib
+import io
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from .goldbar import GoldBarWeighing
+from .metrics import PhaseTimer
+from .web_driver_config import WebDriver
+
+# Phases of a game, in the order they run
+PHASES = ["launch", "get", "reset", "enter_bars_on_bowl", "click_weigh", "wait_for_element",
+          "get_text", "fused_weigh", "validate_answer", "print_weighings_list"]
+STATS = ["p50", "p95", "p99"]
+
+
+def run_benchmark(url: str,
+                  left: Sequence[int],
+                  right: Sequence[int],
+                  remaining: Sequence[int],
+                  repetitions: int = 20,
+                  launches: int = 3,
+                  headless: bool = True,
+                  factory: Optional[Callable[[], RemoteWebDriver]] = None,
+                  backend: str = "webdriver") -> Dict[str, Any]:
+    """
+    Times every phase of a game separately, over many repetitions. Each repetition loads the
+    page, weighs the given bowls once and guesses a bar. Browser launches are timed separately,
+    as they take far longer than a game.
+
+    Args:
+    url (str): The game page, like the one from LocalGameServer.
+    left (Sequence[int]): Bars on the left side of the scale.
+    right (Sequence[int]): Bars on the right side of the scale.
+    remaining (Sequence[int]): Bars that will not be weighed.
+    repetitions (int): Number of games to time.
+    launches (int): Number of browser launches to time.
+    headless (bool): If True, the browsers will be run in headless mode.
+    factory (Optional[Callable[[], RemoteWebDriver]]): Launches a driver.
+    Defaults to a Chrome driver from WebDriver.
+    backend (str): 'webdriver' sends every command through chromedriver, 'cdp' through the
+    DevTools Protocol websocket of the same browser. Run both to compare the per-command latency.
+
+    Returns:
+    Dict[str, Any]: The settings, the backend and, for every phase, the samples, mean, p50, p95 and p99
+    in milliseconds. 'weigh' splits the fused weighing into its in-page fill, click and wait and
+    the WebDriver overhead around them.
+    """
+    factory = factory or (lambda: WebDriver(headless=headless).driver)
+    timer = PhaseTimer()
+
+    driver = None
+    for _ in range(max(launches, 1)):
+        if driver is not None:
+            driver.quit()
+        with timer.measure("launch"):
+            driver = factory()
+
+    tab = None
+    if backend == "cdp":
+        from .cdp import CDPTab, CDPUtility
+        tab = CDPTab.from_driver(driver)
+        gb = GoldBarWeighing(tab, webutils=CDPUtility(tab))
+    else:
+        gb = GoldBarWeighing(driver)
+    try:
+        for _ in range(repetitions):
+            with timer.measure("get"):
+                gb.webutils.navigate(url)
+            with timer.measure("reset"):
+                gb.reset()
+            with timer.measure("enter_bars_on_bowl"):
+                gb.enter_bars_on_bowl(list(left), 'left')
+                gb.enter_bars_on_bowl(list(right), 'right')
+            with timer.measure("click_weigh"):
+                gb.webutils.click_button_by_id("weigh")
+            with timer.measure("wait_for_element"):
+                gb.webutils.wait_for_element('reset', ['<', '>', '='])
+            with timer.measure("get_text"):
+                result = gb.webutils.get_text("reset")
+            # The same weighing again in one script call, timed inside the page as well
+            with timer.measure("fused_weigh"):
+                gb.weigh_fused(list(left), list(right))
+
+            suspected = gb.find_suspected_bars(list(left), list(right), list(remaining), result)
+            # The game prints its alert and weighings, which would flood the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                with timer.measure("validate_answer"):
+                    gb.validate_answer(suspected[0])
+                with timer.measure("print_weighings_list"):
+                    gb.print_weighings_list()
+    finally:
+        if tab is not None:
+            tab.quit()
+        driver.quit()
+
+    return {
+        "url": url,
+        "backend": backend,
+        "repetitions": repetitions,
+        "launches": max(launches, 1),
+        "phases": timer.summary(),
+        "weigh": gb.weigh_timer.summary(),
+    }
+
+
+def compare(report: Dict[str, Any],
+            baseline: Dict[str, Any],
+            tolerance: float = 0.25,
+            slack_ms: float = 2.0) -> List[str]:
+    """
+    Finds the phases that got slower than the baseline.
+
+    Args:
+    report (Dict[str, Any]): A report from run_benchmark.
+    baseline (Dict[str, Any]): A stored report to compare with.
+    tolerance (float): How much slower a percentile may be, 0.25 is 25%.
+    slack_ms (float): Extra milliseconds allowed, so sub-millisecond phases do not fail on noise.
+
+    Returns:
+    List[str]: One message per regression, empty if there are none.
+    """
+    regressions = []
+    for phase, expected in baseline["phases"].items():
+        measured = report["phases"].get(phase)
+        if measured is None:
+            regressions.append(f"{phase}: not measured")
+            continue
+        for stat in STATS:
+            limit = expected[stat] * (1 + tolerance) + slack_ms
+            if measured[stat] > limit:
+                regressions.append(f"{phase} {stat}: {measured[stat]:.2f} ms, baseline "
+                                   f"{expected[stat]:.2f} ms, limit {limit:.2f} ms")
+    return regressions
+
+
+if __name__ == "__main__":
+    from .cli import main
+    sys.exit(main(["bench"] + sys.argv[1:]))
@@ -0,0 +1,205 @@
+# browser_daemon.py
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from .logger import setup_logger
+
+# Where a running daemon tells the games its debugger address
+DEFAULT_STATE_FILE = os.path.join(tempfile.gettempdir(), "goldbar_browser.json")
+CHROME_NAMES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+
+def find_chrome() -> str:
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError(f"Chrome was not found, looked for {', '.join(CHROME_NAMES)}")
+
+
+def read_state(state_file: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Reads the state of a running daemon.
+
+    Args:
+    state_file (Optional[str]): The file the daemon writes when it starts. Defaults to DEFAULT_STATE_FILE.
+
+    Returns:
+    Optional[Dict[str, Any]]: The daemon and Chrome process IDs, the port and the debugger
+    address, or None if no daemon is running.
+    """
+    try:
+        with open(state_file or DEFAULT_STATE_FILE, "r") as state:
+            data = json.load(state)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.kill(data["pid"], 0)
+    except (OSError, KeyError):
+        # The daemon died without cleaning up
+        return None
+    return data
+
+
+class BrowserDaemon:
+
+    def __init__(self,
+                 port: int = 9222,
+                 headless: bool = True,
+                 idle_timeout: float = 600.0,
+                 poll_interval: float = 1.0,
+                 max_restarts: int = 5,
+                 state_file: Optional[str] = None,
+                 command: Optional[List[str]] = None) -> None:
+        """
+        Keeps one Chrome running with a remote debugging endpoint, so games attach to it and
+        open a tab each instead of booting a browser. Chrome is started again if it crashes,
+        and the daemon stops once no game has used the browser for idle_timeout seconds.
+
+        Args:
+        port (int): The remote debugging port of Chrome.
+        headless (bool): If True, the browser will be run in headless mode.
+        idle_timeout (float): Seconds without an open game tab before the daemon stops.
+        poll_interval (float): Seconds between two checks of the browser.
+        max_restarts (int): Most crash restarts before the daemon gives up.
+        state_file (Optional[str]): Where the debugger address is written for the games.
+        Defaults to DEFAULT_STATE_FILE.
+        command (Optional[List[str]]): The command that starts the browser. Defaults to Chrome.
+        """
+        self.port = port
+        self.headless = headless
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.max_restarts = max_restarts
+        self.state_file = state_file or DEFAULT_STATE_FILE
+        self.command = command
+        self.logger = setup_logger()
+        self.process: Optional[subprocess.Popen] = None
+        self.profile: Optional[tempfile.TemporaryDirectory] = None
+        self.restarts = 0
+        self.last_active = time.monotonic()
+        self.stopping = False
+
+    @property
+    def debugger_address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def browser_command(self) -> List[str]:
+        if self.command is not None:
+            return list(self.command)
+        command = [find_chrome(), f"--remote-debugging-port={self.port}",
+                   f"--user-data-dir={self.profile.name}", "--no-first-run",
+                   "--no-default-browser-check", "--no-sandbox", "--disable-dev-shm-usage"]
+        if self.headless:
+            command.append("--headless=new")
+        # The blank tab keeps the browser open when the last game closes its own tab
+        return command + ["about:blank"]
+
+    def launch(self) -> None:
+        if self.profile is None:
+            self.profile = tempfile.TemporaryDirectory(prefix="goldbar_chrome_")
+        self.process = subprocess.Popen(self.browser_command(), stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        self.last_active = time.monotonic()
+        self.logger.info(f"Browser daemon started Chrome {self.process.pid} on {self.debugger_address}")
+
+    def start(self) -> None:
+        """
+        Starts the browser and writes the state file the games read the debugger address from.
+        """
+        self.launch()
+        self.write_state()
+
+    def write_state(self) -> None:
+        state = {"pid": os.getpid(), "chrome_pid": self.process.pid, "port": self.port,
+                 "debugger_address": self.debugger_address}
+        with open(self.state_file, "w") as state_file:
+            json.dump(state, state_file)
+
+    def game_tabs(self) -> int:
+        """
+        Counts the tabs that hold a page, read from the debugging endpoint.
+        Returns 0 when the endpoint does not answer.
+        """
+        # Only the daemon polls the endpoint, the games that import this module do not need urllib
+        import urllib.request
+
+        try:
+            with urllib.request.urlopen(f"http://{self.debugger_address}/json/list", timeout=2) as response:
+                targets = json.load(response)
+        except (OSError, ValueError):
+            return 0
+        return sum(1 for target in targets
+                   if target.get("type") == "page" and target.get("url") != "about:blank")
+
+    def check(self) -> bool:
+        """
+        One supervision step: restarts a crashed browser and tracks how long it is idle.
+
+        Returns:
+        bool: False once the daemon should stop.
+        """
+        if self.stopping:
+            return False
+        if self.process.poll() is not None:
+            if self.restarts >= self.max_restarts:
+                self.logger.error(f"Chrome exited {self.restarts} times, the browser daemon stops")
+                return False
+            self.restarts += 1
+            self.logger.warning(f"Chrome exited with code {self.process.returncode}, restarting")
+            self.launch()
+            self.write_state()
+            return True
+
+        if self.game_tabs():
+            self.last_active = time.monotonic()
+        elif time.monotonic() - self.last_active >= self.idle_timeout:
+            self.logger.info(f"No game for {self.idle_timeout:.0f} s, the browser daemon stops")
+            return False
+        return True
+
+    def serve(self) -> None:
+        """
+        Supervises the browser until it is idle, or the daemon is stopped with SIGTERM or SIGINT.
+        """
+        def request_stop(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        with self:
+            while self.check():
+                time.sleep(self.poll_interval)
+
+    def stop(self) -> None:
+        """
+        Quits the browser and removes the state file.
+        """
+        self.stopping = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        state = read_state(self.state_file)
+        if state is not None and state["pid"] == os.getpid():
+            os.remove(self.state_file)
+        if self.profile is not None:
+            self.profile.cleanup()
+            self.profile = None
@@ -0,0 +1,467 @@
+# cdp.py
+
+import itertools
+import json
+import math
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent import futures
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import trio
+import trio_websocket
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, TimeoutException
+
+from .web_driver_utilities import WebDriverUtility
+
+# Clicks an element from the page, like WebElement.click(). Returns false if it is missing.
+CLICK_SCRIPT = """
+const selector = arguments[0];
+const by = arguments[1];
+const element = by === 'css' ? document.querySelector(selector) : document.getElementById(selector);
+if (!element) return false;
+element.scrollIntoView({block: 'center'});
+element.click();
+return true;
+"""
+
+# Focuses an input with the caret at the end, so inserted text is added like typed keys
+FOCUS_SCRIPT = """
+const input = document.getElementById(arguments[0]);
+if (!input) return false;
+input.focus();
+if (input.setSelectionRange) input.setSelectionRange(input.value.length, input.value.length);
+return true;
+"""
+
+TEXT_SCRIPT = """
+const element = document.getElementById(arguments[0]);
+return element ? (element.innerText || element.textContent || '').trim() : null;
+"""
+
+
+class CDPError(Exception):
+    """
+    An error answered by Chrome to a DevTools Protocol command.
+    """
+
+
+class ElementText(NamedTuple):
+    """
+    The text of an element, read in the same round trip as the element was found.
+    """
+    text: str
+
+
+class CDPTab:
+
+    def __init__(self, websocket_url: str, debugger_address: Optional[str] = None,
+                 target_id: Optional[str] = None, connect_timeout: float = 10.0) -> None:
+        """
+        A browser tab driven over the Chrome DevTools Protocol websocket, without chromedriver.
+        The websocket runs on a trio event loop in a background thread, commands are sent from
+        any thread and wait for their own answer. It offers the WebDriver methods that
+        WebDriverUtility scripts with, so it can stand in for the driver.
+
+        Args:
+        websocket_url (str): The webSocketDebuggerUrl of the tab.
+        debugger_address (Optional[str]): The host:port of the browser, to close the tab on quit.
+        target_id (Optional[str]): The ID of the tab, to close it on quit.
+        connect_timeout (float): Seconds to wait for the websocket to open.
+        """
+        self.websocket_url = websocket_url
+        self.debugger_address = debugger_address
+        self.target_id = target_id
+        self.script_timeout: Optional[float] = None
+        self.command_timeout = 30.0
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, futures.Future] = {}
+        self.listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+        self.lock = threading.Lock()
+        self.token = None
+        self.outgoing = None
+
+        ready: futures.Future = futures.Future()
+        self.thread = threading.Thread(target=trio.run, args=(self._run, ready), name="cdp", daemon=True)
+        self.thread.start()
+        ready.result(connect_timeout)
+        self.execute("Page.enable")
+
+    @classmethod
+    def open(cls, debugger_address: str, url: str = "about:blank") -> "CDPTab":
+        """
+        Opens a new tab in a browser with a remote debugging endpoint, like the browser daemon
+        or a browser started by chromedriver.
+
+        Args:
+        debugger_address (str): The host:port of the remote debugging endpoint.
+        url (str): The page the tab opens with.
+
+        Returns:
+        CDPTab: The connected tab.
+        """
+        request = urllib.request.Request(f"http://{debugger_address}/json/new?{url}", method="PUT")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            target = json.load(response)
+        return cls(target["webSocketDebuggerUrl"], debugger_address, target["id"])
+
+    @classmethod
+    def from_driver(cls, driver) -> "CDPTab":
+        """
+        Opens a new tab in the browser of a Selenium driver. chromedriver starts Chrome with a
+        remote debugging endpoint and reports its address in the capabilities.
+
+        Args:
+        driver (WebDriver): A Chrome driver.
+
+        Returns:
+        CDPTab: The connected tab.
+        """
+        return cls.open(driver.capabilities["goog:chromeOptions"]["debuggerAddress"])
+
+    async def _run(self, ready: futures.Future) -> None:
+        try:
+            async with trio_websocket.open_websocket_url(self.websocket_url,
+                                                         max_message_size=2 ** 26) as websocket:
+                self.token = trio.lowlevel.current_trio_token()
+                self.outgoing, incoming = trio.open_memory_channel(math.inf)
+                ready.set_result(None)
+                async with trio.open_nursery() as nursery:
+                    nursery.start_soon(self._write, websocket, incoming)
+                    await self._read(websocket)
+                    nursery.cancel_scope.cancel()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The DevTools connection closed"))
+
+    @staticmethod
+    async def _write(websocket, incoming) -> None:
+        async for message in incoming:
+            await websocket.send_message(message)
+        await websocket.aclose()
+
+    async def _read(self, websocket) -> None:
+        while True:
+            try:
+                message = json.loads(await websocket.get_message())
+            except trio_websocket.ConnectionClosed:
+                return
+            if "id" in message:
+                with self.lock:
+                    future = self.pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(CDPError(message["error"].get("message", message["error"])))
+                else:
+                    future.set_result(message.get("result", {}))
+            else:
+                for listener in list(self.listeners.get(message.get("method"), [])):
+                    listener(message.get("params", {}))
+
+    def on(self, event: str, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Calls the listener with the parameters of every event of this kind. Listeners run on
+        the websocket thread, so they should only hand the event over.
+
+        Args:
+        event (str): The event name, like 'Page.javascriptDialogOpening'.
+        listener (Callable[[Dict[str, Any]], None]): Called with the event parameters.
+        """
+        self.listeners[event].append(listener)
+
+    def expect(self, event: str) -> futures.Future:
+        """
+        Returns a future for the next event of this kind. Ask for it before the command that
+        causes the event, so the event can not be missed.
+        """
+        future: futures.Future = futures.Future()
+
+        def listener(params: Dict[str, Any]) -> None:
+            self.listeners[event].remove(listener)
+            future.set_result(params)
+
+        self.on(event, listener)
+        return future
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> futures.Future:
+        """
+        Sends a command without waiting for its answer.
+
+        Args:
+        method (str): The DevTools Protocol method.
+        params (Optional[Dict[str, Any]]): Its parameters.
+
+        Returns:
+        futures.Future: Resolves to the result of the command, or raises CDPError.
+        """
+        future: futures.Future = futures.Future()
+        with self.lock:
+            command_id = next(self.ids)
+            self.pending[command_id] = future
+        message = json.dumps({"id": command_id, "method": method, "params": params or {}})
+        try:
+            trio.from_thread.run_sync(self.outgoing.send_nowait, message, trio_token=self.token)
+        except (trio.RunFinishedError, trio.ClosedResourceError):
+            with self.lock:
+                self.pending.pop(command_id, None)
+            raise ConnectionError("The DevTools connection closed")
+        return future
+
+    def execute(self, method: str, params: Optional[Dict[str, Any]] = None,
+                timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Sends a command and waits for its answer.
+
+        Args:
+        method (str): The DevTools Protocol method.
+        params (Optional[Dict[str, Any]]): Its parameters.
+        timeout (Optional[float]): Seconds to wait. Defaults to command_timeout.
+
+        Returns:
+        Dict[str, Any]: The result of the command.
+
+        Raises:
+        CDPError: If Chrome answers with an error.
+        TimeoutException: If there is no answer within the timeout.
+        """
+        try:
+            return self.send(method, params).result(timeout or self.command_timeout)
+        except futures.TimeoutError:
+            raise TimeoutException(f"No answer to {method} within {timeout or self.command_timeout:.2f}s")
+
+    @staticmethod
+    def script_expression(script: str, args: List[Any], asynchronous: bool = False) -> str:
+        """
+        Wraps a WebDriver script, which reads its arguments from `arguments`, into an expression.
+        An asynchronous script gets a callback as its last argument and becomes a promise.
+        """
+        call = f"(function() {{\n{script}\n}})"
+        if asynchronous:
+            return f"new Promise((done) => {call}.apply(null, {json.dumps(args)}.concat([done])))"
+        return f"{call}.apply(null, {json.dumps(args)})"
+
+    @staticmethod
+    def value(result: Dict[str, Any]) -> Any:
+        """
+        Returns the value of a Runtime.evaluate result.
+
+        Raises:
+        JavascriptException: If the script threw.
+        """
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise JavascriptException(message)
+        return result.get("result", {}).get("value")
+
+    def evaluate(self, expression: str, await_promise: bool = False, timeout: Optional[float] = None) -> Any:
+        return self.value(self.execute("Runtime.evaluate", {"expression": expression, "returnByValue": True,
+                                                            "awaitPromise": await_promise}, timeout))
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        return self.evaluate(self.script_expression(script, list(args)))
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        return self.evaluate(self.script_expression(script, list(args), asynchronous=True),
+                             await_promise=True, timeout=self.script_timeout)
+
+    def set_script_timeout(self, timeout: float) -> None:
+        self.script_timeout = timeout
+
+    def get(self, url: str) -> None:
+        """
+        Opens a page and waits for it to load.
+
+        Args:
+        url (str): The URL to open.
+        """
+        loaded = self.expect("Page.loadEventFired")
+        navigation = self.execute("Page.navigate", {"url": url})
+        if navigation.get("errorText"):
+            raise CDPError(f"Could not open {url}: {navigation['errorText']}")
+        try:
+            loaded.result(self.command_timeout)
+        except futures.TimeoutError:
+            raise TimeoutException(f"{url} did not load within {self.command_timeout:.2f}s")
+
+    def close(self) -> None:
+        """
+        Closes the tab.
+        """
+        if self.debugger_address is not None and self.target_id is not None:
+            try:
+                urllib.request.urlopen(f"http://{self.debugger_address}/json/close/{self.target_id}",
+                                       timeout=10).close()
+            except OSError:
+                pass
+            self.target_id = None
+
+    def quit(self) -> None:
+        """
+        Closes the tab and the websocket.
+        """
+        self.close()
+        if self.thread.is_alive():
+            try:
+                trio.from_thread.run_sync(self.outgoing.close, trio_token=self.token)
+            except trio.RunFinishedError:
+                pass
+            self.thread.join(timeout=10)
+
+
+class CDPUtility(WebDriverUtility):
+
+    def __init__(self, tab: CDPTab):
+        """
+        WebDriverUtility over the DevTools Protocol. Every call is one websocket message to the
+        tab instead of a chromedriver HTTP request and the commands chromedriver sends for it.
+        Alerts are reported by Chrome with Page.javascriptDialogOpening, so they are not polled.
+
+        Args:
+        tab (CDPTab): The tab to play the game in.
+        """
+        super().__init__(tab)
+        self.dialog: futures.Future = futures.Future()
+        tab.on("Page.javascriptDialogOpening", self._dialog_opened)
+
+    def _dialog_opened(self, params: Dict[str, Any]) -> None:
+        if not self.dialog.done():
+            self.dialog.set_result(params)
+
+    def _click(self, selector: str, by: str) -> None:
+        clicked = self.driver.send("Runtime.evaluate", {
+            "expression": self.driver.script_expression(CLICK_SCRIPT, [selector, by]),
+            "returnByValue": True})
+        # A click that opens an alert only gets its answer once the alert is closed
+        done, _ = futures.wait([clicked, self.dialog], timeout=self.driver.command_timeout,
+                               return_when=futures.FIRST_COMPLETED)
+        if clicked in done and not self.driver.value(clicked.result()):
+            print(f"Button with selector {selector} not found")
+            raise NoSuchElementException(f"No element matches {selector}")
+        if not done:
+            raise TimeoutException(f"The click on {selector} did not finish")
+
+    def click_button_by_id(self, selector: str) -> None:
+        """
+        Clicks a button based on its ID.
+
+        Args:
+        selector (str): The ID of the button to click.
+
+        Raises:
+        NoSuchElementException: If the button cannot be found.
+        """
+        self._click(selector, "id")
+
+    def click_button_by_css(self, selector: str) -> None:
+        """
+        Clicks a button based on a CSS selector.
+
+        Args:
+        selector (str): The CSS selector of the button to click.
+
+        Raises:
+        NoSuchElementException: If the button cannot be found.
+        """
+        self._click(selector, "css")
+
+    def set_text(self, selector: str, text_string: str) -> None:
+        """
+        Types text in an input field identified by an ID. Like send_keys, the text is added
+        to what the field holds.
+
+        Args:
+        selector (str): The ID of the input field.
+        text_string (str): The text to set in the input field.
+
+        Raises:
+        NoSuchElementException: If the input field cannot be found.
+        """
+        if not self.driver.execute_script(FOCUS_SCRIPT, selector):
+            print(f"Grid with selector {selector} not found")
+            raise NoSuchElementException(f"No element with ID {selector}")
+        self.driver.execute("Input.insertText", {"text": text_string})
+
+    def get_text(self, selector: str) -> str:
+        """
+        Retrieves text from an element identified by an ID.
+
+        Args:
+        selector (str): The ID of the element.
+
+        Returns:
+        str: The text of the element.
+
+        Raises:
+        NoSuchElementException: If the element cannot be found.
+        """
+        text = self.driver.execute_script(TEXT_SCRIPT, selector)
+        if text is None:
+            print(f"Element with selector {selector} not found")
+            raise NoSuchElementException(f"No element with ID {selector}")
+        return text
+
+    def get_elements_by_css(self, selector: str) -> List[ElementText]:
+        """
+        Retrieves the text of every element that matches a CSS selector, in one round trip.
+
+        Args:
+        selector (str): The CSS selector of the elements to retrieve.
+
+        Returns:
+        List[ElementText]: The elements found, each with its text.
+        """
+        return [ElementText(text) for text in self.get_texts_by_css(selector)]
+
+    def wait_for_alert(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Waits for Chrome to report an alert.
+
+        Args:
+        timeout (Optional[float]): Timeout in seconds. By default a multiple of the p99 latency
+        of earlier alerts.
+
+        Returns:
+        Dict[str, Any]: The Page.javascriptDialogOpening parameters, with the 'message'.
+
+        Raises:
+        TimeoutException: If no alert opens within the timeout.
+        """
+        adaptive = self.timeout_for("alert")
+        if timeout is None:
+            timeout = adaptive.timeout()
+        start = time.perf_counter()
+        try:
+            dialog = self.dialog.result(timeout)
+        except futures.TimeoutError:
+            raise TimeoutException(f"No alert opened within {timeout:.2f}s")
+        adaptive.record(time.perf_counter() - start)
+        return dialog
+
+    def get_alert_text(self) -> str:
+        """
+        Retrieves the text from an active alert.
+
+        Returns:
+        str: The text from the alert.
+
+        Raises:
+        TimeoutException: If no alert opens within the timeout.
+        """
+        return self.wait_for_alert()["message"]
+
+    def accept_alert(self) -> None:
+        """
+        Accepts the currently active alert.
+        """
+        self.driver.execute("Page.handleJavaScriptDialog", {"accept": True})
+        self.dialog = futures.Future()
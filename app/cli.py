@@ -0,0 +1,410 @@
+# cli.py
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Milliseconds allowed to import each entry point. The solver entry points must not load Selenium.
+IMPORT_BUDGET_MS = {
+    "app.cli": 50.0,
+    "app.scale": 50.0,
+    "app.strategy": 50.0,
+}
+
+
+def load_config(path: str) -> Dict:
+    with open(path, "r") as config_file:
+        return json.load(config_file)
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Args:
+    module (str): The module to import.
+
+    Returns:
+    Dict[str, float]: The cumulative import time of every module loaded, in milliseconds.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    times = {}
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            times[match.group(2)] = int(match.group(1)) / 1000
+    return times
+
+
+def open_browser(config: Dict, debugger_address: Optional[str], stack: contextlib.ExitStack) -> Tuple:
+    """
+    Opens the browser the config asks for.
+
+    Args:
+    config (Dict): The config, with 'backend' and 'isheadless'.
+    debugger_address (Optional[str]): A running browser to open a tab in, instead of starting Chrome.
+    stack (contextlib.ExitStack): Closes what this opens, besides the returned driver.
+
+    Returns:
+    Tuple: The driver, whether it is attached to a running browser, and the utility for a
+    DevTools Protocol tab, or None for WebDriverUtility.
+    """
+    from .web_driver_config import WebDriver
+
+    if config.get('backend', 'webdriver') == 'cdp':
+        # Drive a tab over the DevTools Protocol. chromedriver is only needed to start Chrome.
+        from .cdp import CDPTab, CDPUtility
+        if debugger_address:
+            driver = CDPTab.open(debugger_address)
+        else:
+            launched = WebDriver(headless=config['isheadless']).driver
+            stack.callback(launched.quit)
+            driver = CDPTab.from_driver(launched)
+        return driver, False, CDPUtility(driver)
+    driver_obj = WebDriver(headless=config['isheadless'], debugger_address=debugger_address)
+    return driver_obj.driver, driver_obj.attached, None
+
+
+def load_prior(config: Dict) -> Optional[List[float]]:
+    """
+    Returns the prior of the config: the weight of each bar, or learned from a results file.
+    """
+    prior = config.get('prior')
+    if isinstance(prior, str):
+        from .batch import learn_prior
+        return learn_prior(prior, len(config['left_bar']) + len(config['right_bar']) + len(config['remaining']))
+    return prior
+
+
+def play(args: argparse.Namespace) -> int:
+    from .goldbar import GoldBarWeighing
+    from .logger import configure_logging, dump_recent
+    from .strategy import StrategyCache
+    from .tracing import Tracer
+
+    config = load_config(args.config)
+    configure_logging(**config.get('log', {}))
+    with contextlib.ExitStack() as stack:
+        url = config['url']
+        if args.local:
+            from .local_server import LocalGameServer
+            bars = len(config['left_bar']) + len(config['right_bar']) + len(config['remaining'])
+            url = stack.enter_context(LocalGameServer(bars=bars)).url
+
+        # Attach to the browser daemon, if one is configured or running, instead of starting Chrome
+        debugger_address = config.get('debugger_address')
+        if args.attach:
+            from .browser_daemon import read_state
+            state = read_state(args.state_file)
+            if state is None:
+                print("No browser daemon is running, start one with the daemon command", file=sys.stderr)
+                return 1
+            debugger_address = state['debugger_address']
+
+        strategy_cache = StrategyCache(config['strategy_cache']) if config.get('strategy_cache') else None
+        driver, attached, webutils = open_browser(config, debugger_address, stack)
+
+        # Context Management
+        with GoldBarWeighing(driver, config.get('bowl_capacity'), strategy_cache,
+                             fused_weigh=config.get('fused_weigh', False),
+                             attached=attached, webutils=webutils,
+                             prior=load_prior(config), prior_slack=config.get('prior_slack', 0)) as gb:
+            # Trace every method and WebDriver command of the game, if a trace file is configured
+            tracer = Tracer() if config.get('trace') else None
+            if tracer is not None:
+                tracer.instrument(gb)
+            try:
+                gb.webutils.navigate(url)
+                gb.reset()
+                fake_bar = gb.find_fake_bar(
+                    left=config['left_bar'],
+                    right=config['right_bar'],
+                    remaining=config['remaining'])
+            except Exception:
+                print(f"The game failed, the recent log records are in {dump_recent()}", file=sys.stderr)
+                raise
+            print(f"\nFake bar is: {fake_bar}")
+            gb.validate_answer(fake_bar)
+            gb.print_weighings_list()
+            if tracer is not None:
+                tracer.save(config['trace'])
+    return 0
+
+
+def simulate(args: argparse.Namespace) -> int:
+    from .scale import simulate as simulate_games
+    from .strategy import StrategyCache
+
+    strategy_cache = StrategyCache(args.strategy_cache) if args.strategy_cache else None
+    for bars in args.n:
+        report = simulate_games(bars, args.bowl_capacity, strategy_cache, args.rounds)
+        print(json.dumps({"n": bars, **report}, indent=4))
+    return 0
+
+
+def bench(args: argparse.Namespace) -> int:
+    from .benchmark import compare, run_benchmark
+    from .local_server import LocalGameServer
+
+    config = load_config(args.config)
+    with contextlib.ExitStack() as stack:
+        url = config['url']
+        if args.local:
+            bars = len(config['left_bar']) + len(config['right_bar']) + len(config['remaining'])
+            url = stack.enter_context(LocalGameServer(bars=bars, delay=args.delay, seed=0)).url
+        benchmark = run_benchmark(url, config['left_bar'], config['right_bar'], config['remaining'],
+                                  args.repetitions, args.launches, config['isheadless'],
+                                  backend=args.backend)
+
+    output = json.dumps(benchmark, indent=4)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            baseline_file.write(output)
+    elif args.baseline:
+        with open(args.baseline, "r") as baseline_file:
+            failures = compare(benchmark, json.load(baseline_file), args.tolerance)
+        if failures:
+            print("Regressions against the baseline:", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def batch(args: argparse.Namespace) -> int:
+    from .batch import BatchRunner
+    from .goldbar import GoldBarWeighing
+    from .governor import ResourceGovernor
+    from .logger import configure_logging
+    from .strategy import StrategyCache
+    from .web_driver_config import WebDriver
+
+    config = load_config(args.config)
+    configure_logging(**config.get('log', {}))
+    with contextlib.ExitStack() as stack:
+        url = config['url']
+        if args.local:
+            from .local_server import LocalGameServer
+            bars = len(config['left_bar']) + len(config['right_bar']) + len(config['remaining'])
+            url = stack.enter_context(LocalGameServer(bars=bars)).url
+
+        strategy_cache = StrategyCache(config['strategy_cache']) if config.get('strategy_cache') else None
+        # Samples the memory and CPU of the browser, and replaces it over a limit
+        governor = ResourceGovernor(**config['governor']) if config.get('governor') else None
+        driver, attached, webutils = open_browser(config, config.get('debugger_address'), stack)
+        # Only a browser started here for WebDriver can be replaced, others are only sampled
+        launched = not attached and webutils is None
+        factory = (lambda: WebDriver(headless=config['isheadless']).driver) if launched else None
+        with GoldBarWeighing(driver, config.get('bowl_capacity'), strategy_cache,
+                             fused_weigh=config.get('fused_weigh', False),
+                             attached=attached, webutils=webutils,
+                             prior=load_prior(config), prior_slack=config.get('prior_slack', 0)) as gb:
+            summary = BatchRunner(gb, url, governor, factory).run(args.scenarios, args.output,
+                                                                  resume=not args.restart)
+        if governor is not None:
+            summary["resources"] = governor.summary()
+
+    output = json.dumps(summary, indent=4)
+    print(output)
+    if args.summary:
+        with open(args.summary, "w") as summary_file:
+            summary_file.write(output)
+    return 0 if summary['errors'] == 0 else 1
+
+
+def run(args: argparse.Namespace) -> int:
+    from .governor import ResourceGovernor
+    from .logger import configure_logging
+    from .strategy import StrategyCache
+    from .web_driver_config import WebDriver
+
+    config = load_config(args.config)
+    configure_logging(**config.get('log', {}))
+    concurrency = args.concurrency or config.get('pool_size', 2)
+    strategy_cache = StrategyCache(config['strategy_cache']) if config.get('strategy_cache') else None
+    # Samples the memory and CPU of the browsers, and recycles pooled ones over a limit
+    governor = ResourceGovernor(**config['governor']) if config.get('governor') else None
+    if args.tabs:
+        from .tabs import TabScheduler
+        driver = WebDriver(headless=config['isheadless'], debugger_address=config.get('debugger_address')).driver
+        # A browser started here is replaced when it goes over a limit, an attached one is only sampled
+        factory = None if config.get('debugger_address') else (lambda: WebDriver(headless=config['isheadless']).driver)
+        scheduler = TabScheduler(driver, config['url'], args.tabs, config.get('bowl_capacity'), strategy_cache,
+                                 governor=governor, factory=factory)
+        try:
+            report = scheduler.run([config] * args.games)
+            if governor is not None:
+                governor.sample(scheduler.driver)
+        finally:
+            scheduler.driver.quit()
+    else:
+        from .runner import ConcurrentGameRunner
+        from .web_driver_pool import WebDriverPool
+        with WebDriverPool(config['url'], size=concurrency, headless=config['isheadless'],
+                           max_uses=config.get('pool_max_uses', 50), governor=governor) as pool:
+            runner = ConcurrentGameRunner(pool, concurrency, config.get('bowl_capacity'), strategy_cache,
+                                          fused_weigh=config.get('fused_weigh', False))
+            report = runner.run([config] * args.games)
+    if governor is not None:
+        report["summary"]["resources"] = governor.summary()
+    print(json.dumps(report["summary"], indent=4))
+    return 0 if report["summary"]["errors"] == 0 else 1
+
+
+def prior(args: argparse.Namespace) -> int:
+    from .strategy import compare_prior
+
+    if args.results:
+        from .batch import learn_prior
+        if args.n is None:
+            print("--n is needed to learn the prior from results", file=sys.stderr)
+            return 1
+        weights = learn_prior(args.results, args.n, args.smoothing)
+    elif args.weights:
+        weights = args.weights
+    else:
+        print("Give the --weights of the bars or a --results file to learn them from", file=sys.stderr)
+        return 1
+    print(json.dumps(compare_prior(weights, args.bowl_capacity, args.slack), indent=4))
+    return 0
+
+
+def daemon(args: argparse.Namespace) -> int:
+    from .browser_daemon import BrowserDaemon, read_state
+
+    state = read_state(args.state_file)
+    if args.action == "status":
+        print(json.dumps(state, indent=4) if state else "The browser daemon is not running")
+        return 0 if state else 1
+    if args.action == "stop":
+        if state is None:
+            print("The browser daemon is not running", file=sys.stderr)
+            return 1
+        os.kill(state['pid'], signal.SIGTERM)
+        return 0
+
+    if state is not None:
+        print(f"The browser daemon is already running on {state['debugger_address']}", file=sys.stderr)
+        return 1
+    browser = BrowserDaemon(port=args.port, headless=not args.headed, idle_timeout=args.idle_timeout,
+                            max_restarts=args.max_restarts, state_file=args.state_file)
+    print(f"Browser daemon on {browser.debugger_address}, stops after {args.idle_timeout:.0f} s idle")
+    browser.serve()
+    return 0
+
+
+def importtime(args: argparse.Namespace) -> int:
+    over_budget = False
+    for module, budget in IMPORT_BUDGET_MS.items():
+        times = import_times(module)
+        selenium = any(name.split(".")[0] == "selenium" for name in times)
+        within = times[module] <= budget and not selenium
+        over_budget |= not within
+        print(f"{module}: {times[module]:.1f} ms (budget {budget:.0f} ms)"
+              f"{', loads selenium' if selenium else ''}{'' if within else ', OVER BUDGET'}")
+    return 1 if over_budget else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Find the fake gold bar.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play_parser = commands.add_parser("play", help="Play a game in the browser")
+    play_parser.add_argument("--config", default="config.json")
+    play_parser.add_argument("--local", action="store_true",
+                             help="Play on the bundled local game server instead of the url in the config")
+    play_parser.add_argument("--attach", action="store_true",
+                             help="Open a tab in the running browser daemon instead of starting Chrome")
+    play_parser.add_argument("--state-file", default=None, help="State file of the browser daemon")
+    play_parser.set_defaults(handler=play)
+
+    simulate_parser = commands.add_parser("simulate", help="Play every fake bar in memory, without a browser")
+    simulate_parser.add_argument("n", type=int, nargs="+", help="Numbers of bars")
+    simulate_parser.add_argument("--bowl-capacity", type=int, default=None)
+    simulate_parser.add_argument("--rounds", type=int, default=1)
+    simulate_parser.add_argument("--strategy-cache", default=None)
+    simulate_parser.set_defaults(handler=simulate)
+
+    bench_parser = commands.add_parser("bench", help="Time every phase of a game")
+    bench_parser.add_argument("--repetitions", type=int, default=20)
+    bench_parser.add_argument("--launches", type=int, default=3)
+    bench_parser.add_argument("--config", default="config.json")
+    bench_parser.add_argument("--local", action="store_true",
+                              help="Play on the bundled local game server instead of the url in the config")
+    bench_parser.add_argument("--delay", type=float, default=0.0, help="Server delay of each local weighing")
+    bench_parser.add_argument("--output", default=None, help="Where to write the report")
+    bench_parser.add_argument("--baseline", default=None, help="A stored report to compare with")
+    bench_parser.add_argument("--save-baseline", action="store_true", help="Store this report as the baseline")
+    bench_parser.add_argument("--tolerance", type=float, default=0.25)
+    bench_parser.add_argument("--backend", choices=["webdriver", "cdp"], default="webdriver",
+                              help="Drive the page through chromedriver or the DevTools Protocol")
+    bench_parser.set_defaults(handler=bench)
+
+    batch_parser = commands.add_parser("batch", help="Play many games from a JSONL file in one browser")
+    batch_parser.add_argument("scenarios", help="JSONL file with the left_bar, right_bar and remaining of each game")
+    batch_parser.add_argument("--output", default="batch_results.jsonl",
+                              help="JSONL file the result of each game is appended to")
+    batch_parser.add_argument("--restart", action="store_true",
+                              help="Start the output again instead of skipping the games already in it")
+    batch_parser.add_argument("--summary", default=None, help="Where to write the summary")
+    batch_parser.add_argument("--config", default="config.json")
+    batch_parser.add_argument("--local", action="store_true",
+                              help="Play on the bundled local game server instead of the url in the config")
+    batch_parser.set_defaults(handler=batch)
+
+    run_parser = commands.add_parser("run", help="Play many games concurrently")
+    run_parser.add_argument("--games", type=int, default=10, help="Number of games to play")
+    run_parser.add_argument("--concurrency", type=int, default=None, help="Games played at the same time")
+    run_parser.add_argument("--tabs", type=int, default=None,
+                            help="Play the games in this many tabs of one browser instead of one browser each")
+    run_parser.add_argument("--config", default="config.json")
+    run_parser.set_defaults(handler=run)
+
+    prior_parser = commands.add_parser("prior", help="Compare the weighings of a prior-aware strategy with the uniform one")
+    prior_parser.add_argument("--weights", type=float, nargs="+", default=None,
+                              help="How likely each bar is to be the fake one")
+    prior_parser.add_argument("--results", default=None, help="A batch output file to learn the weights from")
+    prior_parser.add_argument("--n", type=int, default=None, help="Number of bars, with --results")
+    prior_parser.add_argument("--smoothing", type=float, default=1.0,
+                              help="Added to the count of every bar learned from results")
+    prior_parser.add_argument("--bowl-capacity", type=int, default=None)
+    prior_parser.add_argument("--slack", type=int, default=0,
+                              help="Extra weighings the worst case may take over the uniform strategy")
+    prior_parser.set_defaults(handler=prior)
+
+    daemon_parser = commands.add_parser("daemon", help="Keep a browser running for the games to attach to")
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"])
+    daemon_parser.add_argument("--port", type=int, default=9222, help="Remote debugging port")
+    daemon_parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    daemon_parser.add_argument("--idle-timeout", type=float, default=600.0,
+                               help="Seconds without a game before the daemon stops")
+    daemon_parser.add_argument("--max-restarts", type=int, default=5)
+    daemon_parser.add_argument("--state-file", default=None,
+                               help="Where the daemon writes its debugger address")
+    daemon_parser.set_defaults(handler=daemon)
+
+    importtime_parser = commands.add_parser("importtime", help="Check the import time of the entry points")
+    importtime_parser.set_defaults(handler=importtime)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
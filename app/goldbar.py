@@ -1,54 +1,199 @@
 # goldbar.py
 
-from typing import List
-from .web_driver_utilities import WebDriverUtility
-from .logger import setup_logger
-
-
-class GoldBarWeighing:
-
-    def __init__(self, driver) -> None:
+import time
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+from .knowledge import WeighingKnowledge
+from .logger import in_phase, setup_logger
+from .metrics import PhaseTimer
+from .planner import OddBarPlanner, TernarySearchPlanner
+from .scale import Scale, WeighingRecord
+from .strategy import (VARIANT_EITHER, VARIANT_LIGHTER, StrategyCache, StrategyTable,
+                       compile_prior_strategy, compile_strategy)
+
+# Every weighing adds an entry to this list on the page
+HISTORY_SELECTOR = "div.game-info ol li"
+
+# A solver as a generator: it yields the (left, right) bars of each weighing it needs, is sent
+# the result, and returns its answer. Whoever drives it decides how and when to weigh.
+Steps = Generator[Tuple[List[int], List[int]], str, Any]
+
+
+class GoldBarWeighing(Scale):
+
+    def __init__(self,
+                 driver=None,
+                 bowl_capacity: Optional[int] = None,
+                 strategy_cache: Optional[StrategyCache] = None,
+                 fused_weigh: bool = False,
+                 quit_on_exit: bool = True,
+                 logger=None,
+                 scale: Optional[Scale] = None,
+                 attached: bool = False,
+                 webutils=None,
+                 prior: Optional[Sequence[float]] = None,
+                 prior_slack: int = 0) -> None:
         """
-        Initializes the Chromedriver, WebDriver Object and Logger.
+        Initializes the Chromedriver, WebDriver Object, Planners and Logger.
+        GoldBarWeighing is the Selenium Scale, the solver weighs on it unless another scale
+        is given.
+
+        Args:
+        driver (WebDriver): The Selenium WebDriver to play the game with. Not needed with another scale.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+        strategy_cache (Optional[StrategyCache]): Where precompiled strategies are stored.
+        Without a cache, strategies are compiled in memory.
+        fused_weigh (bool): Weigh with a single script call instead of separate WebDriver commands.
+        quit_on_exit (bool): Quit the driver when the with block ends. Pooled drivers are kept.
+        logger: The logger to report errors to. Defaults to the application logger.
+        scale (Optional[Scale]): The scale the solver weighs on, like a SimulatedScale.
+        attached (bool): The driver is attached to a browser daemon. Only the game's tab is
+        closed on exit, the browser keeps running.
+        webutils: The browser utility to play with, like a CDPUtility.
+        Defaults to a WebDriverUtility of the driver.
+        prior (Optional[Sequence[float]]): How likely each bar is to be the fake one. With a prior,
+        the weighings after the first minimize the expected number of weighings instead of
+        treating every suspected bar as equally likely.
+        prior_slack (int): Extra weighings the worst case may take over the uniform split,
+        to save more on average.
         """
         self.driver = driver
-        self.webutils = WebDriverUtility(driver)
-        self.logger = setup_logger()
+        self.webutils = webutils
+        if driver is not None and webutils is None:
+            # Selenium is only loaded for games played in a browser
+            from .web_driver_utilities import WebDriverUtility
+            self.webutils = WebDriverUtility(driver)
+        self.bowl_capacity = bowl_capacity
+        self.planner = TernarySearchPlanner(bowl_capacity)
+        self.odd_planner = OddBarPlanner(bowl_capacity)
+        self.strategy_cache = strategy_cache
+        self.strategies: Dict[Tuple[int, str, int], StrategyTable] = {}
+        self.prior = prior
+        self.prior_slack = prior_slack
+        self.prior_strategies: Dict[Tuple[int, ...], StrategyTable] = {}
+        self.fused_weigh = fused_weigh
+        # Milliseconds of each weighing by path, and of the in-page steps of fused weighings
+        self.weigh_timer = PhaseTimer()
+        self.quit_on_exit = quit_on_exit
+        self.attached = attached
+        self.logger = logger or setup_logger()
+        self.scale: Scale = scale or self
+        # What each grid cell of the page holds, as far as this game wrote it, and how many
+        # weighings the page lists. None until it is read from the page.
+        self.grid: Dict[str, str] = {}
+        self.history_length: Optional[int] = None
+        # The weighing started with start_weigh and not read yet: the number of weighings
+        # listed before it, and when it started
+        self.pending: Optional[Tuple[int, float]] = None
+        # What the current game learnt from its weighings
+        self.knowledge: Optional[WeighingKnowledge] = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """
-        Exits the chrome testing mode
+        Exits the chrome testing mode, unless the driver is kept for another game
+        """
+        if self.quit_on_exit and self.driver is not None:
+            if self.attached:
+                # Close the game's tab, quitting an attached session leaves the browser running
+                self.driver.close()
+            self.driver.quit()
+
+    def open_game(self, url: str) -> None:
+        """
+        Opens the game page, which starts a new game, and forgets what this object knew of the
+        previous page: the grid cells, the weighings listed and the weighing results.
+
+        Args:
+        url (str): The game page.
+        """
+        self.webutils.navigate(url)
+        self.grid.clear()
+        self.history_length = None
+        self.knowledge = None
+        self.pending = None
+
+    def use_driver(self, driver) -> None:
+        """
+        Plays the next games on another driver, like a fresh browser replacing one that went
+        over its memory limit. The next game has to open the game page in it.
+
+        Args:
+        driver (WebDriver): The new driver. The old one is not quit.
         """
-        self.driver.quit()
+        from .web_driver_utilities import WebDriverUtility
+        self.driver = driver
+        self.webutils = WebDriverUtility(driver)
+        self.grid.clear()
+        self.history_length = None
+        self.knowledge = None
+        self.pending = None
 
+    @in_phase("reset")
     def reset(self):
         """
         Resets the bowl grids
         """
         self.webutils.click_button_by_css("button#reset.button:not([disabled])")
+        self.grid.clear()
+
+    def changed_cells(self, bars: List[int], bowl_side: str) -> Dict[str, str]:
+        """
+        Compares a bowl with the cells written before.
 
-    def enter_bars_on_bowl(self, bars: List[int], bowl_side: str) -> None:
+        Args:
+        bars (List[int]): List of bar indices.
+        bowl_side (str): 'left' or 'right' to determine the bowl.
+
+        Returns:
+        Dict[str, str]: The cells to write, keyed by ID. Cells left over from an earlier,
+        larger weighing are cleared with an empty value.
         """
-        Enter bar numbers in left or right bowl grid.
+        cells = {f"{bowl_side}_{i}": str(bar) for i, bar in enumerate(bars)}
+        changes = {cell: value for cell, value in cells.items() if self.grid.get(cell) != value}
+        changes.update({cell: "" for cell in self.grid
+                        if cell.startswith(f"{bowl_side}_") and cell not in cells})
+        return changes
+
+    def record_cells(self, changes: Dict[str, str]) -> None:
+        for cell, value in changes.items():
+            if value:
+                self.grid[cell] = value
+            else:
+                self.grid.pop(cell, None)
+
+    def enter_bars_on_bowl(self, bars: List[int], bowl_side: str) -> bool:
+        """
+        Enter bar numbers in left or right bowl grid. Only the cells that differ from the last
+        weighing are written, all of them in one browser round trip.
 
         Args:
         bars (List[int]): List of bar indices.
         bowl_side (str): 'left' or 'right' to determine the bowl.
+
+        Returns:
+        bool: False if the page kept a value it could not overwrite, the bowls need a reset then.
         """
 
-        for i, bar in enumerate(bars):
-            try:
-                # Set the bowl grids values as given argument
-                self.webutils.set_text(f"{bowl_side}_{i}", str(bar))
-            except Exception as e:
-                self.logger.error(f"Some error occurred. {e}")
+        changes = self.changed_cells(bars, bowl_side)
+        try:
+            # Set the bowl grids values as given argument
+            typed = self.webutils.set_texts(changes)
+        except Exception as e:
+            self.logger.error(f"Some error occurred. {e}")
+            return False
 
+        # Typing only adds to a cell, so a cell that held a value, or had to be cleared, is wrong
+        overwritten = [cell for cell in typed if cell in self.grid or not changes[cell]]
+        self.record_cells(changes)
+        return not overwritten
+
+    @in_phase("weigh")
     def weigh(self, bars_left: List[int], bars_right: List[int]) -> str:
         """
         Compare the weights of the left and right bars and return the result.
+        The time each weighing takes is recorded in weigh_timer.
 
         Args:
         bars_left (List[int]): List of bar indices on the left side.
@@ -58,25 +203,181 @@ class GoldBarWeighing:
         str: The result of the weighing, '<', '>', or '='.
         """
 
-        # Set the left and right bowls
-        self.enter_bars_on_bowl(bars_left, 'left')
-        self.enter_bars_on_bowl(bars_right, 'right')
+        start = time.perf_counter()
+        if self.fused_weigh:
+            result = self.weigh_fused(bars_left, bars_right)
+            if result is not None:
+                return result
+
+        # Set the left and right bowls, writing only the cells that changed
+        left_written = self.enter_bars_on_bowl(bars_left, 'left')
+        right_written = self.enter_bars_on_bowl(bars_right, 'right')
+        if not (left_written and right_written):
+            # The page kept old values, start again from empty bowls
+            self.reset()
+            self.enter_bars_on_bowl(bars_left, 'left')
+            self.enter_bars_on_bowl(bars_right, 'right')
 
         try:
+            if self.history_length is None:
+                self.history_length = len(self.webutils.get_elements_by_css(HISTORY_SELECTOR))
+
             # Click the weigh button, to compare the weights on both side
             self.webutils.click_button_by_id("weigh")
 
-            # Wait for the 'reset' (result) to be enabled with the result text
-            self.webutils.wait_for_element('reset', ['<', '>', '='])
+            # Wait for the weighing to be added to the history, the result shows from then on.
+            # The bowls are not reset, so the next weighing only changes the cells that differ.
+            self.webutils.wait_for_condition(f"{HISTORY_SELECTOR}:nth-child({self.history_length + 1})",
+                                             by="css", key="weighing")
+            self.history_length += 1
 
             # Get the text of the element with id = 'reset'
             result = self.webutils.get_text("reset")
-            self.reset()  # Reset the bowls
+            self.weigh_timer.record("stepwise", (time.perf_counter() - start) * 1000)
             return result
         except Exception as e:
             self.logger.error(f"Some Error occurred. {e}")
             raise
 
+    @in_phase("weigh")
+    def weigh_fused(self, bars_left: List[int], bars_right: List[int]) -> Optional[str]:
+        """
+        Fill the changed cells of the bowls, weigh and read the result in one browser round trip.
+
+        Args:
+        bars_left (List[int]): List of bar indices on the left side.
+        bars_right (List[int]): List of bar indices on the right side.
+
+        Returns:
+        Optional[str]: The result of the weighing, '<', '>', or '='.
+        None if the page did not accept the bar values, nothing was weighed then.
+        """
+        values = self.changed_cells(bars_left, 'left')
+        values.update(self.changed_cells(bars_right, 'right'))
+
+        start = time.perf_counter()
+        try:
+            outcome = self.webutils.fused_weigh(values)
+        except Exception as e:
+            self.logger.error(f"Some Error occurred. {e}")
+            raise
+
+        if outcome.get('error') == 'fill':
+            self.logger.warning(f"The page did not accept the cells {outcome.get('failed')}, "
+                                f"weighing step by step")
+            # Some cells were written and some not, start again from empty bowls
+            self.reset()
+            return None
+
+        self.record_cells(values)
+        if self.history_length is not None:
+            self.history_length += 1
+
+        # The round trip against the in-page steps, what is left is the WebDriver overhead
+        total = (time.perf_counter() - start) * 1000
+        in_page = outcome.get('timings', {})
+        self.weigh_timer.record("fused", total)
+        for step, milliseconds in in_page.items():
+            self.weigh_timer.record(f"fused.{step}", milliseconds)
+        self.weigh_timer.record("fused.overhead", max(0.0, total - sum(in_page.values())))
+        return outcome['result']
+
+    @in_phase("weigh")
+    def start_weigh(self, bars_left: List[int], bars_right: List[int]) -> None:
+        """
+        Fill the changed cells of the bowls and click weigh, without waiting for the result,
+        so the browser can play other tabs meanwhile. Read the result with poll_weigh.
+
+        Args:
+        bars_left (List[int]): List of bar indices on the left side.
+        bars_right (List[int]): List of bar indices on the right side.
+
+        Raises:
+        ValueError: If the page does not accept the bar values, even in empty bowls.
+        """
+        values = self.changed_cells(bars_left, 'left')
+        values.update(self.changed_cells(bars_right, 'right'))
+        start = time.perf_counter()
+        outcome = self.webutils.start_weigh(values)
+        if outcome.get('error') == 'fill':
+            self.logger.warning(f"The page did not accept the cells {outcome.get('failed')}, "
+                                f"weighing from empty bowls")
+            self.reset()
+            values = self.changed_cells(bars_left, 'left')
+            values.update(self.changed_cells(bars_right, 'right'))
+            outcome = self.webutils.start_weigh(values)
+            if outcome.get('error') == 'fill':
+                raise ValueError(f"The page did not accept the cells {outcome.get('failed')}")
+        self.record_cells(values)
+        self.pending = (outcome['weighed'], start)
+
+    def poll_weigh(self) -> Optional[str]:
+        """
+        Read the result of the weighing started with start_weigh, if it is there.
+
+        Returns:
+        Optional[str]: The result of the weighing, '<', '>', or '=', or None while it is pending.
+        """
+        weighed, start = self.pending
+        result = self.webutils.poll_weigh(weighed)
+        if result is None:
+            return None
+        self.pending = None
+        self.history_length = weighed + 1
+        self.weigh_timer.record("polled", (time.perf_counter() - start) * 1000)
+        return result
+
+    def run_steps(self, steps: Steps) -> Any:
+        """
+        Plays a solver to the end, weighing each step on the scale and waiting for it.
+
+        Args:
+        steps (Steps): The solver.
+
+        Returns:
+        Any: The answer of the solver.
+        """
+        try:
+            weighing = next(steps)
+            while True:
+                weighing = steps.send(self.scale.weigh(*weighing))
+        except StopIteration as stop:
+            return stop.value
+
+    def known_steps(self, bars_left: List[int], bars_right: List[int]) -> Steps:
+        """
+        Yields a weighing, unless its result follows from the earlier weighings of this game.
+        A weighing made before, with either side on the left, is answered from the knowledge,
+        and so is one where every bar that could still be fake gives the same result.
+
+        Args:
+        bars_left (List[int]): List of bar indices on the left side.
+        bars_right (List[int]): List of bar indices on the right side.
+
+        Returns:
+        str: The result of the weighing, '<', '>', or '='.
+        """
+        if self.knowledge is None:
+            self.knowledge = WeighingKnowledge()
+        result = self.knowledge.lookup(bars_left, bars_right)
+        if result is None:
+            result = yield bars_left, bars_right
+            self.knowledge.record(bars_left, bars_right, result)
+        return result
+
+    def weigh_known(self, bars_left: List[int], bars_right: List[int]) -> str:
+        """
+        Weigh on the scale, unless the result follows from the earlier weighings of this game.
+
+        Args:
+        bars_left (List[int]): List of bar indices on the left side.
+        bars_right (List[int]): List of bar indices on the right side.
+
+        Returns:
+        str: The result of the weighing, '<', '>', or '='.
+        """
+        return self.run_steps(self.known_steps(bars_left, bars_right))
+
     def find_suspected_bars(self,
                             left: List[int],
                             right: List[int],
@@ -109,33 +410,161 @@ class GoldBarWeighing:
             raise
 
     @staticmethod
-    def valid_bar_values(left_bars: List[int], right_bars: List[int], remaining: List[int]) -> bool:
+    def valid_bar_values(left_bars: List[int],
+                         right_bars: List[int],
+                         remaining: List[int],
+                         bowl_capacity: Optional[int] = None) -> bool:
 
         """
-        Validates the values of the bars. Checks 3 conditions, length of all bars should be 3,
-        All the values should be unique and between the range 0-9
+        Validates the values of the bars. Checks 3 conditions, both bowls should hold the same
+        number of bars (at least one, and no more than the bowl capacity), all the values should
+        be unique and, for N bars in total, between the range 0 to N-1.
 
         Args:
         left (List[int]): Bars on the left side of the scale.
         right (List[int]): Bars on the right side of the scale.
         remaining (List[int]): Bars that will not be weighed.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
 
         Returns:
         bool: Returns if the bar values are valid or not.
         """
 
-        if len(left_bars) != 3 or len(right_bars) != 3 or len(remaining) != 3:
+        if len(left_bars) != len(right_bars) or not left_bars:
+            return False
+        if bowl_capacity is not None and len(left_bars) > bowl_capacity:
             return False
 
         all_bars = left_bars + right_bars + remaining
-        if len(set(all_bars)) == 9 and all(0 <= bar <= 8 for bar in all_bars):
+        total = len(all_bars)
+        if len(set(all_bars)) == total and min(all_bars) >= 0 and max(all_bars) < total:
             return True
         return False
 
+    def strategy(self, n: int, variant: str, references: int = 0) -> StrategyTable:
+        """
+        Returns the compiled decision tree for searching n bars.
+
+        Args:
+        n (int): Number of bars that could be the fake bar.
+        variant (str): 'lighter' or 'either'.
+        references (int): Number of known genuine bars.
+
+        Returns:
+        StrategyTable: The strategy, from the cache when one is configured.
+        """
+        key = (n, variant, references)
+        if key not in self.strategies:
+            if self.strategy_cache is not None:
+                table = self.strategy_cache.get(n, variant, self.bowl_capacity, references)
+            else:
+                table = compile_strategy(n, variant, self.bowl_capacity, references)
+            self.strategies[key] = table
+        return self.strategies[key]
+
+    def prior_strategy(self, bars: List[int]) -> StrategyTable:
+        """
+        Returns the decision tree for searching the suspected bars that minimizes the expected
+        number of weighings under the prior, from the cache when one is configured. Bars the
+        prior does not cover count as unlikely.
+
+        Args:
+        bars (List[int]): The suspected bars.
+
+        Returns:
+        StrategyTable: The strategy, with the bars as its positions.
+        """
+        key = tuple(bars)
+        if key not in self.prior_strategies:
+            weights = [self.prior[bar] if bar < len(self.prior) else 0.0 for bar in bars]
+            if sum(weights) <= 0:
+                weights = [1.0] * len(bars)
+            if self.strategy_cache is not None:
+                table = self.strategy_cache.get_prior(weights, self.bowl_capacity, self.prior_slack)
+            else:
+                table = compile_prior_strategy(weights, self.bowl_capacity, self.prior_slack)
+            self.prior_strategies[key] = table
+        return self.prior_strategies[key]
+
+    def strategy_steps(self, table: StrategyTable, bars: List[int]) -> Steps:
+        """
+        Yields the weighings of a compiled strategy until the fake bar is known.
+        Each step is a table lookup.
+
+        Args:
+        table (StrategyTable): The strategy to follow.
+        bars (List[int]): The bars at each position of the strategy.
+
+        Returns:
+        Tuple[int, str]: The fake bar and whether it is 'lighter' or 'heavier'.
+        """
+        node = 0
+        weighing = table.weighing(node)
+        while weighing is not None:
+            left, right = weighing
+            result = yield from self.known_steps([bars[i] for i in left], [bars[i] for i in right])
+            node = table.child(node, result)
+            weighing = table.weighing(node)
+        position, direction = table.answer(node)
+        return bars[position], direction
+
+    def follow_strategy(self, table: StrategyTable, bars: List[int]) -> Tuple[int, str]:
+        """
+        Performs the weighings of a compiled strategy until the fake bar is known.
+
+        Args:
+        table (StrategyTable): The strategy to follow.
+        bars (List[int]): The bars at each position of the strategy.
+
+        Returns:
+        Tuple[int, str]: The fake bar and whether it is 'lighter' or 'heavier'.
+        """
+        return self.run_steps(self.strategy_steps(table, bars))
+
+    def fake_bar_steps(self, left: List[int], right: List[int], remaining: List[int]) -> Steps:
+        """
+        Yields the weighings of find_fake_bar, so a scheduler can interleave them with other games.
+
+        Args:
+        left (List[int]): Bars on the left side of the scale.
+        right (List[int]): Bars on the right side of the scale.
+        remaining (List[int]): Bars that will not be weighed.
+
+        Returns:
+        int: The index of the suspected fake bar.
+
+        Raises:
+        ValueError: If the bar values are not valid, or the weighings do not match a lighter bar.
+        """
+        if not self.valid_bar_values(left, right, remaining, self.bowl_capacity):
+            raise ValueError("The values in all the bars are not correct. "
+                             "Enter unique values from 0 to N-1, with the same number "
+                             "of bars in both bowls")
+
+        self.knowledge = WeighingKnowledge.lighter(left + right + remaining)
+
+        # First weighing
+        result = yield from self.known_steps(left, right)
+        possible_fake_bar = self.find_suspected_bars(left, right, remaining, result)
+
+        if not possible_fake_bar:
+            raise ValueError("The weighings do not match a single lighter bar")
+
+        # Keep splitting the suspected bars in thirds until one is left, or by their prior
+        if self.prior is not None:
+            table = self.prior_strategy(possible_fake_bar)
+        else:
+            table = self.strategy(len(possible_fake_bar), VARIANT_LIGHTER)
+        fake_bar, _ = yield from self.strategy_steps(table, possible_fake_bar)
+        return fake_bar
+
+    @in_phase("solve")
     def find_fake_bar(self, left: List[int], right: List[int], remaining: List[int]) -> int:
 
         """
-        Find the fake bar by performing a series of weightings.
+        Find the fake bar by performing a series of weightings. The first weighing uses the given
+        groups, every later one splits the suspected bars into near-equal thirds, so N bars need
+        at most ceil(log3 N) weighings when the bowls are large enough.
 
         Args:
         left (List[int]): Bars on the left side of the scale.
@@ -147,27 +576,73 @@ class GoldBarWeighing:
         """
 
         try:
-            if not self.valid_bar_values(left, right, remaining):
-                raise ValueError("The values in all the bars are not correct. "
-                                 "Enter 3 unique values in each bar from 0-8")
-
-            # First weighing
-            result = self.weigh(left, right)
-            possible_fake_bar = self.find_suspected_bars(left, right, remaining, result)
-
-            # Second weighing
-            result = self.weigh([possible_fake_bar[0]], [possible_fake_bar[1]])
-            fake_bar = self.find_suspected_bars(
-                [possible_fake_bar[0]],
-                [possible_fake_bar[1]],
-                [possible_fake_bar[2]],
-                result
-            )
-            return fake_bar[0]
+            return self.run_steps(self.fake_bar_steps(left, right, remaining))
         except Exception as e:
             self.logger.error(f"Some error occurred while finding the fake bar: {e}")
             raise
 
+    @in_phase("solve")
+    def find_odd_bar(self, bars: Sequence[int], genuine: Sequence[int] = ()) -> Tuple[int, str]:
+
+        """
+        Find a fake bar that may be heavier or lighter than the others. Every bar is tracked as
+        possibly light or possibly heavy, and bars known to be genuine are used to even out the
+        bowls. 12 bars need 3 weighings, the least possible.
+
+        Args:
+        bars (Sequence[int]): Bars that could be the fake bar.
+        genuine (Sequence[int]): Extra bars known to be genuine.
+
+        Returns:
+        Tuple[int, str]: The index of the fake bar and whether it is 'lighter' or 'heavier'.
+        """
+
+        try:
+            # Validate the bars before compiling a strategy for them
+            self.odd_planner.start(bars, genuine)
+            self.knowledge = WeighingKnowledge.either(bars)
+            references = list(genuine[:1])
+            table = self.strategy(len(bars), VARIANT_EITHER, len(references))
+            return self.follow_strategy(table, list(bars) + references)
+        except Exception as e:
+            self.logger.error(f"Some error occurred while finding the fake bar: {e}")
+            raise
+
+    @in_phase("validate")
+    def guess(self, bar: int) -> bool:
+        """
+        Click the button of a bar and read the alert. The click, the alert text and closing
+        the alert take a single browser round trip.
+
+        Args:
+        bar (int): The index of the bar to guess.
+
+        Returns:
+        bool: True if the alert says the bar is the fake one, otherwise False.
+        """
+        # Click the fake bar button and capture the alert it opens, in one round trip
+        alert_text = self.webutils.click_and_capture_alert(f"coin_{bar}")
+        print(f"\nAlert: {alert_text}")
+
+        # Check if correct bar found
+        return alert_text == "Yay! You find it!"
+
+    def weighing_records(self) -> List[WeighingRecord]:
+        """
+        Read the list of weightings performed from the page, all of them in one browser round trip.
+        The page splits each one into its bowls and result.
+
+        Raises:
+        ValueError: If an entry of the list is not a weighing.
+        """
+        records = []
+        for record in self.webutils.get_weighing_records(HISTORY_SELECTOR):
+            if record is None:
+                raise ValueError("The weighings list has an entry that is not a weighing")
+            records.append(WeighingRecord(record['left'], record['right'], record['result']))
+        return records
+
+    @in_phase("validate")
     def validate_answer(self, fake_bar: int) -> bool:
 
         """
@@ -181,34 +656,20 @@ class GoldBarWeighing:
         """
 
         try:
-            # Click the fake bar button
-            # self.driver.find_element(By.ID, f"coin_{fake_bar}").click()
-            self.webutils.click_button_by_id(f"coin_{fake_bar}")
-
-            # Get th text in alert pop up
-            alert_text = self.webutils.get_alert_text()
-            print(f"\nAlert: {alert_text}")
-
-            # Accept the alert
-            self.webutils.accept_alert()
-
-            # Check if correct bar found
-            found_bar = True
-            if alert_text != "Yay! You find it!":
-                found_bar = False
-            return found_bar
+            return self.scale.guess(fake_bar)
         except Exception as e:
             self.logger.error(f"Some error occurred :{e}")
 
+    @in_phase("report")
     def print_weighings_list(self) -> None:
         """
         Print the list of weightings performed.
         """
         try:
             # Print the weightings performed
-            weighings_list = self.webutils.get_elements_by_css("div.game-info ol li")
+            weighings_list = self.scale.weighings()
             print("\nWeightings list: ")
             for item in weighings_list:
-                print(item.text)
+                print(item)
         except Exception as e:
             self.logger.error(f"Some error occurred :{e}")
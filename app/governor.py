@@ -0,0 +1,239 @@
+# governor.py
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .logger import setup_logger
+from .metrics import percentile
+
+PROC = "/proc"
+
+
+class ProcessStat(NamedTuple):
+    pid: int
+    ppid: int
+    cpu_ticks: int
+    rss_pages: int
+
+
+class ResourceSample(NamedTuple):
+    time: float
+    driver: int
+    games: int
+    processes: int
+    rss_bytes: int
+    cpu_seconds: float
+    cpu_percent: float
+
+
+def read_stat(pid: int, proc: str = PROC) -> Optional[ProcessStat]:
+    """
+    Reads the parent, CPU time and resident set size of a process from /proc/<pid>/stat.
+
+    Args:
+    pid (int): The process.
+    proc (str): Where procfs is mounted.
+
+    Returns:
+    Optional[ProcessStat]: The stat, or None if the process is gone.
+    """
+    try:
+        with open(os.path.join(proc, str(pid), "stat"), "r") as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return None
+    # The command name is in parentheses and may hold spaces, the fields follow the last one
+    fields = stat[stat.rindex(")") + 2:].split()
+    return ProcessStat(pid, int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]))
+
+
+def process_tree(pid: int, proc: str = PROC) -> List[ProcessStat]:
+    """
+    Reads a process and all its descendants, like chromedriver and the Chrome processes it started.
+
+    Args:
+    pid (int): The root process.
+    proc (str): Where procfs is mounted.
+
+    Returns:
+    List[ProcessStat]: The stat of every process of the tree, the root first. Empty if the
+    root is gone.
+    """
+    children: Dict[int, List[ProcessStat]] = {}
+    root = None
+    for name in os.listdir(proc):
+        if not name.isdigit():
+            continue
+        stat = read_stat(int(name), proc)
+        if stat is None:
+            continue
+        if stat.pid == pid:
+            root = stat
+        children.setdefault(stat.ppid, []).append(stat)
+    if root is None:
+        return []
+    tree = [root]
+    for stat in tree:
+        tree.extend(children.get(stat.pid, []))
+    return tree
+
+
+class ResourceGovernor:
+
+    def __init__(self,
+                 sample_every: int = 10,
+                 max_rss_mb: Optional[float] = None,
+                 max_cpu_percent: Optional[float] = None,
+                 samples_path: Optional[str] = None,
+                 proc: str = PROC) -> None:
+        """
+        Samples the memory and CPU of each driver's process tree every few games, and tells
+        when a driver went over a limit and should be replaced by a fresh browser.
+
+        Args:
+        sample_every (int): Games played on a driver between two samples.
+        max_rss_mb (Optional[float]): Resident memory of a driver's process tree, in MB, above
+        which it is recycled. None means no limit.
+        max_cpu_percent (Optional[float]): CPU use of a driver's process tree since its last
+        sample, in percent of one core, above which it is recycled. None means no limit.
+        samples_path (Optional[str]): A JSONL file every sample is appended to.
+        proc (str): Where procfs is mounted.
+        """
+        if sample_every < 1:
+            raise ValueError("Sample at least every game")
+        self.sample_every = sample_every
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.samples_path = samples_path
+        self.proc = proc
+        self.tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.logger = setup_logger()
+        self.lock = threading.Lock()
+        self.samples: List[ResourceSample] = []
+        self.games: Dict[int, int] = {}
+        # The wall clock and CPU seconds of each driver's last sample
+        self.last: Dict[int, Tuple[float, float]] = {}
+        self.recycled: Dict[str, int] = {"rss": 0, "cpu": 0}
+
+    @staticmethod
+    def driver_pid(driver) -> Optional[int]:
+        """
+        Returns the chromedriver process of a driver, None for a driver without a local service,
+        like one attached to a remote browser.
+        """
+        try:
+            return int(driver.service.process.pid)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def sample(self, driver) -> Optional[ResourceSample]:
+        """
+        Measures the process tree of a driver.
+
+        Args:
+        driver (WebDriver): The driver.
+
+        Returns:
+        Optional[ResourceSample]: The sample, or None if the driver has no local process to read.
+        """
+        pid = self.driver_pid(driver)
+        if pid is None or not os.path.isdir(self.proc):
+            return None
+        tree = process_tree(pid, self.proc)
+        if not tree:
+            return None
+        now = time.time()
+        cpu_seconds = sum(stat.cpu_ticks for stat in tree) / self.tick
+        with self.lock:
+            last_time, last_cpu = self.last.get(id(driver), (None, None))
+            cpu_percent = 0.0
+            if last_time is not None and now > last_time:
+                # Processes that exited since the last sample take their CPU time with them
+                cpu_percent = max(0.0, (cpu_seconds - last_cpu) / (now - last_time) * 100)
+            self.last[id(driver)] = (now, cpu_seconds)
+            sample = ResourceSample(now, pid, self.games.get(id(driver), 0), len(tree),
+                                    sum(stat.rss_pages for stat in tree) * self.page_size,
+                                    cpu_seconds, cpu_percent)
+            self.samples.append(sample)
+        if self.samples_path:
+            with self.lock, open(self.samples_path, "a") as samples_file:
+                samples_file.write(json.dumps(sample._asdict()) + "\n")
+        return sample
+
+    def over_limit(self, driver) -> bool:
+        """
+        Samples a driver now and tells whether its browser went over a limit.
+
+        Args:
+        driver (WebDriver): The driver.
+
+        Returns:
+        bool: True if the sample is over a limit, the driver should be recycled.
+        """
+        sample = self.sample(driver)
+        if sample is None:
+            return False
+
+        reason = None
+        if self.max_rss_mb is not None and sample.rss_bytes > self.max_rss_mb * 1024 * 1024:
+            reason = "rss"
+        elif self.max_cpu_percent is not None and sample.cpu_percent > self.max_cpu_percent:
+            reason = "cpu"
+        if reason is None:
+            return False
+        self.logger.warning(f"The browser of driver {sample.driver} is over its {reason} limit "
+                            f"({sample.rss_bytes / 1024 / 1024:.0f} MB, {sample.cpu_percent:.0f}% CPU) "
+                            f"after {sample.games} games, recycling it")
+        with self.lock:
+            self.recycled[reason] += 1
+        return True
+
+    def after_game(self, driver) -> bool:
+        """
+        Counts a game played on a driver, and checks the driver every `sample_every` games.
+
+        Args:
+        driver (WebDriver): The driver the game was played on.
+
+        Returns:
+        bool: True if the driver was checked and is over a limit, it should be recycled.
+        """
+        with self.lock:
+            self.games[id(driver)] = self.games.get(id(driver), 0) + 1
+            due = self.games[id(driver)] % self.sample_every == 0
+        return due and self.over_limit(driver)
+
+    def forget(self, driver) -> None:
+        """
+        Drops the counters of a driver that was quit.
+        """
+        with self.lock:
+            self.games.pop(id(driver), None)
+            self.last.pop(id(driver), None)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarizes the samples, to size the concurrency from the memory of a browser.
+
+        Returns:
+        Dict[str, Any]: The number of samples, the p50, p95 and max resident MB and CPU percent
+        of a driver's process tree, and the drivers recycled for each limit.
+        """
+        with self.lock:
+            samples = list(self.samples)
+            recycled = dict(self.recycled)
+        rss = [sample.rss_bytes / 1024 / 1024 for sample in samples]
+        cpu = [sample.cpu_percent for sample in samples]
+        return {
+            "samples": len(samples),
+            "rss_mb_p50": percentile(rss, 50),
+            "rss_mb_p95": percentile(rss, 95),
+            "rss_mb_max": max(rss, default=0.0),
+            "cpu_percent_p50": percentile(cpu, 50),
+            "cpu_percent_p95": percentile(cpu, 95),
+            "recycled": recycled,
+        }
@@ -0,0 +1,128 @@
+# knowledge.py
+
+from typing import Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from .planner import HEAVIER, LIGHTER
+
+_FLIPPED = {"<": ">", ">": "<", "=": "="}
+
+# Above this many candidates a weighing is not deduced. The planners split the candidates, so
+# their weighings can only be decided once few are left, and checking every candidate of a
+# large game costs more than it could save.
+DEDUCE_LIMIT = 256
+
+
+class WeighingKnowledge:
+
+    def __init__(self, candidates: Optional[Iterable[Tuple[int, str]]] = None) -> None:
+        """
+        Holds what one game has learnt from its weighings: the result of every weighing made
+        and the fake bars that still fit them. A weighing is answered from this knowledge
+        when it can be, instead of going to the scale.
+
+        Args:
+        candidates (Optional[Iterable[Tuple[int, str]]]): Every (bar, 'lighter' or 'heavier')
+        that could be the fake bar. None if unknown, then only repeated weighings are answered.
+        """
+        self.candidates: Optional[Set[Tuple[int, str]]] = set(candidates) if candidates is not None else None
+        self.results: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], str] = {}
+        self.cached = 0
+        self.deduced = 0
+        self.weighed = 0
+
+    @classmethod
+    def lighter(cls, bars: Iterable[int]) -> "WeighingKnowledge":
+        """
+        Knowledge for a game where one of the bars is a lighter fake.
+        """
+        return cls((bar, LIGHTER) for bar in bars)
+
+    @classmethod
+    def either(cls, bars: Iterable[int]) -> "WeighingKnowledge":
+        """
+        Knowledge for a game where one of the bars is a fake that may be heavier or lighter.
+        """
+        return cls((bar, direction) for bar in bars for direction in (LIGHTER, HEAVIER))
+
+    @staticmethod
+    def normalize(left: Iterable[int], right: Iterable[int]) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], bool]:
+        """
+        Returns the key of a weighing and whether the bowls were swapped to get it. The order of
+        the bars in a bowl does not matter, and (A, B) is the mirror of (B, A).
+        """
+        key = (tuple(sorted(left)), tuple(sorted(right)))
+        mirrored = (key[1], key[0])
+        if mirrored < key:
+            return mirrored, True
+        return key, False
+
+    @staticmethod
+    def outcome(candidate: Tuple[int, str], left: Collection[int], right: Collection[int]) -> str:
+        """
+        The result a weighing of equal bowls gives if the candidate is the fake bar.
+        Pass the bowls as sets when checking many candidates.
+        """
+        bar, direction = candidate
+        if bar in left:
+            result = "<"
+        elif bar in right:
+            result = ">"
+        else:
+            return "="
+        return result if direction == LIGHTER else _FLIPPED[result]
+
+    def lookup(self, left: List[int], right: List[int]) -> Optional[str]:
+        """
+        Answers a weighing without the scale, if it was made before or every remaining
+        candidate gives the same result.
+
+        Args:
+        left (List[int]): Bars on the left side of the scale.
+        right (List[int]): Bars on the right side of the scale.
+
+        Returns:
+        Optional[str]: '<', '>' or '=', or None if the scale has to be used.
+        """
+        key, swapped = self.normalize(left, right)
+        if key in self.results:
+            self.cached += 1
+            result = self.results[key]
+            return _FLIPPED[result] if swapped else result
+
+        # Only bowls with as many bars on each side are decided by the fake bar alone
+        if self.candidates and len(self.candidates) <= DEDUCE_LIMIT and len(left) == len(right):
+            on_left, on_right = set(left), set(right)
+            outcomes = {self.outcome(candidate, on_left, on_right) for candidate in self.candidates}
+            if len(outcomes) == 1:
+                self.deduced += 1
+                result = outcomes.pop()
+                self.results[key] = _FLIPPED[result] if swapped else result
+                return result
+        return None
+
+    def record(self, left: List[int], right: List[int], result: str) -> None:
+        """
+        Adds the result of a weighing made on the scale, and drops the candidates it rules out.
+
+        Args:
+        left (List[int]): Bars on the left side of the scale.
+        right (List[int]): Bars on the right side of the scale.
+        result (str): The result of the weighing, '<', '>', or '='.
+        """
+        self.weighed += 1
+        key, swapped = self.normalize(left, right)
+        self.results[key] = _FLIPPED[result] if swapped else result
+        if self.candidates is not None and len(left) == len(right):
+            on_left, on_right = set(left), set(right)
+            self.candidates = {candidate for candidate in self.candidates
+                               if self.outcome(candidate, on_left, on_right) == result}
+
+    def saved(self) -> int:
+        """
+        Number of weighings answered without the scale.
+        """
+        return self.cached + self.deduced
+
+    def stats(self) -> Dict[str, int]:
+        return {"weighed": self.weighed, "cached": self.cached, "deduced": self.deduced,
+                "saved": self.saved()}
@@ -0,0 +1,289 @@
+# local_server.py
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# The page keeps the DOM contract of the challenge site: the left_i/right_i grids, the result
+# and reset buttons that share the ID 'reset', the weigh button, the coin_i buttons with their
+# alert and the weighings history in 'div.game-info ol li'. The scale itself lives on the server.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>Gold Bar Weighing</title></head>
+<body>
+<div class="game-board">
+  <div class="board-row">
+    <p>Left bowl</p>
+    __LEFT__
+  </div>
+  <div class="board-row">
+    <p>Right bowl</p>
+    __RIGHT__
+  </div>
+  <div class="result">
+    <p>Result</p>
+    <button id="reset" disabled>?</button>
+  </div>
+  <button id="reset" class="button">Reset</button>
+  <button id="weigh" class="button">Weigh</button>
+  <div class="coins">__COINS__</div>
+</div>
+<div class="game-info">
+  <p>Weighings</p>
+  <ol></ol>
+</div>
+<script>
+const gameId = __GAME_ID__;
+const cells = __CELLS__;
+const result = document.getElementById('reset');
+
+const readBowl = (side) => {
+    const bars = [];
+    for (let i = 0; i < cells; i++) {
+        const value = document.getElementById(side + '_' + i).value.trim();
+        if (value !== '') bars.push(Number(value));
+    }
+    return bars;
+};
+
+document.getElementById('weigh').addEventListener('click', async () => {
+    const left = readBowl('left');
+    const right = readBowl('right');
+    const response = await fetch('/weigh', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({game: gameId, left: left, right: right})
+    });
+    const outcome = await response.json();
+    if (outcome.error) {
+        alert(outcome.error);
+        return;
+    }
+    result.textContent = outcome.result;
+    const item = document.createElement('li');
+    item.textContent = '[' + left.join(',') + '] ' + outcome.result + ' [' + right.join(',') + ']';
+    document.querySelector('div.game-info ol').appendChild(item);
+});
+
+document.querySelector('button#reset.button').addEventListener('click', () => {
+    document.querySelectorAll('.board-row input').forEach((input) => { input.value = ''; });
+    result.textContent = '?';
+});
+
+document.querySelectorAll('.coins button').forEach((coin) => {
+    coin.addEventListener('click', async () => {
+        const response = await fetch('/guess?game=' + gameId + '&bar=' + coin.textContent);
+        const outcome = await response.json();
+        alert(outcome.found ? 'Yay! You find it!' : 'Oops! Try Again!');
+    });
+});
+</script>
+</body>
+</html>
+"""
+
+
+class LocalGameServer:
+
+    def __init__(self,
+                 bars: int = 9,
+                 fake_bar: Optional[int] = None,
+                 heavier: bool = False,
+                 delay: float = 0.0,
+                 cells: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        """
+        Initializes a local stand-in for the challenge site, built on the standard library.
+        Every page load starts a new game.
+
+        Args:
+        bars (int): Number of gold bars.
+        fake_bar (Optional[int]): Position of the fake bar. None picks a random bar for each game.
+        heavier (bool): If True, the fake bar is heavier instead of lighter.
+        delay (float): Seconds the server waits before answering a weighing.
+        cells (Optional[int]): Grid cells in each bowl. Defaults to the number of bars.
+        seed (Optional[int]): Seed for the random fake bars, for reproducible runs.
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 picks a free port.
+        """
+        if bars < 1:
+            raise ValueError("At least 1 bar is needed")
+        if fake_bar is not None and not 0 <= fake_bar < bars:
+            raise ValueError(f"The fake bar should be between 0 and {bars - 1}")
+        self.bars = bars
+        self.fake_bar = fake_bar
+        self.heavier = heavier
+        self.delay = delay
+        self.cells = cells or bars
+        self.random = random.Random(seed)
+        self.games: Dict[int, int] = {}
+        self.game_ids = itertools.count()
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Serves the page from a background thread.
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="local-game-server", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def new_game(self) -> int:
+        """
+        Starts a game and returns its ID.
+        """
+        with self.lock:
+            game_id = next(self.game_ids)
+            fake_bar = self.fake_bar if self.fake_bar is not None else self.random.randrange(self.bars)
+            self.games[game_id] = fake_bar
+        return game_id
+
+    def page(self, game_id: int) -> str:
+        def grid(side: str) -> str:
+            return "".join(f'<input id="{side}_{i}" type="text">' for i in range(self.cells))
+
+        coins = "".join(f'<button id="coin_{i}">{i}</button>' for i in range(self.bars))
+        return (PAGE_TEMPLATE.replace("__LEFT__", grid("left"))
+                .replace("__RIGHT__", grid("right"))
+                .replace("__COINS__", coins)
+                .replace("__GAME_ID__", str(game_id))
+                .replace("__CELLS__", str(self.cells)))
+
+    def weigh(self, game_id: int, left: List[int], right: List[int]) -> str:
+        """
+        Compares two bowls of the game.
+
+        Args:
+        game_id (int): The game the weighing belongs to.
+        left (List[int]): Bars in the left bowl.
+        right (List[int]): Bars in the right bowl.
+
+        Returns:
+        str: '<' if the left bowl is lighter, '>' if it is heavier, '=' otherwise.
+
+        Raises:
+        ValueError: If the game is unknown or the bars are not valid.
+        """
+        fake_bar = self.games[game_id]
+        all_bars = left + right
+        if len(set(all_bars)) != len(all_bars) or not all(0 <= bar < self.bars for bar in all_bars):
+            raise ValueError("Inputs are invalid: Both sides must have unique numbers from 0 to "
+                             f"{self.bars - 1}")
+
+        # Genuine bars weigh 2, the fake one 1 or 3
+        fake_weight = 3 if self.heavier else 1
+        left_weight = sum(fake_weight if bar == fake_bar else 2 for bar in left)
+        right_weight = sum(fake_weight if bar == fake_bar else 2 for bar in right)
+        if left_weight < right_weight:
+            return "<"
+        if left_weight > right_weight:
+            return ">"
+        return "="
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def send_body(self, status: int, body: str, content_type: str) -> None:
+                encoded = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def send_json(self, status: int, payload: Dict) -> None:
+                self.send_body(status, json.dumps(payload), "application/json")
+
+            def do_GET(self) -> None:
+                request = urlparse(self.path)
+                if request.path == "/":
+                    self.send_body(200, server.page(server.new_game()), "text/html")
+                elif request.path == "/guess":
+                    query = parse_qs(request.query)
+                    try:
+                        game_id = int(query["game"][0])
+                        found = server.games[game_id] == int(query["bar"][0])
+                    except (KeyError, ValueError):
+                        self.send_json(400, {"error": "Unknown game or bar"})
+                        return
+                    self.send_json(200, {"found": found})
+                else:
+                    self.send_json(404, {"error": "Not found"})
+
+            def do_POST(self) -> None:
+                if urlparse(self.path).path != "/weigh":
+                    self.send_json(404, {"error": "Not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length))
+                    if server.delay:
+                        time.sleep(server.delay)
+                    result = server.weigh(int(request["game"]),
+                                          [int(bar) for bar in request["left"]],
+                                          [int(bar) for bar in request["right"]])
+                except KeyError:
+                    self.send_json(400, {"error": "Unknown game"})
+                    return
+                except ValueError as e:
+                    self.send_json(200, {"error": str(e)})
+                    return
+                self.send_json(200, {"result": result})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the gold bar game.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--bars", type=int, default=9)
+    parser.add_argument("--cells", type=int, default=None, help="Grid cells in each bowl")
+    parser.add_argument("--fake-bar", type=int, default=None, help="Random for each game if not set")
+    parser.add_argument("--heavier", action="store_true", help="The fake bar is heavier")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before each weighing answers")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    game_server = LocalGameServer(args.bars, args.fake_bar, args.heavier, args.delay, args.cells,
+                                  args.seed, args.host, args.port)
+    print(f"Serving the gold bar game on {game_server.url}")
+    try:
+        game_server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game_server.httpd.server_close()
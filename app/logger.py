@@ -1,14 +1,263 @@
 # logger.py
+import atexit
+import collections
+import contextvars
+import copy
+import functools
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
 
+LOGGER_NAME = "goldbar"
+LOG_FILE = "goldbar.log"
+# Where a failed game dumps the recent records, by process and game so concurrent dumps never
+# write the same file
+RECENT_FILE = "goldbar_recent-{pid}.jsonl"
+RECENT_GAME_FILE = "goldbar_recent-{pid}-{game_id}.jsonl"
 
-def setup_logger():
-    # Define Log to store the errors
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        filename="goldbar.log",
-        filemode='a'
-        )
-    
-    return logging.getLogger()
+# The phase of the game the current thread is in, added to every record it logs
+_phase: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar("phase", default=None)
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_recent: Optional["RingBufferHandler"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line, with the game ID and phase.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(event(record), default=str)
+
+
+def event(record: logging.LogRecord) -> Dict[str, Any]:
+    data = {
+        "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+        "level": record.levelname,
+        "message": record.getMessage(),
+        "game_id": getattr(record, "game_id", None),
+        "phase": getattr(record, "phase", None),
+        "thread": record.threadName,
+    }
+    if record.exc_info:
+        data["exception"] = logging.Formatter().formatException(record.exc_info)
+    elif record.exc_text:
+        data["exception"] = record.exc_text
+    return data
+
+
+class ContextFilter(logging.Filter):
+    """
+    Adds the phase of the logging thread, and an empty game ID for records logged outside a game.
+    Runs in the thread that logs, before the record is queued.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "phase"):
+            record.phase = _phase.get()
+        if not hasattr(record, "game_id"):
+            record.game_id = None
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records with their message and traceback formatted, and their fields kept, so the
+    listener can write them as JSON.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the most recent records in memory, to be dumped when something fails.
+    Appending to a deque needs no lock and no I/O, so it runs in the logging thread.
+    """
+
+    def __init__(self, capacity: int = 500) -> None:
+        super().__init__()
+        self.records: Deque[logging.LogRecord] = collections.deque(maxlen=capacity)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+        self.records.append(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def events(self) -> List[Dict[str, Any]]:
+        return [event(record) for record in list(self.records)]
+
+
+def configure_logging(path: str = LOG_FILE,
+                      level: int = logging.INFO,
+                      max_bytes: int = 5 * 1024 * 1024,
+                      backup_count: int = 3,
+                      ring_size: int = 500) -> logging.Logger:
+    """
+    Sets up the application logger. Records are put on a queue and written by a background
+    listener, so logging never waits for the file. The file holds one JSON record per line and
+    is rotated, and the most recent records are kept in memory. Configuring again replaces
+    the earlier setup.
+
+    Args:
+    path (str): The log file.
+    level (int): The lowest level that is logged.
+    max_bytes (int): Size at which the log file is rotated.
+    backup_count (int): Number of rotated files kept.
+    ring_size (int): Number of recent records kept in memory.
+
+    Returns:
+    logging.Logger: The application logger.
+    """
+    with _lock:
+        return _configure(path, level, max_bytes, backup_count, ring_size)
+
+
+def _configure(path: str, level: int, max_bytes: int, backup_count: int, ring_size: int) -> logging.Logger:
+    global _listener, _recent
+    _stop()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                        backupCount=backup_count, delay=True)
+    file_handler.setFormatter(JsonFormatter())
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    _recent = RingBufferHandler(ring_size)
+    _recent.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    logger.addHandler(_recent)
+
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    return logger
+
+
+def _stop() -> None:
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if _listener is not None:
+        # Writes what is still queued, then closes the file
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """
+    Writes the queued records and stops the listener.
+    """
+    with _lock:
+        _stop()
+
+
+atexit.register(shutdown_logging)
+
+
+def setup_logger() -> logging.Logger:
+    """
+    Returns the application logger, set up with the defaults on first use.
+    """
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                return _configure(LOG_FILE, logging.INFO, 5 * 1024 * 1024, 3, 500)
+    return logging.getLogger(LOGGER_NAME)
+
+
+@contextmanager
+def log_phase(phase: str) -> Iterator[None]:
+    """
+    Marks the records logged in the with block, by this thread, with a phase of the game.
+
+    Args:
+    phase (str): The phase, like 'weigh' or 'validate'.
+    """
+    token = _phase.set(phase)
+    try:
+        yield
+    finally:
+        _phase.reset(token)
+
+
+def in_phase(phase: str) -> Callable[[Callable], Callable]:
+    """
+    Marks the records logged during every call of the decorated function with a phase.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            token = _phase.set(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _phase.reset(token)
+        return wrapper
+    return decorator
+
+
+def recent_events() -> List[Dict[str, Any]]:
+    """
+    Returns the records kept in memory, oldest first.
+    """
+    return _recent.events() if _recent is not None else []
+
+
+def dump_recent(path: Optional[str] = None, game_id: Any = None) -> str:
+    """
+    Writes the records kept in memory to a file, one JSON record per line.
+
+    Args:
+    path (Optional[str]): Where to write them. Defaults to a file named after the process
+    and the game, RECENT_GAME_FILE, or RECENT_FILE without a game.
+    game_id (Any): The game that failed, to name the default file.
+
+    Returns:
+    str: The path written.
+    """
+    if path is None:
+        template = RECENT_FILE if game_id is None else RECENT_GAME_FILE
+        path = template.format(pid=os.getpid(), game_id=game_id)
+    with open(path, "w") as recent_file:
+        for data in recent_events():
+            recent_file.write(json.dumps(data, default=str) + "\n")
+    return path
+
+
+class GameLoggerAdapter(logging.LoggerAdapter):
+    """
+    Adds the game ID to every record, so logs of concurrent games can be told apart.
+    """
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
+        return msg, kwargs
+
+
+def game_logger(game_id) -> GameLoggerAdapter:
+    return GameLoggerAdapter(setup_logger(), {"game_id": game_id})
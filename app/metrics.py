@@ -0,0 +1,127 @@
+# metrics.py
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterable, Iterator, List
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Returns the q-th percentile of the values, interpolating between the closest ranks.
+
+    Args:
+    values (Iterable[float]): The samples.
+    q (float): The percentile, between 0 and 100.
+
+    Returns:
+    float: The percentile, or 0.0 if there are no samples.
+    """
+    ordered: List[float] = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class LatencyWindow:
+
+    def __init__(self, size: int = 256) -> None:
+        """
+        Keeps the most recent latency samples.
+
+        Args:
+        size (int): How many samples to keep.
+        """
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        return percentile(self.samples, q)
+
+
+class AdaptiveTimeout:
+
+    def __init__(self,
+                 initial: float = 10.0,
+                 multiplier: float = 4.0,
+                 minimum: float = 0.5,
+                 maximum: float = 30.0,
+                 min_samples: int = 20,
+                 window: int = 256) -> None:
+        """
+        Derives a timeout from the observed latencies, a multiple of the rolling p99.
+        A hung page then fails in a few times the usual latency instead of a fixed timeout.
+
+        Args:
+        initial (float): Timeout in seconds until enough latencies are observed.
+        multiplier (float): The timeout is this multiple of the p99 latency.
+        minimum (float): The shortest timeout in seconds.
+        maximum (float): The longest timeout in seconds.
+        min_samples (int): Number of latencies needed before adapting.
+        window (int): Number of recent latencies to keep.
+        """
+        self.initial = initial
+        self.multiplier = multiplier
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_samples = min_samples
+        self.latencies = LatencyWindow(window)
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds an observed latency in seconds.
+        """
+        self.latencies.add(seconds)
+
+    def timeout(self) -> float:
+        """
+        Returns the timeout in seconds for the next wait.
+        """
+        if len(self.latencies) < self.min_samples:
+            return self.initial
+        timeout = self.multiplier * self.latencies.percentile(99)
+        return min(self.maximum, max(self.minimum, timeout))
+
+
+class PhaseTimer:
+
+    def __init__(self) -> None:
+        """
+        Collects the duration of named phases, in milliseconds.
+        """
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Times the with block as one sample of the phase. Failed blocks are not recorded.
+        """
+        start = time.perf_counter()
+        yield
+        self.record(phase, (time.perf_counter() - start) * 1000)
+
+    def record(self, phase: str, milliseconds: float) -> None:
+        self.samples.setdefault(phase, []).append(milliseconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the number of samples, mean, p50, p95 and p99 of every phase.
+        """
+        return {
+            phase: {
+                "samples": len(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            }
+            for phase, values in self.samples.items()
+        }
@@ -0,0 +1,421 @@
+# planner.py
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class TernarySearchPlanner:
+
+    def __init__(self, bowl_capacity: Optional[int] = None) -> None:
+        """
+        Initializes the planner for a fake bar that is known to be lighter.
+
+        Args:
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid.
+        None means the bowls can hold any number of bars.
+        """
+        if bowl_capacity is not None and bowl_capacity < 1:
+            raise ValueError("Bowl capacity should be at least 1")
+        self.bowl_capacity = bowl_capacity
+
+    def group_size(self, n: int) -> int:
+        """
+        Number of bars to place in each bowl when searching n bars.
+
+        Args:
+        n (int): Number of suspected bars.
+
+        Returns:
+        int: Bars per bowl, ceil(n / 3) limited by the bowl capacity.
+        """
+        size = (n + 2) // 3
+        if self.bowl_capacity is not None:
+            size = min(size, self.bowl_capacity)
+        return size
+
+    def split(self, bars: Sequence[int]) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Split the suspected bars into near-equal thirds.
+
+        Args:
+        bars (Sequence[int]): Suspected bars, at least 2.
+
+        Returns:
+        Tuple[List[int], List[int], List[int]]: Left bowl, right bowl and remaining bars.
+        The bowls always hold the same number of bars.
+        """
+        if len(bars) < 2:
+            raise ValueError("At least 2 bars are needed for a weighing")
+
+        size = self.group_size(len(bars))
+        bars = list(bars)
+        return bars[:size], bars[size:2 * size], bars[2 * size:]
+
+    def max_weighings(self, n: int) -> int:
+        """
+        Worst case number of weighings needed to find the fake bar among n bars.
+        Without a bowl capacity this is ceil(log3 n).
+
+        Args:
+        n (int): Number of suspected bars.
+
+        Returns:
+        int: The number of weighings.
+        """
+        weighings = 0
+        while n > 1:
+            size = self.group_size(n)
+            n = max(size, n - 2 * size)
+            weighings += 1
+        return weighings
+
+
+class PriorSearchPlanner:
+
+    def __init__(self,
+                 probabilities: Sequence[float],
+                 bowl_capacity: Optional[int] = None,
+                 slack: int = 0) -> None:
+        """
+        Initializes the planner for a lighter fake bar whose position is not equally likely.
+        Likely bars are weighed alone early and unlikely ones are grouped, like a Huffman code
+        with three outcomes, to minimize the expected number of weighings. The worst case is
+        kept within `slack` weighings of the TernarySearchPlanner.
+
+        The bars are sorted by probability and every weighing splits a run of them into three
+        consecutive blocks, two of the same size for the bowls. The best splits are found by
+        dynamic programming over the runs and the weighings left.
+
+        Args:
+        probabilities (Sequence[float]): The weight of each position being the fake bar. They are
+        normalized, so counts work as well.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid.
+        None means the bowls can hold any number of bars.
+        slack (int): Extra weighings the worst case may take over the uniform plan.
+        """
+        if not probabilities:
+            raise ValueError("At least 1 bar is needed")
+        if min(probabilities) < 0 or sum(probabilities) <= 0:
+            raise ValueError("The probabilities should be non-negative and not all zero")
+        if slack < 0:
+            raise ValueError("The slack should not be negative")
+        total = float(sum(probabilities))
+        self.probabilities = [p / total for p in probabilities]
+        self.uniform = TernarySearchPlanner(bowl_capacity)
+        self.bowl_capacity = bowl_capacity
+        self.max_weighings = self.uniform.max_weighings(len(probabilities)) + slack
+        # Positions from the most to the least likely, ties in position order
+        self.order = sorted(range(len(probabilities)), key=lambda position: -self.probabilities[position])
+        self.prefix = [0.0]
+        for position in self.order:
+            self.prefix.append(self.prefix[-1] + self.probabilities[position])
+        self.costs: Dict[Tuple[int, int, int], Tuple[float, Optional[Tuple[int, int]]]] = {}
+        # Most bars searchable in 0, 1, 2... weighings
+        self.limits = [1]
+
+    def limit(self, weighings: int) -> int:
+        """
+        Most bars a lighter fake bar can be found among in a number of weighings.
+
+        Args:
+        weighings (int): The weighings left.
+
+        Returns:
+        int: 3^weighings, less when the bowls are small.
+        """
+        while len(self.limits) <= weighings:
+            bars = self.limits[-1]
+            bowl = bars if self.bowl_capacity is None else min(bars, self.bowl_capacity)
+            self.limits.append(bars + 2 * bowl)
+        return self.limits[max(weighings, 0)]
+
+    def _best(self, start: int, end: int, weighings: int) -> Tuple[float, Optional[Tuple[int, int]]]:
+        # The probability-weighted weighings below the run start:end of the sorted bars, and
+        # the bowl size and block of the remaining bars (0, 1 or 2) of the best split
+        key = (start, end, weighings)
+        if key in self.costs:
+            return self.costs[key]
+        size = end - start
+        if size <= 1:
+            best: Tuple[float, Optional[Tuple[int, int]]] = (0.0, None)
+        elif size > self.limit(weighings):
+            best = (float("inf"), None)
+        else:
+            best = (float("inf"), None)
+            # Every block must be searchable in the weighings left after this one
+            below = self.limit(weighings - 1)
+            bowl_limit = min(size // 2, below)
+            if self.bowl_capacity is not None:
+                bowl_limit = min(bowl_limit, self.bowl_capacity)
+            for bowl in range(max(1, (size - below + 1) // 2), bowl_limit + 1):
+                for block in (0, 1, 2):
+                    cost = sum(self._best(first, last, weighings - 1)[0]
+                               for first, last in self._blocks(start, end, bowl, block))
+                    if cost < best[0]:
+                        best = (cost, (bowl, block))
+            best = (best[0] + self.prefix[end] - self.prefix[start], best[1])
+        self.costs[key] = best
+        return best
+
+    @staticmethod
+    def _blocks(start: int, end: int, bowl: int, block: int) -> List[Tuple[int, int]]:
+        # The runs of the left bowl, right bowl and remaining bars, with the remaining bars as
+        # the first, middle or last block of the run
+        remaining = end - start - 2 * bowl
+        sizes = [bowl, bowl]
+        sizes.insert(block, remaining)
+        bounds = [start]
+        for length in sizes:
+            bounds.append(bounds[-1] + length)
+        runs = list(zip(bounds, bounds[1:]))
+        remaining_run = runs.pop(block)
+        return runs + [remaining_run]
+
+    def split(self, start: int, end: int, weighings: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Best weighing for a run of the bars sorted by probability.
+
+        Args:
+        start (int): First index of the run in `order`.
+        end (int): Index after the run.
+        weighings (int): The weighings left, the run must be solved within them.
+
+        Returns:
+        Tuple[Tuple[int, int], ...]: The runs of the left bowl, right bowl and remaining bars.
+
+        Raises:
+        ValueError: If the run can not be searched within the weighings left.
+        """
+        cost, choice = self._best(start, end, weighings)
+        if choice is None:
+            raise ValueError(f"{end - start} bars can not be searched in {weighings} weighings")
+        return tuple(self._blocks(start, end, *choice))
+
+    def expected_weighings(self) -> float:
+        """
+        Expected number of weighings of the plan, over the probabilities.
+        """
+        return self._best(0, len(self.order), self.max_weighings)[0]
+
+
+LIGHTER = "lighter"
+HEAVIER = "heavier"
+
+
+class OddBarState:
+
+    def __init__(self,
+                 unknown: List[int],
+                 light: List[int],
+                 heavy: List[int],
+                 genuine: List[int]) -> None:
+        """
+        Holds what is known about the bars while searching for a fake bar that may be
+        heavier or lighter.
+
+        Args:
+        unknown (List[int]): Bars that could be the fake bar, either lighter or heavier.
+        light (List[int]): Bars that could only be a lighter fake bar.
+        heavy (List[int]): Bars that could only be a heavier fake bar.
+        genuine (List[int]): Bars known to be genuine, used as reference weights.
+        """
+        self.unknown = unknown
+        self.light = light
+        self.heavy = heavy
+        self.genuine = genuine
+
+    def possibilities(self) -> int:
+        """
+        Number of (bar, direction) answers that are still possible.
+        """
+        return 2 * len(self.unknown) + len(self.light) + len(self.heavy)
+
+
+class OddBarPlanner:
+
+    def __init__(self, bowl_capacity: Optional[int] = None) -> None:
+        """
+        Initializes the planner for a fake bar that may be heavier or lighter.
+        Every weighing has three outcomes, so w weighings tell apart at most 3^w answers.
+        The plans reach that limit: (3^w - 3) / 2 bars without a known genuine bar
+        (12 bars in 3 weighings) and (3^w - 1) / 2 bars with one.
+
+        Args:
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid.
+        None means the bowls can hold any number of bars.
+        """
+        if bowl_capacity is not None and bowl_capacity < 1:
+            raise ValueError("Bowl capacity should be at least 1")
+        self.bowl_capacity = bowl_capacity
+
+    @staticmethod
+    def start(bars: Sequence[int], genuine: Sequence[int] = ()) -> OddBarState:
+        """
+        Creates the state before the first weighing.
+
+        Args:
+        bars (Sequence[int]): Bars that could be the fake bar.
+        genuine (Sequence[int]): Extra bars known to be genuine.
+
+        Returns:
+        OddBarState: Every bar could be lighter or heavier.
+        """
+        all_bars = list(bars) + list(genuine)
+        if len(set(all_bars)) != len(all_bars):
+            raise ValueError("The bar values should be unique")
+        if len(bars) < (3 if not genuine else 1):
+            raise ValueError("The fake bar and its direction can not be found with these bars. "
+                             "Enter at least 3 bars, or 1 bar and a genuine bar")
+        return OddBarState(list(bars), [], [], list(genuine))
+
+    @staticmethod
+    def min_weighings(state: OddBarState) -> int:
+        """
+        Least number of weighings that can find the fake bar and its direction.
+        With a bowl capacity, more weighings might be needed.
+
+        Args:
+        state (OddBarState): What is known about the bars.
+
+        Returns:
+        int: The number of weighings.
+        """
+        if state.unknown:
+            # Without a reference bar the first weighing can not use every outcome
+            spare = 1 if state.genuine else 3
+            limit = lambda w: (3 ** w - spare) // 2
+            target = len(state.unknown)
+        else:
+            limit = lambda w: 3 ** w
+            target = len(state.light) + len(state.heavy)
+
+        weighings = 0
+        while limit(weighings) < target:
+            weighings += 1
+        return weighings
+
+    def plan(self, state: OddBarState) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Chooses the next weighing.
+
+        Args:
+        state (OddBarState): What is known about the bars.
+
+        Returns:
+        Optional[Tuple[List[int], List[int]]]: Bars for the left and right bowls,
+        or None when the fake bar is already known.
+        """
+        if state.possibilities() == 0:
+            raise ValueError("The weighings do not match a single fake bar")
+        if not state.unknown and len(state.light) + len(state.heavy) == 1:
+            return None
+
+        # Each outcome may only leave as many answers as the remaining weighings can tell apart
+        outcome_limit = 3 ** (self.min_weighings(state) - 1)
+        if state.unknown:
+            return self._plan_unknown(state, outcome_limit)
+        return self._plan_suspects(state, outcome_limit)
+
+    def _plan_unknown(self, state: OddBarState, outcome_limit: int) -> Tuple[List[int], List[int]]:
+        """
+        Splits bars that could be lighter or heavier. A bar left off the scale keeps both
+        answers for the '=' outcome, a bar on the scale leaves one answer for '<' and one for '>'.
+        """
+        unknown = state.unknown
+        if state.genuine:
+            off = min(len(unknown), (outcome_limit - 1) // 2)
+        else:
+            # Leave at least one bar for each bowl
+            off = min((outcome_limit - 1) // 2, len(unknown) - 2)
+        on = len(unknown) - off
+        if self.bowl_capacity is not None:
+            on = min(on, 2 * self.bowl_capacity)
+
+        if on % 2 and not state.genuine:
+            # No reference bar to even out the bowls, so weigh one bar more or one bar less
+            fits = self.bowl_capacity is None or on < 2 * self.bowl_capacity
+            on += 1 if fits and on < len(unknown) else -1
+
+        half = (on + 1) // 2
+        left = unknown[:half]
+        right = unknown[half:on]
+        if on % 2:
+            right.append(state.genuine[0])
+        return left, right
+
+    def _plan_suspects(self, state: OddBarState, outcome_limit: int) -> Tuple[List[int], List[int]]:
+        """
+        Splits bars with a known direction. A pair of suspects with the same direction goes in
+        opposite bowls, which adds one answer to '<' and one to '>' and keeps the bowls even.
+        """
+        suspects = state.light + state.heavy
+        on = len(suspects) - outcome_limit
+        pairs = on // 2
+        single = on % 2
+        if self.bowl_capacity is not None:
+            pairs = min(pairs, self.bowl_capacity - single)
+
+        left, right = [], []
+        for group in (state.light, state.heavy):
+            for i in range(0, len(group) - 1, 2):
+                if len(left) == pairs:
+                    break
+                left.append(group[i])
+                right.append(group[i + 1])
+
+        if single:
+            if not state.genuine:
+                raise ValueError("A genuine bar is needed to weigh a single suspected bar")
+            weighed = set(left + right)
+            left.append(next(bar for bar in reversed(suspects) if bar not in weighed))
+            right.append(state.genuine[0])
+        return left, right
+
+    @staticmethod
+    def update(state: OddBarState, left: List[int], right: List[int], result: str) -> OddBarState:
+        """
+        Narrows down the suspected bars based on the weighing result.
+
+        Args:
+        state (OddBarState): What was known before the weighing.
+        left (List[int]): Bars on the left side of the scale.
+        right (List[int]): Bars on the right side of the scale.
+        result (str): The result of the weighing, '<', '>', or '='.
+
+        Returns:
+        OddBarState: What is known after the weighing.
+        """
+        on_left = set(left)
+        on_right = set(right)
+        if result == "=":
+            unknown = [bar for bar in state.unknown if bar not in on_left and bar not in on_right]
+            light = [bar for bar in state.light if bar not in on_left and bar not in on_right]
+            heavy = [bar for bar in state.heavy if bar not in on_left and bar not in on_right]
+        elif result in ("<", ">"):
+            lighter_side, heavier_side = (on_left, on_right) if result == "<" else (on_right, on_left)
+            light = [bar for bar in state.unknown + state.light if bar in lighter_side]
+            heavy = [bar for bar in state.unknown + state.heavy if bar in heavier_side]
+            unknown = []
+        else:
+            raise ValueError("Unexpected Result")
+
+        suspects = set(unknown + light + heavy)
+        genuine = state.genuine + [bar for bar in state.unknown + state.light + state.heavy
+                                   if bar not in suspects]
+        return OddBarState(unknown, light, heavy, genuine)
+
+    @staticmethod
+    def solution(state: OddBarState) -> Tuple[int, str]:
+        """
+        Returns the fake bar once only one answer is left.
+
+        Args:
+        state (OddBarState): What is known about the bars.
+
+        Returns:
+        Tuple[int, str]: The fake bar and whether it is 'lighter' or 'heavier'.
+        """
+        if state.unknown or len(state.light) + len(state.heavy) != 1:
+            raise ValueError("The fake bar is not known yet")
+        if state.light:
+            return state.light[0], LIGHTER
+        return state.heavy[0], HEAVIER
@@ -0,0 +1,112 @@
+# runner.py
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .goldbar import GoldBarWeighing
+from .logger import dump_recent, game_logger
+from .metrics import percentile
+from .strategy import StrategyCache
+from .web_driver_pool import WebDriverPool
+
+
+class ConcurrentGameRunner:
+
+    def __init__(self,
+                 pool: WebDriverPool,
+                 concurrency: Optional[int] = None,
+                 bowl_capacity: Optional[int] = None,
+                 strategy_cache: Optional[StrategyCache] = None,
+                 fused_weigh: bool = False) -> None:
+        """
+        Initializes a runner that plays many games at once, one driver per worker.
+
+        Args:
+        pool (WebDriverPool): The drivers the games are played on.
+        concurrency (Optional[int]): How many games run at the same time.
+        Defaults to the pool size, so every worker has its own driver.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+        strategy_cache (Optional[StrategyCache]): Where precompiled strategies are stored.
+        fused_weigh (bool): Weigh with a single script call instead of separate WebDriver commands.
+        """
+        self.pool = pool
+        self.concurrency = concurrency or pool.size
+        if self.concurrency < 1:
+            raise ValueError("The concurrency should be at least 1")
+        self.bowl_capacity = bowl_capacity
+        self.strategy_cache = strategy_cache
+        self.fused_weigh = fused_weigh
+
+    def play(self, game_id: int, scenario: Dict[str, List[int]]) -> Dict[str, Any]:
+        """
+        Plays one game on a driver from the pool.
+
+        Args:
+        game_id (int): Identifies the game in the logs and results.
+        scenario (Dict[str, List[int]]): The 'left_bar', 'right_bar' and 'remaining' bars of
+        the first weighing, as in config.json.
+
+        Returns:
+        Dict[str, Any]: The game, the fake bar found, whether the answer was right, the
+        latency in seconds and the error, if any. A failed game also gives the file the recent
+        log records were dumped to.
+        """
+        logger = game_logger(game_id)
+        result: Dict[str, Any] = {"game": game_id, "fake_bar": None, "found": False, "error": None}
+        start = time.perf_counter()
+        try:
+            # A failed game leaves the checkout with an error, so its driver is recycled
+            with self.pool.checkout() as driver:
+                start = time.perf_counter()
+                gb = GoldBarWeighing(driver, self.bowl_capacity, self.strategy_cache,
+                                     fused_weigh=self.fused_weigh, quit_on_exit=False, logger=logger)
+                gb.reset()
+                result["fake_bar"] = gb.find_fake_bar(
+                    left=scenario['left_bar'],
+                    right=scenario['right_bar'],
+                    remaining=scenario['remaining'])
+                result["found"] = bool(gb.validate_answer(result["fake_bar"]))
+                result["latency"] = time.perf_counter() - start
+        except Exception as e:
+            logger.error(f"Some error occurred while playing the game: {e}")
+            result["error"] = str(e)
+            result["recent_events"] = dump_recent(game_id=game_id)
+            result["latency"] = time.perf_counter() - start
+        return result
+
+    def run(self, scenarios: List[Dict[str, List[int]]]) -> Dict[str, Any]:
+        """
+        Plays every scenario, at most `concurrency` games at a time.
+
+        Args:
+        scenarios (List[Dict[str, List[int]]]): One scenario per game.
+
+        Returns:
+        Dict[str, Any]: The results of every game and a summary with the throughput in games
+        per second and the p50, p95 and p99 game latency in seconds.
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="game") as executor:
+            results = list(executor.map(self.play, range(len(scenarios)), scenarios))
+        elapsed = time.perf_counter() - start
+
+        latencies = [result["latency"] for result in results]
+        summary = {
+            "games": len(results),
+            "found": sum(result["found"] for result in results),
+            "errors": sum(result["error"] is not None for result in results),
+            "concurrency": self.concurrency,
+            "seconds": elapsed,
+            "games_per_second": len(results) / elapsed if elapsed else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+        }
+        return {"summary": summary, "results": results}
+
+
+if __name__ == "__main__":
+    from .cli import main
+    sys.exit(main(["run"] + sys.argv[1:]))
@@ -0,0 +1,168 @@
+# scale.py
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .planner import TernarySearchPlanner
+
+
+class WeighingRecord(NamedTuple):
+    """
+    One weighing: the bars in each bowl and the result, '<', '>' or '='.
+    """
+    left: List[int]
+    right: List[int]
+    result: str
+
+    def __str__(self) -> str:
+        # Formatted like the page lists it, '[0,1,2] < [3,4,5]'
+        return f"[{','.join(map(str, self.left))}] {self.result} [{','.join(map(str, self.right))}]"
+
+
+class Scale(ABC):
+    """
+    A balance scale the solver weighs bars on. GoldBarWeighing is the Selenium implementation,
+    SimulatedScale weighs in memory.
+    """
+
+    @abstractmethod
+    def weigh(self, bars_left: List[int], bars_right: List[int]) -> str:
+        """
+        Returns '<' if the left bowl is lighter, '>' if it is heavier, '=' otherwise.
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Empties the bowls.
+        """
+
+    @abstractmethod
+    def guess(self, bar: int) -> bool:
+        """
+        Returns True if the bar is the fake one.
+        """
+
+    @abstractmethod
+    def weighing_records(self) -> List[WeighingRecord]:
+        """
+        Returns the weighings performed, with the bars of each bowl and the result.
+        """
+
+    def weighings(self) -> List[str]:
+        """
+        Returns the weighings performed, like '[0,1,2] < [3,4,5]'.
+        """
+        return [str(record) for record in self.weighing_records()]
+
+
+class SimulatedScale(Scale):
+
+    def __init__(self,
+                 n: int,
+                 fake_bar: int = 0,
+                 heavier: bool = False,
+                 bowl_capacity: Optional[int] = None) -> None:
+        """
+        Initializes a scale that weighs in memory, so strategies can be checked without a browser.
+
+        Args:
+        n (int): Number of gold bars.
+        fake_bar (int): Position of the fake bar.
+        heavier (bool): If True, the fake bar is heavier instead of lighter.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl. None means no limit.
+        """
+        if n < 1:
+            raise ValueError("At least 1 bar is needed")
+        self.n = n
+        self.heavier = heavier
+        self.bowl_capacity = bowl_capacity
+        self.history: List[Tuple[List[int], str, List[int]]] = []
+        self.new_game(fake_bar)
+
+    def new_game(self, fake_bar: int) -> None:
+        """
+        Starts a game with another fake bar.
+        """
+        if not 0 <= fake_bar < self.n:
+            raise ValueError(f"The fake bar should be between 0 and {self.n - 1}")
+        self.fake_bar = fake_bar
+        self.history = []
+
+    def weigh(self, bars_left: List[int], bars_right: List[int]) -> str:
+        all_bars = bars_left + bars_right
+        if len(set(all_bars)) != len(all_bars) or (
+                all_bars and (min(all_bars) < 0 or max(all_bars) >= self.n)):
+            raise ValueError(f"Both sides must have unique numbers from 0 to {self.n - 1}")
+        if self.bowl_capacity is not None and max(len(bars_left), len(bars_right)) > self.bowl_capacity:
+            raise ValueError(f"A bowl holds at most {self.bowl_capacity} bars")
+
+        # Genuine bars weigh 2, the fake one 1 or 3
+        fake_weight = 3 if self.heavier else 1
+        left_weight = 2 * len(bars_left) + (fake_weight - 2) * (self.fake_bar in bars_left)
+        right_weight = 2 * len(bars_right) + (fake_weight - 2) * (self.fake_bar in bars_right)
+        if left_weight < right_weight:
+            result = "<"
+        elif left_weight > right_weight:
+            result = ">"
+        else:
+            result = "="
+        # Kept as is and only formatted when read, simulations weigh millions of times
+        self.history.append((bars_left, result, bars_right))
+        return result
+
+    def reset(self) -> None:
+        pass
+
+    def guess(self, bar: int) -> bool:
+        return bar == self.fake_bar
+
+    def weighing_records(self) -> List[WeighingRecord]:
+        return [WeighingRecord(list(left), list(right), result) for left, result, right in self.history]
+
+
+def simulate(n: int,
+             bowl_capacity: Optional[int] = None,
+             strategy_cache=None,
+             rounds: int = 1) -> Dict[str, Any]:
+    """
+    Plays a game for every position of the fake bar on a SimulatedScale, through the same
+    GoldBarWeighing logic as the browser games. The solver time is measured without any
+    browser overhead.
+
+    Args:
+    n (int): Number of gold bars.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl. None means no limit.
+    strategy_cache (Optional[StrategyCache]): Where precompiled strategies are stored.
+    rounds (int): How many times every position is played.
+
+    Returns:
+    Dict[str, Any]: The games played, how many were solved, the most weighings a game needed,
+    the weighings answered without the scale, the seconds taken and the games per second.
+    """
+    # Imported here, goldbar imports this module for the Scale interface
+    from .goldbar import GoldBarWeighing
+
+    scale = SimulatedScale(n, bowl_capacity=bowl_capacity)
+    gb = GoldBarWeighing(bowl_capacity=bowl_capacity, strategy_cache=strategy_cache, scale=scale)
+    left, right, remaining = TernarySearchPlanner(bowl_capacity).split(list(range(n)))
+
+    games = solved = max_weighings = saved = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for fake_bar in range(n):
+            scale.new_game(fake_bar)
+            solved += scale.guess(gb.find_fake_bar(left, right, remaining))
+            max_weighings = max(max_weighings, len(scale.history))
+            saved += gb.knowledge.saved()
+            games += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "games": games,
+        "solved": solved,
+        "max_weighings": max_weighings,
+        "saved_weighings": saved,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+    }
@@ -0,0 +1,471 @@
+# strategy.py
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .planner import HEAVIER, LIGHTER, OddBarPlanner, PriorSearchPlanner, TernarySearchPlanner
+
+# Variants of the game a strategy can be compiled for
+VARIANT_LIGHTER = "lighter"
+VARIANT_EITHER = "either"
+
+FORMAT_VERSION = 1
+MAGIC = b"GBST"
+
+# magic, version, variant, references, n, bowl capacity (0 = no limit), max weighings, nodes, bars
+_HEADER = struct.Struct("<4sHBBiiiii")
+# bars offset, left length, right length, '<' child, '>' child, '=' child, leaf bar, leaf direction
+_NODE = struct.Struct("<8i")
+
+_VARIANT_CODES = {VARIANT_LIGHTER: 0, VARIANT_EITHER: 1}
+_DIRECTIONS = [LIGHTER, HEAVIER]
+_RESULTS = {"<": 3, ">": 4, "=": 5}
+
+# Most bars a prior-aware strategy is planned for. Planning takes cubic time in the number of
+# bars, more bars are split uniformly.
+PRIOR_MAX_BARS = 81
+
+
+class StrategyTable:
+
+    def __init__(self, buffer, source: Optional[mmap.mmap] = None) -> None:
+        """
+        Wraps a compiled decision tree. Node 0 is the first weighing. Bars are positions
+        0 to n-1 in the list of bars being searched, followed by the genuine reference bars.
+
+        Args:
+        buffer: The bytes, or memory map, holding the compiled strategy.
+        source (Optional[mmap.mmap]): The memory map to close with the table, if any.
+
+        Raises:
+        ValueError: If the buffer is not a strategy of the supported version.
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("The strategy file is too short")
+        (magic, version, variant_code, self.references, self.n, capacity,
+         self.max_weighings, self.node_count, self.bar_count) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported strategy file version {version}")
+        if len(buffer) != _HEADER.size + self.node_count * _NODE.size + self.bar_count * 4:
+            raise ValueError("The strategy file is truncated")
+
+        self.variant = list(_VARIANT_CODES)[variant_code]
+        self.bowl_capacity = capacity or None
+        self.buffer = buffer
+        self.source = source
+        self._bars_start = _HEADER.size + self.node_count * _NODE.size
+
+    def _node(self, node: int) -> Tuple[int, ...]:
+        return _NODE.unpack_from(self.buffer, _HEADER.size + node * _NODE.size)
+
+    def _bars(self, offset: int, length: int) -> List[int]:
+        return list(struct.unpack_from(f"<{length}i", self.buffer, self._bars_start + offset * 4))
+
+    def weighing(self, node: int) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Returns the weighing to perform at a node.
+
+        Args:
+        node (int): Index of the node.
+
+        Returns:
+        Optional[Tuple[List[int], List[int]]]: Positions for the left and right bowls,
+        or None if the node is an answer.
+        """
+        offset, left_length, right_length = self._node(node)[:3]
+        if left_length == 0:
+            return None
+        bars = self._bars(offset, left_length + right_length)
+        return bars[:left_length], bars[left_length:]
+
+    def child(self, node: int, result: str) -> int:
+        """
+        Returns the node reached after a weighing.
+
+        Args:
+        node (int): Index of the node that was weighed.
+        result (str): The result of the weighing, '<', '>', or '='.
+
+        Returns:
+        int: Index of the next node.
+
+        Raises:
+        ValueError: If the result is unexpected or impossible at this node.
+        """
+        if result not in _RESULTS:
+            raise ValueError("Unexpected Result")
+        child = self._node(node)[_RESULTS[result]]
+        if child < 0:
+            raise ValueError("The weighings do not match a single fake bar")
+        return child
+
+    def answer(self, node: int) -> Tuple[int, str]:
+        """
+        Returns the fake bar at an answer node.
+
+        Args:
+        node (int): Index of the node.
+
+        Returns:
+        Tuple[int, str]: The position of the fake bar and whether it is 'lighter' or 'heavier'.
+        """
+        fields = self._node(node)
+        if fields[1] != 0:
+            raise ValueError("The fake bar is not known yet")
+        return fields[6], _DIRECTIONS[fields[7]]
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.buffer)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the table to a file. The file is written next to its final path and then
+        renamed, so other processes never read a partly written strategy.
+
+        Args:
+        path (str): Path of the strategy file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(self.buffer)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "StrategyTable":
+        """
+        Memory-maps a strategy file, so lookups read only the pages they touch.
+
+        Args:
+        path (str): Path of the strategy file.
+
+        Returns:
+        StrategyTable: The table backed by the file.
+        """
+        with open(path, "rb") as strategy_file:
+            mapped = mmap.mmap(strategy_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, source=mapped)
+        except ValueError:
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+
+class _TreeBuilder:
+
+    def __init__(self) -> None:
+        self.nodes: List[List[int]] = []
+        self.bars: List[int] = []
+        self.max_weighings = 0
+
+    def answer(self, bar: int, direction: str) -> int:
+        self.nodes.append([0, 0, 0, -1, -1, -1, bar, _DIRECTIONS.index(direction)])
+        return len(self.nodes) - 1
+
+    def weighing(self, left: List[int], right: List[int], depth: int) -> int:
+        self.max_weighings = max(self.max_weighings, depth + 1)
+        self.nodes.append([len(self.bars), len(left), len(right), -1, -1, -1, -1, 0])
+        self.bars.extend(left + right)
+        return len(self.nodes) - 1
+
+    def link(self, node: int, result: str, child: int) -> None:
+        self.nodes[node][_RESULTS[result]] = child
+
+    def build(self, variant: str, n: int, bowl_capacity: Optional[int], references: int) -> StrategyTable:
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, _VARIANT_CODES[variant], references, n,
+                              bowl_capacity or 0, self.max_weighings, len(self.nodes), len(self.bars))
+        nodes = b"".join(_NODE.pack(*node) for node in self.nodes)
+        bars = struct.pack(f"<{len(self.bars)}i", *self.bars)
+        return StrategyTable(header + nodes + bars)
+
+
+def compile_strategy(n: int,
+                     variant: str = VARIANT_LIGHTER,
+                     bowl_capacity: Optional[int] = None,
+                     references: int = 0) -> StrategyTable:
+    """
+    Builds the full decision tree for searching n bars.
+
+    Args:
+    n (int): Number of bars that could be the fake bar.
+    variant (str): 'lighter' if the fake bar is known to be lighter, 'either' if it may be
+    heavier or lighter.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+    references (int): Number of known genuine bars, positions n onwards. Only used by 'either'.
+
+    Returns:
+    StrategyTable: The compiled table.
+    """
+    if variant not in _VARIANT_CODES:
+        raise ValueError(f"Unknown variant {variant}")
+    if n < 1:
+        raise ValueError("At least 1 bar is needed")
+
+    builder = _TreeBuilder()
+    if variant == VARIANT_LIGHTER:
+        references = 0
+        planner = TernarySearchPlanner(bowl_capacity)
+        root = list(range(n))
+    else:
+        # The planner only ever needs one reference bar
+        references = min(references, 1)
+        odd_planner = OddBarPlanner(bowl_capacity)
+        root = odd_planner.start(list(range(n)), list(range(n, n + references)))
+
+    # Expand the tree depth first without recursion, bowls with a small capacity make it deep
+    pending = [(root, 0, -1, "")]
+    while pending:
+        item, depth, parent, parent_result = pending.pop()
+        if variant == VARIANT_LIGHTER:
+            if not item:
+                continue
+            if len(item) == 1:
+                node = builder.answer(item[0], LIGHTER)
+            else:
+                left, right, remaining = planner.split(item)
+                node = builder.weighing(left, right, depth)
+                pending.extend([(left, depth + 1, node, "<"),
+                                (right, depth + 1, node, ">"),
+                                (remaining, depth + 1, node, "=")])
+        else:
+            if item.possibilities() == 0:
+                continue
+            weighing = odd_planner.plan(item)
+            if weighing is None:
+                node = builder.answer(*odd_planner.solution(item))
+            else:
+                left, right = weighing
+                node = builder.weighing(left, right, depth)
+                pending.extend((odd_planner.update(item, left, right, result), depth + 1, node, result)
+                               for result in ("<", ">", "="))
+        if parent >= 0:
+            builder.link(parent, parent_result, node)
+
+    return builder.build(variant, n, bowl_capacity, references)
+
+
+def compile_prior_strategy(probabilities: Sequence[float],
+                           bowl_capacity: Optional[int] = None,
+                           slack: int = 0) -> StrategyTable:
+    """
+    Builds the decision tree for a lighter fake bar that minimizes the expected number of
+    weighings over a distribution of its position. See PriorSearchPlanner. Above
+    PRIOR_MAX_BARS bars the uniform strategy is compiled instead.
+
+    Args:
+    probabilities (Sequence[float]): The weight of each position being the fake bar.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+    slack (int): Extra weighings the worst case may take over the uniform strategy.
+
+    Returns:
+    StrategyTable: The compiled table, followed like one from compile_strategy.
+    """
+    planner = PriorSearchPlanner(probabilities, bowl_capacity, slack)
+    if len(probabilities) > PRIOR_MAX_BARS:
+        return compile_strategy(len(probabilities), VARIANT_LIGHTER, bowl_capacity)
+    builder = _TreeBuilder()
+    pending = [((0, len(planner.order)), 0, -1, "")]
+    while pending:
+        (start, end), depth, parent, parent_result = pending.pop()
+        if start == end:
+            continue
+        if end - start == 1:
+            node = builder.answer(planner.order[start], LIGHTER)
+        else:
+            runs = planner.split(start, end, planner.max_weighings - depth)
+            left, right = ([planner.order[i] for i in range(*run)] for run in runs[:2])
+            node = builder.weighing(left, right, depth)
+            pending.extend((run, depth + 1, node, result) for run, result in zip(runs, ("<", ">", "=")))
+        if parent >= 0:
+            builder.link(parent, parent_result, node)
+    return builder.build(VARIANT_LIGHTER, len(probabilities), bowl_capacity, 0)
+
+
+def expected_weighings(table: StrategyTable, probabilities: Sequence[float]) -> float:
+    """
+    Expected number of weighings a lighter-bar strategy takes, over a distribution of the
+    position of the fake bar.
+
+    Args:
+    table (StrategyTable): The strategy.
+    probabilities (Sequence[float]): The weight of each position being the fake bar.
+
+    Returns:
+    float: The expected number of weighings.
+    """
+    total = float(sum(probabilities))
+    expected = 0.0
+    pending = [(0, 0)]
+    while pending:
+        node, depth = pending.pop()
+        if table.weighing(node) is None:
+            position, _ = table.answer(node)
+            expected += depth * probabilities[position] / total
+            continue
+        for result in ("<", ">", "="):
+            try:
+                pending.append((table.child(node, result), depth + 1))
+            except ValueError:
+                continue
+    return expected
+
+
+def compare_prior(probabilities: Sequence[float],
+                  bowl_capacity: Optional[int] = None,
+                  slack: int = 0) -> Dict[str, Any]:
+    """
+    Compares the prior-aware strategy with the uniform one on the same distribution.
+    Every weighing saved is a fill, click and wait in the browser.
+
+    Args:
+    probabilities (Sequence[float]): The weight of each position being the fake bar.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+    slack (int): Extra weighings the worst case may take over the uniform strategy.
+
+    Returns:
+    Dict[str, Any]: The expected and worst-case weighings of both strategies, and the
+    expected weighings saved per game.
+    """
+    prior = compile_prior_strategy(probabilities, bowl_capacity, slack)
+    uniform = compile_strategy(len(probabilities), VARIANT_LIGHTER, bowl_capacity)
+    prior_expected = expected_weighings(prior, probabilities)
+    uniform_expected = expected_weighings(uniform, probabilities)
+    return {
+        "n": len(probabilities),
+        "expected_weighings": prior_expected,
+        "max_weighings": prior.max_weighings,
+        "uniform_expected_weighings": uniform_expected,
+        "uniform_max_weighings": uniform.max_weighings,
+        "saved_per_game": uniform_expected - prior_expected,
+    }
+
+
+class StrategyCache:
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initializes a cache of compiled strategies stored in a directory.
+
+        Args:
+        directory (str): Where the strategy files are kept.
+        """
+        self.directory = directory
+        # Keyed by (n, variant, bowl capacity, references), prior-aware strategies by their path
+        self.tables: Dict[Any, StrategyTable] = {}
+
+    def path(self, n: int, variant: str, bowl_capacity: Optional[int], references: int = 0) -> str:
+        """
+        Returns the file path of a strategy. The format version is part of the name, so
+        files from another version are never read.
+        """
+        name = f"{variant}-n{n}-c{bowl_capacity or 0}-r{references}-v{FORMAT_VERSION}.gbst"
+        return os.path.join(self.directory, name)
+
+    def get(self,
+            n: int,
+            variant: str = VARIANT_LIGHTER,
+            bowl_capacity: Optional[int] = None,
+            references: int = 0) -> StrategyTable:
+        """
+        Returns a strategy, loading it from disk or compiling and storing it the first time.
+
+        Args:
+        n (int): Number of bars that could be the fake bar.
+        variant (str): 'lighter' or 'either'.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+        references (int): Number of known genuine bars.
+
+        Returns:
+        StrategyTable: The compiled table.
+        """
+        references = min(references, 1) if variant == VARIANT_EITHER else 0
+        key = (n, variant, bowl_capacity, references)
+        if key in self.tables:
+            return self.tables[key]
+
+        path = self.path(n, variant, bowl_capacity, references)
+        table = None
+        if os.path.exists(path):
+            try:
+                table = StrategyTable.load(path)
+            except ValueError:
+                table = None
+        if table is None:
+            table = compile_strategy(n, variant, bowl_capacity, references)
+            table.save(path)
+        self.tables[key] = table
+        return table
+
+    def get_prior(self,
+                  probabilities: Sequence[float],
+                  bowl_capacity: Optional[int] = None,
+                  slack: int = 0) -> StrategyTable:
+        """
+        Returns a prior-aware strategy, loading it from disk or compiling and storing it the
+        first time. The file name holds a digest of the normalized probabilities.
+
+        Args:
+        probabilities (Sequence[float]): The weight of each position being the fake bar.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+        slack (int): Extra weighings the worst case may take over the uniform strategy.
+
+        Returns:
+        StrategyTable: The compiled table.
+        """
+        total = float(sum(probabilities))
+        normalized = [round(p / total, 12) if total > 0 else p for p in probabilities]
+        digest = hashlib.sha1(json.dumps(normalized).encode()).hexdigest()[:16]
+        name = f"prior-n{len(probabilities)}-c{bowl_capacity or 0}-s{slack}-{digest}-v{FORMAT_VERSION}.gbst"
+        path = os.path.join(self.directory, name)
+        if path in self.tables:
+            return self.tables[path]
+
+        table = None
+        if os.path.exists(path):
+            try:
+                table = StrategyTable.load(path)
+            except ValueError:
+                table = None
+        if table is None:
+            table = compile_prior_strategy(probabilities, bowl_capacity, slack)
+            table.save(path)
+        self.tables[path] = table
+        return table
+
+    def close(self) -> None:
+        for table in self.tables.values():
+            table.close()
+        self.tables.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute weighing strategies.")
+    parser.add_argument("n", type=int, nargs="+", help="Numbers of bars to compile strategies for")
+    parser.add_argument("--variant", choices=list(_VARIANT_CODES), default=VARIANT_LIGHTER)
+    parser.add_argument("--bowl-capacity", type=int, default=None)
+    parser.add_argument("--references", type=int, default=0)
+    parser.add_argument("--cache-dir", default=".strategy_cache")
+    args = parser.parse_args()
+
+    cache = StrategyCache(args.cache_dir)
+    for bars in args.n:
+        table = cache.get(bars, args.variant, args.bowl_capacity, args.references)
+        print(f"{cache.path(bars, args.variant, args.bowl_capacity, args.references)}: "
+              f"{table.node_count} nodes, at most {table.max_weighings} weighings")
+    cache.close()
@@ -0,0 +1,245 @@
+# tabs.py
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .goldbar import GoldBarWeighing, Steps
+from .governor import ResourceGovernor
+from .logger import game_logger, setup_logger
+from .metrics import percentile
+from .strategy import StrategyCache
+
+
+class TabGame:
+    """
+    One game played in a tab of the shared browser: its window handle, its GoldBarWeighing,
+    the solver steps and the weighing they wait for.
+    """
+
+    def __init__(self, game_id: int, gb: GoldBarWeighing, steps: Steps) -> None:
+        self.game_id = game_id
+        self.gb = gb
+        self.handle: Optional[str] = None
+        self.steps = steps
+        self.weighing: Optional[tuple] = None
+        self.deadline: Optional[float] = None
+        self.start = time.perf_counter()
+        self.result: Dict[str, Any] = {"game": game_id, "fake_bar": None, "found": False, "error": None}
+
+
+class TabScheduler:
+
+    def __init__(self,
+                 driver,
+                 url: str,
+                 tabs: int = 4,
+                 bowl_capacity: Optional[int] = None,
+                 strategy_cache: Optional[StrategyCache] = None,
+                 poll_interval: float = 0.005,
+                 weigh_timeout: float = 30.0,
+                 governor: Optional[ResourceGovernor] = None,
+                 factory: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Plays many games in tabs of one browser. Every weighing is started without waiting for
+        its result, and while it is pending the other tabs are filled and weighed, so the waits
+        overlap instead of needing a browser per game.
+
+        Args:
+        driver (WebDriver): The browser. Every game opens a new tab in it and closes it when done.
+        url (str): The game page.
+        tabs (int): How many games are open at the same time.
+        bowl_capacity (Optional[int]): How many bars fit in one bowl grid. None means no limit.
+        strategy_cache (Optional[StrategyCache]): Where precompiled strategies are stored.
+        poll_interval (float): Seconds to sleep when every open game waits for its weighing.
+        weigh_timeout (float): Seconds a weighing may stay pending.
+        governor (Optional[ResourceGovernor]): Samples the memory and CPU of the browser as games
+        finish. A browser over a limit gets no new tabs, and once its games are done it is quit
+        and replaced, if there is a factory.
+        factory (Optional[Callable[[], WebDriver]]): Launches the driver that replaces one over a limit.
+        """
+        if tabs < 1:
+            raise ValueError("The number of tabs should be at least 1")
+        self.driver = driver
+        self.url = url
+        self.tabs = tabs
+        self.bowl_capacity = bowl_capacity
+        self.strategy_cache = strategy_cache
+        self.poll_interval = poll_interval
+        self.weigh_timeout = weigh_timeout
+        self.governor = governor
+        self.factory = factory
+        # The browser went over a limit and is restarted once its open games are done
+        self.over_limit = False
+        self.restarts = 0
+        # The window the driver started in. It stays open, so there is always a live window
+        # to go back to when a game's tab is closed.
+        self.home = driver.current_window_handle
+        self.current: Optional[str] = self.home
+        self.switches = 0
+
+    def switch(self, game: TabGame) -> None:
+        """
+        Makes the game's tab the one WebDriver commands go to, only when it is not already.
+        """
+        if self.current != game.handle:
+            self.driver.switch_to.window(game.handle)
+            self.current = game.handle
+            self.switches += 1
+
+    def open(self, game_id: int, scenario: Dict[str, List[int]]) -> TabGame:
+        """
+        Opens a new tab on the game page and starts the solver of a scenario in it.
+
+        Args:
+        game_id (int): Identifies the game in the logs and results.
+        scenario (Dict[str, List[int]]): The 'left_bar', 'right_bar' and 'remaining' bars of
+        the first weighing, as in config.json.
+
+        Returns:
+        TabGame: The game, waiting to start its first weighing.
+        """
+        # Each tab gets its own GoldBarWeighing, so grid cells and element handles are not shared
+        gb = GoldBarWeighing(self.driver, self.bowl_capacity, self.strategy_cache,
+                             quit_on_exit=False, logger=game_logger(game_id))
+        game = TabGame(game_id, gb,
+                       gb.fake_bar_steps(scenario['left_bar'], scenario['right_bar'], scenario['remaining']))
+        try:
+            self.driver.switch_to.new_window('tab')
+            game.handle = self.current = self.driver.current_window_handle
+            gb.open_game(self.url)
+            self.advance(game, None)
+        except Exception as e:
+            self.fail(game, e)
+        return game
+
+    def advance(self, game: TabGame, result: Optional[str]) -> None:
+        """
+        Sends a weighing result to the solver, and starts its next weighing or, once it has
+        the fake bar, makes the guess.
+        """
+        try:
+            game.weighing = next(game.steps) if result is None else game.steps.send(result)
+        except StopIteration as stop:
+            game.weighing = None
+            game.result["fake_bar"] = stop.value
+            game.result["found"] = bool(game.gb.validate_answer(stop.value))
+            self.finish(game)
+            return
+        game.gb.start_weigh(*game.weighing)
+        game.deadline = time.perf_counter() + self.weigh_timeout
+
+    def step(self, game: TabGame) -> bool:
+        """
+        Checks the pending weighing of a game, and moves the game on when the result is there.
+
+        Returns:
+        bool: Whether the game moved on.
+        """
+        self.switch(game)
+        try:
+            result = game.gb.poll_weigh()
+            if result is None:
+                if time.perf_counter() > game.deadline:
+                    raise TimeoutError(f"The weighing {game.weighing} did not finish "
+                                       f"within {self.weigh_timeout:.2f}s")
+                return False
+            self.advance(game, result)
+        except Exception as e:
+            self.fail(game, e)
+        return True
+
+    def fail(self, game: TabGame, error: Exception) -> None:
+        game.gb.logger.error(f"Some error occurred while playing the game: {error}")
+        game.result["error"] = str(error)
+        game.weighing = None
+        self.finish(game)
+
+    def finish(self, game: TabGame) -> None:
+        """
+        Closes the tab of a finished game, and goes back to the first window, so the driver
+        never stays on a closed one.
+        """
+        game.result["latency"] = time.perf_counter() - game.start
+        game.steps.close()
+        try:
+            if game.handle is not None:
+                self.switch(game)
+                self.driver.close()
+        except Exception as e:
+            game.gb.logger.warning(f"The tab could not be closed: {e}")
+        self.current = None
+        try:
+            self.driver.switch_to.window(self.home)
+            self.current = self.home
+        except Exception as e:
+            game.gb.logger.error(f"Some error occurred while going back to the first window: {e}")
+        if self.governor is not None and self.governor.after_game(self.driver):
+            self.over_limit = self.factory is not None
+
+    def restart(self) -> None:
+        """
+        Quits the browser and opens the next games in a fresh one from the factory.
+        """
+        self.governor.forget(self.driver)
+        try:
+            self.driver.quit()
+        except Exception as e:
+            setup_logger().error(f"Some error occurred while quitting the browser: {e}")
+        self.driver = self.factory()
+        self.home = self.current = self.driver.current_window_handle
+        self.over_limit = False
+        self.restarts += 1
+
+    def run(self, scenarios: List[Dict[str, List[int]]]) -> Dict[str, Any]:
+        """
+        Plays every scenario, at most `tabs` games at a time, moving each game on as soon as
+        its weighing has a result.
+
+        Args:
+        scenarios (List[Dict[str, List[int]]]): One scenario per game.
+
+        Returns:
+        Dict[str, Any]: The results of every game and a summary with the throughput in games
+        per second, the p50, p95 and p99 game latency in seconds, the tab switches and the
+        browser restarts.
+        """
+        start = time.perf_counter()
+        waiting = list(enumerate(scenarios))
+        waiting.reverse()
+        active: List[TabGame] = []
+        results = []
+        while waiting or active:
+            if self.over_limit and not active:
+                self.restart()
+            # Fill the free tabs with new games, unless the browser waits to be restarted
+            while waiting and len(active) < self.tabs and not self.over_limit:
+                active.append(self.open(*waiting.pop()))
+
+            moved = False
+            for game in active:
+                if game.weighing is not None:
+                    moved |= self.step(game)
+            for game in [game for game in active if game.weighing is None]:
+                active.remove(game)
+                results.append(game.result)
+                moved = True
+            if not moved:
+                time.sleep(self.poll_interval)
+        elapsed = time.perf_counter() - start
+
+        results.sort(key=lambda result: result["game"])
+        latencies = [result["latency"] for result in results]
+        summary = {
+            "games": len(results),
+            "found": sum(result["found"] for result in results),
+            "errors": sum(result["error"] is not None for result in results),
+            "tabs": self.tabs,
+            "seconds": elapsed,
+            "games_per_second": len(results) / elapsed if elapsed else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "tab_switches": self.switches,
+            "restarts": self.restarts,
+        }
+        return {"summary": summary, "results": results}
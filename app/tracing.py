@@ -0,0 +1,163 @@
+# tracing.py
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Methods that get a span when a game is instrumented
+GOLDBAR_METHODS = ["reset", "enter_bars_on_bowl", "weigh", "weigh_fused", "start_weigh", "weigh_known",
+                   "find_suspected_bars", "follow_strategy", "find_fake_bar", "find_odd_bar", "guess",
+                   "weighings", "weighing_records", "validate_answer", "print_weighings_list"]
+WEBUTILS_METHODS = ["find_element_by_id", "with_element", "navigate", "click_button_by_id",
+                    "click_button_by_css", "set_text", "set_texts", "get_text", "wait_for_condition",
+                    "wait_for_element", "wait_for_alert", "set_script_timeout", "fused_weigh",
+                    "get_alert_text", "accept_alert", "get_elements_by_css", "get_texts_by_css",
+                    "click_and_capture_alert", "start_weigh", "poll_weigh", "get_weighing_records"]
+
+
+def _short(value: Any, limit: int = 80) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _describe_call(args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+    return {"args": _short(args + tuple(kwargs.values()))} if args or kwargs else {}
+
+
+def _describe_locator(args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+    # The first argument of the utility methods is the element ID, selector or url
+    if args and isinstance(args[0], str):
+        return {"locator": args[0]}
+    return _describe_call(args, kwargs)
+
+
+def _describe_command(args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+    params = (args[1] if len(args) > 1 else kwargs.get("params")) or {}
+    described = {}
+    if "value" in params and "using" in params:
+        described["locator"] = f"{params['using']}={params['value']}"
+    if "id" in params:
+        described["element"] = params["id"]
+    if "script" in params:
+        described["script"] = _short(" ".join(params["script"].split()), 60)
+    return described
+
+
+class Tracer:
+
+    def __init__(self) -> None:
+        """
+        Records spans as Chrome trace events, which open in chrome://tracing or Perfetto.
+        Nothing is traced until a game is instrumented, so a game without a tracer runs
+        the plain methods.
+        """
+        self.events: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.patched: List[Tuple[Any, str, Any]] = []
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self.origin) * 1e6
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Records the with block as a span. The outcome is 'ok', or the error the block raised.
+
+        Args:
+        name (str): Name of the span.
+        category (str): Category of the span, used to filter in the trace viewer.
+        args: Details shown with the span. More can be added to the yielded dict.
+        """
+        start = self._now()
+        outcome = "ok"
+        try:
+            yield args
+        except BaseException as e:
+            outcome = f"error: {type(e).__name__}"
+            raise
+        finally:
+            args["outcome"] = outcome
+            event = {"name": name, "cat": category, "ph": "X", "ts": start, "dur": self._now() - start,
+                     "pid": self.pid, "tid": threading.get_ident(), "args": args}
+            with self.lock:
+                self.events.append(event)
+
+    def wrap(self,
+             target: Any,
+             name: str,
+             category: str,
+             describe: Callable[[Tuple, Dict], Dict[str, Any]] = _describe_call,
+             record_result: bool = False,
+             label: Optional[Callable[[Tuple, Dict], str]] = None) -> None:
+        """
+        Replaces a method of one object with a traced one. Calls the object makes to its own
+        methods go through the traced ones too, so they show up as nested spans.
+
+        Args:
+        target: The object whose method is traced.
+        name (str): Name of the method.
+        category (str): Category of its spans.
+        describe (Callable[[Tuple, Dict], Dict[str, Any]]): Turns the call arguments into span details.
+        record_result (bool): If True, the returned value is added to the span.
+        label (Optional[Callable[[Tuple, Dict], str]]): Names each span from the call arguments.
+        Defaults to the class and method name.
+        """
+        original = getattr(target, name)
+        span_name = f"{type(target).__name__}.{name}"
+
+        @functools.wraps(original)
+        def traced(*args, **kwargs):
+            name_of_span = label(args, kwargs) if label is not None else span_name
+            with self.span(name_of_span, category, **describe(args, kwargs)) as details:
+                result = original(*args, **kwargs)
+                if record_result:
+                    details["result"] = _short(result)
+                return result
+
+        setattr(target, name, traced)
+        self.patched.append((target, name, original))
+
+    def instrument(self, gb) -> None:
+        """
+        Traces the methods of a game, its WebDriverUtility and every WebDriver command it sends.
+        Element commands reach the browser through the driver's execute, so they are traced too.
+
+        Args:
+        gb (GoldBarWeighing): The game to trace.
+        """
+        for name in GOLDBAR_METHODS:
+            self.wrap(gb, name, "goldbar", record_result=True)
+        if gb.webutils is not None:
+            for name in WEBUTILS_METHODS:
+                self.wrap(gb.webutils, name, "webutils", _describe_locator)
+        if gb.driver is not None:
+            self.wrap(gb.driver, "execute", "webdriver", _describe_command,
+                      label=lambda args, kwargs: args[0] if args else kwargs.get("driver_command", "execute"))
+
+    def restore(self) -> None:
+        """
+        Puts the untraced methods back.
+        """
+        for target, name, original in reversed(self.patched):
+            setattr(target, name, original)
+        self.patched.clear()
+
+    def trace(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> None:
+        """
+        Writes the Chrome trace-event JSON.
+
+        Args:
+        path (str): Path of the trace file.
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.trace(), trace_file)
@@ -0,0 +1,216 @@
+# verify.py
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .goldbar import GoldBarWeighing
+from .strategy import VARIANT_LIGHTER, StrategyCache, StrategyTable
+
+# A first weighing is only described by its bowl size k: valid_bar_values accepts k bars in each
+# bowl and n - 2k remaining, and find_fake_bar then follows the compiled strategy of the group
+# the fake bar is in, by the positions of its bars. Every partition with the same k gives the
+# same weighings, with the bars renamed. The strategies are the tables the solver itself reads,
+# and the scale is played here with NumPy arrays, every position of the fake bar at once.
+
+# Results of a weighing, by the bowl the lighter fake bar is in: left, right or neither
+_RESULTS = ("<", ">", "=")
+
+
+def table_arrays(table: StrategyTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reads a compiled strategy node by node into arrays.
+
+    Args:
+    table (StrategyTable): A strategy for a lighter fake bar.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The keys node * n + position of every
+    bar on the scale, sorted, the bowl of each key, 0 for left and 1 for right, the child of every
+    node for '<', '>' and '=', -1 where the table has none, and the answer of every node, -1
+    for nodes that are weighings.
+    """
+    keys, bowls = [], []
+    children = np.full((table.node_count, len(_RESULTS)), -1, dtype=np.int64)
+    answers = np.full(table.node_count, -1, dtype=np.int64)
+    for node in range(table.node_count):
+        weighing = table.weighing(node)
+        if weighing is None:
+            answers[node] = table.answer(node)[0]
+            continue
+        for bowl, bars in enumerate(weighing):
+            keys.extend(node * table.n + bar for bar in bars)
+            bowls.extend([bowl] * len(bars))
+        for result, symbol in enumerate(_RESULTS):
+            try:
+                children[node, result] = table.child(node, symbol)
+            except ValueError:
+                pass
+    keys = np.array(keys, dtype=np.int64)
+    order = np.argsort(keys)
+    return keys[order], np.array(bowls, dtype=np.int64)[order], children, answers
+
+
+def play_table(table: StrategyTable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Follows a compiled strategy for every position of the fake bar at once. The scale answers
+    '<' when the fake bar is in the left bowl, '>' when it is in the right one, and '=' otherwise.
+
+    Args:
+    table (StrategyTable): A strategy for a lighter fake bar.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: For each position of the fake bar, the weighings made and
+    the position the strategy answered, -1 when it reached a result the table has no node for.
+    """
+    keys, bowls, children, answers = table_arrays(table)
+    position = np.arange(table.n, dtype=np.int64)
+    node = np.zeros(table.n, dtype=np.int64)
+    weighings = np.zeros(table.n, dtype=np.int64)
+
+    # Every weighing moves a game one node down the tree, so no game takes more steps than nodes
+    for _ in range(table.node_count):
+        games = np.flatnonzero((node >= 0) & (answers[np.maximum(node, 0)] < 0))
+        if len(games) == 0:
+            break
+        wanted = node[games] * table.n + position[games]
+        at = np.minimum(np.searchsorted(keys, wanted), max(len(keys) - 1, 0))
+        on_scale = keys[at] == wanted if len(keys) else np.zeros(len(games), dtype=bool)
+        result = np.where(on_scale, bowls[at], 2)
+        node[games] = children[node[games], result]
+        weighings[games] += 1
+
+    found = np.where(node >= 0, answers[np.maximum(node, 0)], -1)
+    return weighings, found
+
+
+def simulate_partition(n: int,
+                       k: int,
+                       bowl_capacity: Optional[int] = None,
+                       gb: Optional[GoldBarWeighing] = None) -> Dict[str, Any]:
+    """
+    Plays every position of the fake bar for the first weighing of k bars against k bars.
+
+    Args:
+    n (int): Number of gold bars.
+    k (int): Bars in each bowl for the first weighing.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl. None means no limit.
+    gb (Optional[GoldBarWeighing]): The solver whose strategies are played. Defaults to one
+    that compiles them in memory.
+
+    Returns:
+    Dict[str, Any]: Whether every fake bar was found, the number of failures and the
+    worst case and total number of weighings.
+    """
+    gb = gb or GoldBarWeighing(bowl_capacity=bowl_capacity)
+    failures, worst, total = 0, 0, n
+    # The fake bar is in the left or the right bowl, k positions each, or in the rest
+    for group, copies in ((k, 2), (n - 2 * k, 1)):
+        if group == 0:
+            continue
+        weighings, found = play_table(gb.strategy(group, VARIANT_LIGHTER))
+        failures += copies * int(np.count_nonzero(found != np.arange(group)))
+        worst = max(worst, int(weighings.max()))
+        total += copies * int(weighings.sum())
+    return {
+        "correct": failures == 0,
+        "failures": failures,
+        "worst_weighings": worst + 1,
+        "total_weighings": total,
+    }
+
+
+def verify(n: int,
+           bowl_capacity: Optional[int] = None,
+           max_positions: int = 10_000_000,
+           strategy_cache: Optional[StrategyCache] = None) -> Dict[str, Any]:
+    """
+    Checks find_fake_bar against every valid first weighing and every position of the fake bar.
+    Each group a first weighing can leave is played position by position through its compiled
+    strategy, once however many partitions share it, while the positions stay within
+    max_positions. The groups of the planner's own first weighing always are. The worst case
+    of every table played is also checked against its header.
+
+    Args:
+    n (int): Number of gold bars, at least 2.
+    bowl_capacity (Optional[int]): How many bars fit in one bowl. None means no limit.
+    max_positions (int): Most games to play position by position.
+    strategy_cache (Optional[StrategyCache]): Where the compiled strategies are read from.
+    Without a cache, they are compiled in memory.
+
+    Returns:
+    Dict[str, Any]: Whether every game found the fake bar, the worst case and mean weighings
+    over every partition whose groups were played, the best first weighing and the runtime
+    in seconds.
+    """
+    if n < 2:
+        raise ValueError("At least 2 bars are needed for a weighing")
+    start = time.perf_counter()
+    gb = GoldBarWeighing(bowl_capacity=bowl_capacity, strategy_cache=strategy_cache)
+    partitions = min(n // 2, bowl_capacity) if bowl_capacity is not None else n // 2
+    k = np.arange(1, partitions + 1, dtype=np.int64)
+
+    # The groups after the first weighing, the planner's first and then the smallest
+    default_k = gb.planner.group_size(n)
+    own = np.unique([default_k, n - 2 * default_k])
+    others = np.setdiff1d(np.concatenate([k, n - 2 * k]), own)
+    others = others[np.cumsum(others) <= max_positions - own.sum()]
+    groups = np.concatenate([own, others])
+    groups = groups[groups > 0]
+
+    worst = {0: 0}
+    total = {0: 0}
+    failures = 0
+    consistent = True
+    for group in groups.tolist():
+        table = gb.strategy(group, VARIANT_LIGHTER)
+        weighings, found = play_table(table)
+        failures += int(np.count_nonzero(found != np.arange(group)))
+        worst[group] = int(weighings.max())
+        total[group] = int(weighings.sum())
+        consistent = consistent and worst[group] == table.max_weighings
+
+    # Weighings of every partition k whose groups were both played
+    checked = np.array([size for size in k.tolist() if size in worst and n - 2 * size in worst],
+                       dtype=np.int64)
+    partition_worst = np.array([1 + max(worst[size], worst[n - 2 * size]) for size in checked.tolist()])
+    partition_total = np.array([n + 2 * total[size] + total[n - 2 * size] for size in checked.tolist()])
+    planner = int(np.searchsorted(checked, default_k))
+    best = int(np.lexsort((partition_total, partition_worst))[0])
+    return {
+        "n": n,
+        "bowl_capacity": bowl_capacity,
+        "correct": bool(failures == 0 and consistent),
+        "failures": failures,
+        "partitions": partitions,
+        "partitions_checked": len(checked),
+        "groups": int(np.count_nonzero(np.unique(np.concatenate([k, n - 2 * k])))),
+        "groups_played": len(groups),
+        "positions_played": int(groups.sum()),
+        "worst_weighings": int(partition_worst.max()),
+        "mean_weighings": float(partition_total.sum() / (len(checked) * n)),
+        "planner_partition": default_k,
+        "planner_worst_weighings": int(partition_worst[planner]),
+        "planner_mean_weighings": float(partition_total[planner] / n),
+        "best_partition": int(checked[best]),
+        "best_worst_weighings": int(partition_worst[best]),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check find_fake_bar against every fake bar.")
+    parser.add_argument("n", type=int, nargs="+", help="Numbers of bars to verify")
+    parser.add_argument("--bowl-capacity", type=int, default=None)
+    parser.add_argument("--max-positions", type=int, default=10_000_000,
+                        help="Most games to play position by position")
+    parser.add_argument("--strategy-dir", default=None,
+                        help="Check the compiled strategy files of this directory")
+    args = parser.parse_args()
+
+    cache = StrategyCache(args.strategy_dir) if args.strategy_dir else None
+    for bars in args.n:
+        print(json.dumps(verify(bars, args.bowl_capacity, args.max_positions, cache), indent=4))
@@ -6,14 +6,24 @@ from selenium.webdriver.chrome.options import Options
 
 class WebDriver:
 
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, debugger_address=None):
         """
         Initializes a WebDriver instance with optional headless mode.
 
         Args:
             headless (bool): If True, the browser will be run in headless mode.
             Defaults to True.
+            debugger_address (str): Attach to a running browser, like the one of the
+            browser daemon, instead of starting one. The game gets a new tab.
         """
+        self.attached = debugger_address is not None
+        if self.attached:
+            options = Options()
+            options.debugger_address = debugger_address
+            self.driver = webdriver.Chrome(options=options)
+            self.driver.switch_to.new_window('tab')
+            return
+
         options = Options
         if headless:
             options = Options()
@@ -24,4 +34,3 @@ class WebDriver:
         else:
             self.driver = webdriver.Chrome()
     
-    
\ No newline at end of file
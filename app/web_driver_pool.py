@@ -0,0 +1,204 @@
+# web_driver_pool.py
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from .governor import ResourceGovernor
+from .logger import setup_logger
+from .web_driver_config import WebDriver
+
+
+class WebDriverPool:
+
+    def __init__(self,
+                 url: str,
+                 size: int = 2,
+                 headless: bool = True,
+                 max_uses: int = 50,
+                 factory: Optional[Callable[[], RemoteWebDriver]] = None,
+                 governor: Optional[ResourceGovernor] = None) -> None:
+        """
+        Initializes a pool of browsers that are launched ahead of time and kept on the game page,
+        so back-to-back games skip the browser startup.
+
+        Args:
+        url (str): The game page every driver is kept on.
+        size (int): Number of drivers in the pool.
+        headless (bool): If True, the browsers will be run in headless mode.
+        max_uses (int): A driver is replaced by a fresh one after this many games.
+        factory (Optional[Callable[[], RemoteWebDriver]]): Launches a driver.
+        Defaults to a Chrome driver from WebDriver.
+        governor (Optional[ResourceGovernor]): Samples the memory and CPU of each browser between
+        games, a driver over a limit is replaced by a fresh one.
+        """
+        if size < 1:
+            raise ValueError("The pool size should be at least 1")
+        self.url = url
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory or (lambda: WebDriver(headless=headless).driver)
+        self.governor = governor
+        self.logger = setup_logger()
+        self.idle: "queue.Queue[RemoteWebDriver]" = queue.Queue()
+        self.uses: Dict[int, int] = {}
+        self.lock = threading.Lock()
+        self.launched = 0
+        self.recycled = 0
+        self.closed = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Launches every driver of the pool and opens the game page in it.
+        """
+        while self._reserve():
+            self.idle.put(self._launch())
+
+    def _reserve(self) -> bool:
+        # Claims a slot for a new driver, so concurrent checkouts never exceed the pool size
+        with self.lock:
+            if self.launched >= self.size:
+                return False
+            self.launched += 1
+            return True
+
+    def _launch(self) -> RemoteWebDriver:
+        try:
+            driver = self.factory()
+            driver.get(self.url)
+        except Exception:
+            with self.lock:
+                self.launched -= 1
+            raise
+        self.uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver: RemoteWebDriver, keep_slot: bool = False) -> None:
+        # With keep_slot, the driver's slot passes to the one launched in its place
+        if not keep_slot:
+            with self.lock:
+                self.launched -= 1
+        self.uses.pop(id(driver), None)
+        if self.governor is not None:
+            self.governor.forget(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.error(f"Some error occurred while quitting a driver: {e}")
+
+    def _recycle(self, driver: RemoteWebDriver, keep_slot: bool = False) -> None:
+        with self.lock:
+            self.recycled += 1
+        self._discard(driver, keep_slot)
+
+    @staticmethod
+    def healthy(driver: RemoteWebDriver) -> bool:
+        """
+        Checks that a driver still answers, with a cheap script ping.
+
+        Args:
+        driver (RemoteWebDriver): The driver to check.
+
+        Returns:
+        bool: True if the browser answered the ping.
+        """
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> RemoteWebDriver:
+        """
+        Checks a driver out of the pool. A driver that fails the health check is replaced.
+
+        Args:
+        timeout (Optional[float]): How long to wait for a free driver, in seconds. None waits forever.
+
+        Returns:
+        RemoteWebDriver: A driver on a fresh game page.
+
+        Raises:
+        queue.Empty: If no driver is free within the timeout.
+        """
+        if self.closed:
+            raise RuntimeError("The pool is closed")
+        try:
+            driver = self.idle.get_nowait()
+        except queue.Empty:
+            driver = self._launch() if self._reserve() else self.idle.get(timeout=timeout)
+
+        if not self.healthy(driver):
+            self.logger.warning("A pooled driver failed its health check, launching a new one")
+            # The new driver takes the slot of the broken one, a concurrent checkout cannot claim it
+            self._recycle(driver, keep_slot=True)
+            driver = self._launch()
+        return driver
+
+    def release(self, driver: RemoteWebDriver, failed: bool = False) -> None:
+        """
+        Returns a driver to the pool. The game page is reloaded so the next checkout starts a
+        clean game. Drivers that failed, reached max_uses or went over a limit of the governor
+        are replaced by fresh ones.
+
+        Args:
+        driver (RemoteWebDriver): The driver to return.
+        failed (bool): True if the game on this driver raised an error.
+        """
+        self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+        if self.closed:
+            self._discard(driver)
+            return
+
+        over_limit = not failed and self.governor is not None and self.governor.after_game(driver)
+        if not failed and not over_limit and self.uses[id(driver)] < self.max_uses:
+            try:
+                driver.get(self.url)
+                self.idle.put(driver)
+                return
+            except Exception as e:
+                self.logger.error(f"Some error occurred while resetting a driver: {e}")
+
+        self._recycle(driver)
+        try:
+            if self._reserve():
+                self.idle.put(self._launch())
+        except Exception as e:
+            self.logger.error(f"Some error occurred while launching a driver: {e}")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[RemoteWebDriver]:
+        """
+        Checks a driver out for the duration of a with block, and recycles it if the block fails.
+
+        Args:
+        timeout (Optional[float]): How long to wait for a free driver, in seconds.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, failed=True)
+            raise
+        self.release(driver)
+
+    def close(self) -> None:
+        """
+        Quits every idle driver. Drivers still checked out are quit when they are released.
+        """
+        self.closed = True
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
@@ -2,10 +2,208 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support import expected_conditions
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, UnexpectedAlertPresentException)
+from selenium.webdriver.common.alert import Alert
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+from .metrics import AdaptiveTimeout
+
+# Defines fillInputs, which sets many input fields at once, for the scripts below. The native value
+# setter and the input/change events are needed so the page's framework sees the new values.
+# It returns the IDs that did not take the value.
+FILL_INPUTS_FUNCTION = """
+const fillInputs = (values) => {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    const failed = [];
+    for (const [id, value] of Object.entries(values)) {
+        const input = document.getElementById(id);
+        if (!input || input.disabled || input.readOnly) {
+            failed.push(id);
+            continue;
+        }
+        setter.call(input, value);
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+        input.dispatchEvent(new Event('change', {bubbles: true}));
+        if (input.value !== value) {
+            failed.push(id);
+        }
+    }
+    return failed;
+};
+"""
+
+# Sets many input fields at once. Returns the IDs that did not take the value.
+FILL_INPUTS_SCRIPT = FILL_INPUTS_FUNCTION + """
+return fillInputs(arguments[0]);
+"""
+
+# Fills the changed cells of both bowls, clicks weigh and waits for the result inside the page.
+# A weighing is done when the history gets a new entry, so the result of the previous weighing
+# is never read again. The first element with ID 'reset' shows the result.
+FUSED_WEIGH_SCRIPT = FILL_INPUTS_FUNCTION + """
+const values = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const results = ['<', '>', '='];
+const timings = {};
+let start = performance.now();
+const lap = (step) => {
+    const now = performance.now();
+    timings[step] = now - start;
+    start = now;
+};
+
+const failed = fillInputs(values);
+lap('fill');
+if (failed.length) {
+    done({error: 'fill', failed: failed, timings: timings});
+    return;
+}
+
+const history = 'div.game-info ol li';
+const weighed = document.querySelectorAll(history).length;
+document.getElementById('weigh').click();
+lap('click');
+
+const readResult = () => {
+    if (document.querySelectorAll(history).length <= weighed) return null;
+    const element = document.getElementById('reset');
+    const text = element ? element.textContent.trim() : '';
+    return results.includes(text) ? text : null;
+};
+let observer = null;
+let timer = null;
+const finish = (result) => {
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    lap('wait');
+    done({result: result, timings: timings});
+};
+
+const result = readResult();
+if (result) {
+    finish(result);
+    return;
+}
+observer = new MutationObserver(() => {
+    const text = readResult();
+    if (text) finish(text);
+});
+observer.observe(document.body, {subtree: true, childList: true, characterData: true, attributes: true});
+timer = setTimeout(() => {
+    observer.disconnect();
+    lap('wait');
+    done({error: 'timeout', timings: timings});
+}, timeoutMs);
+"""
+
+# Resolves as soon as an element meets a condition, watching the page with a MutationObserver
+# instead of polling it over WebDriver.
+WAIT_FOR_CONDITION_SCRIPT = """
+const selector = arguments[0];
+const by = arguments[1];
+const condition = arguments[2];
+const timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+
+const check = () => {
+    const element = by === 'css' ? document.querySelector(selector) : document.getElementById(selector);
+    if (!element) return null;
+    const text = (element.innerText || element.textContent || '').trim();
+    if (condition.texts && !condition.texts.includes(text)) return null;
+    if (condition.attribute && element.getAttribute(condition.attribute[0]) !== condition.attribute[1]) return null;
+    if (condition.enabled !== null && condition.enabled === Boolean(element.disabled)) return null;
+    return {matched: true, text: text};
+};
+
+let observer = null;
+let timer = null;
+const finish = (outcome) => {
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    outcome.elapsed = performance.now() - start;
+    done(outcome);
+};
+
+const outcome = check();
+if (outcome) {
+    finish(outcome);
+    return;
+}
+observer = new MutationObserver(() => {
+    const outcome = check();
+    if (outcome) finish(outcome);
+});
+observer.observe(document.documentElement, {subtree: true, childList: true, characterData: true, attributes: true});
+timer = setTimeout(() => finish({matched: false}), timeoutMs);
+"""
+
+# Fills the changed cells of both bowls and clicks weigh without waiting for the result, so other
+# tabs can be played meanwhile. Returns how many weighings the history listed before the click.
+START_WEIGH_SCRIPT = FILL_INPUTS_FUNCTION + """
+const values = arguments[0];
+const failed = fillInputs(values);
+if (failed.length) return {error: 'fill', failed: failed};
+const weighed = document.querySelectorAll('div.game-info ol li').length;
+document.getElementById('weigh').click();
+return {weighed: weighed};
+"""
+
+# Returns the result of a weighing started with START_WEIGH_SCRIPT, or null while it is pending
+POLL_WEIGH_SCRIPT = """
+if (document.querySelectorAll('div.game-info ol li').length <= arguments[0]) return null;
+const element = document.getElementById('reset');
+const text = element ? element.textContent.trim() : '';
+return ['<', '>', '='].includes(text) ? text : null;
+"""
+
+# Reads the text of every element matching a selector in one call, instead of one .text per element
+TEXTS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]),
+                  (element) => (element.innerText || element.textContent || '').trim());
+"""
+
+# Reads every weighing of the history in one call, split into the bars of each bowl and the result.
+# An entry that is not a weighing, like '[0,1,2] < [3,4,5]', is returned as null.
+WEIGHING_RECORDS_SCRIPT = """
+const pattern = /\[([\d,\s]*)\]\s*([<>=])\s*\[([\d,\s]*)\]/;
+const bars = (list) => list.split(',').filter((bar) => bar.trim()).map(Number);
+return Array.from(document.querySelectorAll(arguments[0]), (element) => {
+    const match = pattern.exec((element.innerText || element.textContent || '').trim());
+    return match ? {left: bars(match[1]), result: match[2], right: bars(match[3])} : null;
+});
+"""
+
+# Clicks a button and captures the alert it opens. window.alert is replaced for the click, so no
+# native dialog opens and nothing has to be accepted. Resolves with the message of the alert.
+CLICK_AND_CAPTURE_ALERT_SCRIPT = """
+const selector = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const original = window.alert;
+const start = performance.now();
+let timer = null;
+const finish = (outcome) => {
+    window.alert = original;
+    clearTimeout(timer);
+    outcome.elapsed = performance.now() - start;
+    done(outcome);
+};
+
+const button = document.getElementById(selector);
+if (!button) {
+    finish({error: 'missing'});
+    return;
+}
+window.alert = (message) => finish({message: String(message)});
+timer = setTimeout(() => finish({error: 'timeout'}), timeoutMs);
+button.click();
+"""
 
 
 class WebDriverUtility:
@@ -17,6 +215,74 @@ class WebDriverUtility:
         driver (WebDriver): The Selenium WebDriver to use for browser interactions.
         """
         self.driver = driver
+        self.script_timeout = None
+        self.timeouts: Dict[str, AdaptiveTimeout] = {}
+        self.elements: Dict[str, WebElement] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def find_element_by_id(self, selector: str) -> WebElement:
+        """
+        Finds an element by its ID, reusing the handle found earlier on the same page.
+
+        Args:
+        selector (str): The ID of the element.
+
+        Returns:
+        WebElement: The element.
+
+        Raises:
+        NoSuchElementException: If the element cannot be found.
+        """
+        element = self.elements.get(selector)
+        if element is not None:
+            self.cache_hits += 1
+            return element
+        self.cache_misses += 1
+        element = self.driver.find_element(By.ID, selector)
+        self.elements[selector] = element
+        return element
+
+    def with_element(self, selector: str, action: Callable[[WebElement], Any]) -> Any:
+        """
+        Runs an action on an element found by its ID. If the cached handle went stale,
+        because the page re-rendered or navigated, the element is found again and the action retried.
+
+        Args:
+        selector (str): The ID of the element.
+        action (Callable[[WebElement], Any]): What to do with the element.
+
+        Returns:
+        Any: The return value of the action.
+        """
+        element = self.find_element_by_id(selector)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self.elements.pop(selector, None)
+            return action(self.find_element_by_id(selector))
+
+    def invalidate_cache(self) -> None:
+        """
+        Forgets every cached element handle.
+        """
+        self.elements.clear()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counts of the element handle cache.
+        """
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self.elements)}
+
+    def navigate(self, url: str) -> None:
+        """
+        Opens a page. Handles from the previous page are dropped.
+
+        Args:
+        url (str): The URL to open.
+        """
+        self.invalidate_cache()
+        self.driver.get(url)
 
     def click_button_by_id(self, selector: str) -> None:
         """
@@ -29,15 +295,15 @@ class WebDriverUtility:
         NoSuchElementException: If the button cannot be found.
         """
         try:
-            button = self.driver.find_element(By.ID, selector)
-            button.click()
+            self.with_element(selector, lambda button: button.click())
         except NoSuchElementException:
             print(f"Button with selector {selector} not found")
             raise
 
     def click_button_by_css(self, selector: str) -> None:
         """
-        Clicks a button based on a CSS selector.
+        Clicks a button based on a CSS selector. These lookups are not cached, as selectors
+        like ':not([disabled])' depend on the state of the element.
 
         Args:
         selector (str): The CSS selector of the button to click.
@@ -64,12 +330,33 @@ class WebDriverUtility:
         NoSuchElementException: If the input field cannot be found.
         """
         try:
-            grid = self.driver.find_element(By.ID, selector)
-            grid.send_keys(text_string)
+            self.with_element(selector, lambda grid: grid.send_keys(text_string))
         except NoSuchElementException:
             print(f"Grid with selector {selector} not found")
             raise
 
+    def set_texts(self, values: Dict[str, str]) -> List[str]:
+        """
+        Sets text in many input fields in a single browser round trip. Fields that do not
+        accept the value are typed into one by one instead.
+
+        Args:
+        values (Dict[str, str]): The text to set, keyed by the ID of the input field.
+
+        Returns:
+        List[str]: The IDs of the fields that were typed into. Typing adds to the text
+        already in a field, so those only hold the value if they were empty.
+
+        Raises:
+        NoSuchElementException: If an input field cannot be found.
+        """
+        if not values:
+            return []
+        failed = list(self.driver.execute_script(FILL_INPUTS_SCRIPT, values) or [])
+        for selector in failed:
+            self.set_text(selector, values[selector])
+        return failed
+
     def get_text(self, selector: str) -> str:
         """
         Retrieves text from an element identified by an ID.
@@ -84,12 +371,69 @@ class WebDriverUtility:
         NoSuchElementException: If the element cannot be found.
         """
         try:
-            element = self.driver.find_element(By.ID, selector)
-            return element.text
+            return self.with_element(selector, lambda element: element.text)
         except NoSuchElementException:
             print(f"Element with selector {selector} not found")
             raise
 
+    def timeout_for(self, key: str) -> AdaptiveTimeout:
+        """
+        Returns the adaptive timeout of one kind of wait, such as an element ID.
+
+        Args:
+        key (str): The kind of wait.
+
+        Returns:
+        AdaptiveTimeout: The timeout, learned from earlier waits of the same kind.
+        """
+        if key not in self.timeouts:
+            self.timeouts[key] = AdaptiveTimeout()
+        return self.timeouts[key]
+
+    def wait_for_condition(self,
+                           selector: str,
+                           texts: Optional[List[str]] = None,
+                           attribute: Optional[Tuple[str, Optional[str]]] = None,
+                           enabled: Optional[bool] = None,
+                           by: str = "id",
+                           timeout: Optional[float] = None,
+                           key: Optional[str] = None) -> str:
+        """
+        Waits inside the page until an element meets every given condition. The page is
+        watched with a MutationObserver, so the wait ends as soon as the condition holds.
+
+        Args:
+        selector (str): The ID, or CSS selector, of the element to monitor.
+        texts (Optional[List[str]]): The acceptable values of the element's text.
+        attribute (Optional[Tuple[str, Optional[str]]]): An attribute name and its expected value,
+        None for an absent attribute.
+        enabled (Optional[bool]): Whether the element should be enabled or disabled.
+        by (str): 'id' or 'css'.
+        timeout (Optional[float]): Timeout in seconds. By default a multiple of the p99 latency
+        of earlier waits for the same element.
+        key (Optional[str]): Waits with the same key share their adaptive timeout.
+        Defaults to the selector.
+
+        Returns:
+        str: The text of the element.
+
+        Raises:
+        TimeoutException: If the condition does not hold within the timeout.
+        """
+        adaptive = self.timeout_for(key or f"{by}:{selector}")
+        if timeout is None:
+            timeout = adaptive.timeout()
+        condition = {"texts": texts, "attribute": attribute, "enabled": enabled}
+
+        # Leave the browser time to report the in-page timeout itself
+        self.set_script_timeout(timeout + 5)
+        outcome = self.driver.execute_async_script(
+            WAIT_FOR_CONDITION_SCRIPT, selector, by, condition, int(timeout * 1000))
+        if not outcome.get('matched'):
+            raise TimeoutException(f"Element {selector} did not meet {condition} within {timeout:.2f}s")
+        adaptive.record(outcome['elapsed'] / 1000)
+        return outcome['text']
+
     def wait_for_element(self, selector: str, results: List[str]) -> None:
         """
         Waits for an element's text to match one of the specified results.
@@ -102,22 +446,157 @@ class WebDriverUtility:
         If the text of the element does not match the expected results within the timeout.
         """
         try:
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: driver.find_element(By.ID, selector).text in results
-            )
+            self.wait_for_condition(selector, texts=results)
         except TimeoutException:
             print(f"Weighing operation timed out or the result element did not "
                   f"contain the expected value.")
             raise
 
+    def wait_for_alert(self, timeout: Optional[float] = None) -> Alert:
+        """
+        Waits for an alert to open. An open alert blocks the page's scripts, so it can not be
+        observed in the page, WebDriver is polled instead with the same adaptive timeout.
+
+        Args:
+        timeout (Optional[float]): Timeout in seconds. By default a multiple of the p99 latency
+        of earlier alerts.
+
+        Returns:
+        Alert: The open alert.
+
+        Raises:
+        TimeoutException: If no alert opens within the timeout.
+        """
+        adaptive = self.timeout_for("alert")
+        if timeout is None:
+            timeout = adaptive.timeout()
+        start = time.perf_counter()
+        alert = WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(
+            expected_conditions.alert_is_present())
+        adaptive.record(time.perf_counter() - start)
+        return alert
+
+    def set_script_timeout(self, timeout: float) -> None:
+        """
+        Sets how long asynchronous scripts may run, only when it changes.
+
+        Args:
+        timeout (float): The timeout in seconds.
+        """
+        if self.script_timeout != timeout:
+            self.driver.set_script_timeout(timeout)
+            self.script_timeout = timeout
+
+    def fused_weigh(self, values: Dict[str, str], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fills the bowl grids, clicks weigh and waits for the result in a single browser round trip.
+
+        Args:
+        values (Dict[str, str]): The text of each grid cell, keyed by its ID.
+        timeout (Optional[float]): How long to wait for the result, in seconds. By default a
+        multiple of the p99 latency of earlier weighings.
+
+        Returns:
+        Dict[str, Any]: 'result' holds '<', '>' or '=', or 'error' is 'fill' with the 'failed'
+        cell IDs when the page rejected a value. 'timings' holds the in-page milliseconds of the
+        fill, click and wait steps.
+
+        Raises:
+        TimeoutException: If the result does not appear within the timeout.
+        """
+        adaptive = self.timeout_for("fused_weigh")
+        if timeout is None:
+            timeout = adaptive.timeout()
+
+        # Leave the browser time to report the in-page timeout itself
+        self.set_script_timeout(timeout + 5)
+        outcome = self.driver.execute_async_script(FUSED_WEIGH_SCRIPT, values, int(timeout * 1000))
+        if outcome.get('error') == 'timeout':
+            print("Weighing operation timed out or the result element did not "
+                  "contain the expected value.")
+            raise TimeoutException("The weighing result did not appear")
+        if 'result' in outcome:
+            adaptive.record(outcome['timings']['wait'] / 1000)
+        return outcome
+
+    def start_weigh(self, values: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Fills the bowl grids and clicks weigh in a single browser round trip, without waiting
+        for the result. Read it later with poll_weigh.
+
+        Args:
+        values (Dict[str, str]): The text of each grid cell, keyed by its ID.
+
+        Returns:
+        Dict[str, Any]: 'weighed' holds the number of weighings listed before the click, or
+        'error' is 'fill' with the 'failed' cell IDs when the page rejected a value and
+        nothing was weighed.
+        """
+        return self.driver.execute_script(START_WEIGH_SCRIPT, values)
+
+    def poll_weigh(self, weighed: int) -> Optional[str]:
+        """
+        Reads the result of a weighing started with start_weigh, without waiting for it.
+
+        Args:
+        weighed (int): The number of weighings listed before the weighing was started.
+
+        Returns:
+        Optional[str]: '<', '>' or '=', or None while the weighing is pending.
+        """
+        return self.driver.execute_script(POLL_WEIGH_SCRIPT, weighed)
+
+    def click_and_capture_alert(self, selector: str, timeout: Optional[float] = None) -> str:
+        """
+        Clicks a button and returns the text of the alert it opens, in a single browser round trip.
+        The alert is captured in the page, so there is no dialog to wait for or accept. If the page
+        opens a native alert anyway, it is read and accepted.
+
+        Args:
+        selector (str): The ID of the button to click.
+        timeout (Optional[float]): Timeout in seconds. By default a multiple of the p99 latency
+        of earlier alerts.
+
+        Returns:
+        str: The text of the alert.
+
+        Raises:
+        NoSuchElementException: If the button cannot be found.
+        TimeoutException: If no alert opens within the timeout.
+        """
+        adaptive = self.timeout_for("alert")
+        if timeout is None:
+            timeout = adaptive.timeout()
+
+        # Leave the browser time to report the in-page timeout itself
+        self.set_script_timeout(timeout + 5)
+        try:
+            outcome = self.driver.execute_async_script(CLICK_AND_CAPTURE_ALERT_SCRIPT, selector,
+                                                       int(timeout * 1000))
+        except UnexpectedAlertPresentException:
+            text = self.get_alert_text()
+            self.accept_alert()
+            return text
+
+        if outcome.get('error') == 'missing':
+            print(f"Button with selector {selector} not found")
+            raise NoSuchElementException(f"No element with ID {selector}")
+        if outcome.get('error') == 'timeout':
+            raise TimeoutException(f"Clicking {selector} did not open an alert within {timeout:.2f}s")
+        adaptive.record(outcome['elapsed'] / 1000)
+        return outcome['message']
+
     def get_alert_text(self) -> str:
         """
         Retrieves the text from an active alert.
 
         Returns:
         str: The text from the alert.
+
+        Raises:
+        TimeoutException: If no alert opens within the timeout.
         """
-        alert = self.driver.switch_to.alert
+        alert = self.wait_for_alert()
         return alert.text
 
     def accept_alert(self) -> None:
@@ -126,6 +605,31 @@ class WebDriverUtility:
         """
         self.driver.switch_to.alert.accept()
 
+    def get_texts_by_css(self, selector: str) -> List[str]:
+        """
+        Retrieves the text of every element that matches a CSS selector, in a single browser round trip.
+
+        Args:
+        selector (str): The CSS selector of the elements to read.
+
+        Returns:
+        List[str]: The text of each element, in page order. Empty if none match.
+        """
+        return list(self.driver.execute_script(TEXTS_SCRIPT, selector) or [])
+
+    def get_weighing_records(self, selector: str) -> List[Optional[Dict[str, Any]]]:
+        """
+        Reads the weighings listed by the elements matching a CSS selector, in one round trip.
+
+        Args:
+        selector (str): The CSS selector of the history entries.
+
+        Returns:
+        List[Optional[Dict[str, Any]]]: The 'left' and 'right' bars and the 'result' of each
+        entry, None for an entry that is not a weighing.
+        """
+        return list(self.driver.execute_script(WEIGHING_RECORDS_SCRIPT, selector) or [])
+
     def get_elements_by_css(self, selector: str) -> List[WebElement]:
         """
         Retrieves a list of elements based on a CSS selector.
@@ -0,0 +1,139 @@
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchWindowException
+from ..app.logger import configure_logging, shutdown_logging
+from ..app.web_driver_utilities import (CLICK_AND_CAPTURE_ALERT_SCRIPT, FUSED_WEIGH_SCRIPT,
+                                        POLL_WEIGH_SCRIPT, START_WEIGH_SCRIPT)
+
+
+@pytest.fixture(autouse=True)
+def log_file(tmp_path):
+    """
+    Sends the application log of every test to a temporary file instead of the checkout.
+
+    Returns:
+        The path of the log file.
+    """
+    path = tmp_path / "goldbar.log"
+    configure_logging(str(path))
+    yield path
+    shutdown_logging()
+
+
+def answer_script(script, *args):
+    """
+    Answers the asynchronous scripts of a game, the guessed bar opens a 'Yay' alert.
+    """
+    if script == CLICK_AND_CAPTURE_ALERT_SCRIPT:
+        return {'message': "Yay! You find it!", 'elapsed': 2.0}
+    if script == FUSED_WEIGH_SCRIPT:
+        return {'result': '<', 'timings': {'fill': 0.1, 'click': 0.2, 'wait': 3.0}}
+    return {'matched': True, 'text': '<', 'elapsed': 5.0}
+
+
+@pytest.fixture
+def game_driver():
+    """
+    Makes mocked drivers whose page answers every weighing with '<' and the first guess with 'Yay'.
+
+    Returns:
+        A function that takes the process ID of chromedriver and returns a new mocked WebDriver.
+    """
+    def make_driver(pid=None):
+        driver = MagicMock()
+        driver.execute_script.return_value = []
+        driver.execute_async_script.side_effect = answer_script
+        driver.find_element.return_value.text = '<'
+        driver.service.process.pid = pid
+        return driver
+
+    return make_driver
+
+
+class FakeBrowser:
+    """
+    A browser whose tabs each play a game with a lighter fake bar. A weighing only shows its
+    result after it was polled `delay` times, like a page waiting for the server. Like Chrome,
+    every command fails while the driver is on a closed window.
+    """
+
+    def __init__(self, fake_bars, delay=2):
+        self.fake_bars = list(fake_bars)
+        self.delay = delay
+        self.pages = {}
+        self.handles = 0
+        self.current = "home"
+        self.closed = set()
+        self.log = []
+        self.most_open = 0
+        self.switch_to = MagicMock()
+        self.switch_to.new_window.side_effect = self.new_window
+        self.switch_to.window.side_effect = self.window
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def check_window(self):
+        if self.current in self.closed:
+            raise NoSuchWindowException(f"Window {self.current} was closed")
+
+    def new_window(self, kind):
+        self.check_window()
+        self.handles += 1
+        self.current = f"tab{self.handles}"
+
+    def window(self, handle):
+        self.current = handle
+
+    def get(self, url):
+        self.check_window()
+        self.pages[self.current] = {"fake": self.fake_bars.pop(0), "cells": {}, "history": [], "pending": None}
+        self.most_open = max(self.most_open, len(self.pages))
+
+    def close(self):
+        self.check_window()
+        self.pages.pop(self.current)
+        self.closed.add(self.current)
+
+    def execute_script(self, script, *args):
+        self.check_window()
+        page = self.pages[self.current]
+        if script == START_WEIGH_SCRIPT:
+            page["cells"].update(args[0])
+            left = [int(value) for cell, value in page["cells"].items() if cell.startswith("left_") and value]
+            right = [int(value) for cell, value in page["cells"].items() if cell.startswith("right_") and value]
+            result = "<" if page["fake"] in left else ">" if page["fake"] in right else "="
+            page["pending"] = [result, self.delay]
+            self.log.append(("start", self.current))
+            return {"weighed": len(page["history"])}
+        if script == POLL_WEIGH_SCRIPT:
+            result, polls = page["pending"]
+            if polls:
+                page["pending"][1] -= 1
+                return None
+            page["history"].append(result)
+            self.log.append(("result", self.current))
+            return result
+        raise AssertionError(f"Unexpected script {script}")
+
+    def execute_async_script(self, script, *args):
+        self.check_window()
+        assert script == CLICK_AND_CAPTURE_ALERT_SCRIPT
+        bar = int(args[0].split("_")[1])
+        message = "Yay! You find it!" if bar == self.pages[self.current]["fake"] else "Oops! Try Again!"
+        return {"message": message, "elapsed": 1.0}
+
+    def set_script_timeout(self, timeout):
+        pass
+
+
+@pytest.fixture
+def fake_browser():
+    """
+    Opens fake browsers that play games over the given fake bars.
+
+    Returns:
+        The FakeBrowser class.
+    """
+    return FakeBrowser
@@ -0,0 +1,98 @@
+import json
+import pytest
+from ..app.batch import BATCH_PHASES, BatchRunner, completed_ids, learn_prior, load_scenarios
+from ..app.goldbar import GoldBarWeighing
+
+SCENARIO = {"left_bar": [0, 1, 2], "right_bar": [3, 4, 5], "remaining": [6, 7, 8]}
+
+
+@pytest.fixture
+def scenarios(tmp_path):
+    """
+    A scenario file of three games, the last one without an ID.
+
+    Returns:
+        The path of the scenario file.
+    """
+    path = tmp_path / "scenarios.jsonl"
+    lines = [json.dumps({"id": "a", **SCENARIO}), json.dumps({"id": "b", **SCENARIO}), "", json.dumps(SCENARIO)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_load_scenarios(scenarios, tmp_path):
+    """
+    Test that scenarios are read with their ID, or their line number, and bad lines are rejected.
+    """
+    assert [game_id for game_id, _ in load_scenarios(str(scenarios))] == ["a", "b", 4]
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text(json.dumps({"left_bar": [0]}) + "\n")
+    with pytest.raises(ValueError):
+        list(load_scenarios(str(bad)))
+
+
+def test_run_plays_every_game_in_one_session(scenarios, tmp_path, game_driver):
+    """
+    Test that every game reloads the page in the same browser, and its result is written as it ends.
+
+    Asserts:
+        One result line per game, every phase timed, the browser never quit between games.
+    """
+    driver = game_driver()
+    output = tmp_path / "results.jsonl"
+
+    summary = BatchRunner(GoldBarWeighing(driver), "http://localhost/").run(str(scenarios), str(output))
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [result["id"] for result in results] == ["a", "b", 4]
+    assert all(result["found"] and result["error"] is None for result in results)
+    assert all(list(result["phases"]) == BATCH_PHASES for result in results)
+    assert driver.get.call_count == 3
+    assert not driver.quit.called
+    assert (summary["games"], summary["found"], summary["errors"], summary["skipped"]) == (3, 3, 0, 0)
+    assert summary["games_per_second"] > 0
+    assert sum(phase["share"] for phase in summary["phases"].values()) == pytest.approx(1.0)
+
+
+def test_run_resumes_after_a_killed_run(scenarios, tmp_path, game_driver):
+    """
+    Test that a second run skips the games already written, and plays again one cut off mid-line.
+    Results of games that are not in the scenario file are not counted as skipped.
+    """
+    output = tmp_path / "results.jsonl"
+    output.write_text(json.dumps({"id": "a", "found": True}) + "\n" + json.dumps({"id": "old", "found": True})
+                      + '\n{"id": "b", "fo')
+    assert completed_ids(str(output)) == {"a", "old"}
+
+    summary = BatchRunner(GoldBarWeighing(game_driver()), "http://localhost/").run(str(scenarios), str(output))
+
+    assert (summary["games"], summary["skipped"]) == (2, 1)
+    assert completed_ids(str(output)) == {"a", "old", "b", 4}
+
+
+def test_failed_game_is_recorded(scenarios, tmp_path, game_driver):
+    """
+    Test that a failing game is written with its error and the next games still run.
+    """
+    driver = game_driver()
+    driver.get.side_effect = [Exception("page did not load"), None, None]
+    output = tmp_path / "results.jsonl"
+
+    summary = BatchRunner(GoldBarWeighing(driver), "http://localhost/").run(str(scenarios), str(output))
+
+    first = json.loads(output.read_text().splitlines()[0])
+    assert first["error"] == "page did not load" and not first["found"]
+    assert (summary["games"], summary["errors"], summary["found"]) == (3, 1, 2)
+
+
+def test_learn_prior(tmp_path):
+    """
+    Test that the prior counts the fake bars found in earlier results, smoothed, skipping failed games.
+    """
+    results = tmp_path / "results.jsonl"
+    results.write_text("\n".join(json.dumps(result) for result in [
+        {"id": 1, "fake_bar": 2, "found": True}, {"id": 2, "fake_bar": 2, "found": True},
+        {"id": 3, "fake_bar": 0, "found": False}, {"id": 4, "fake_bar": None, "found": False}]) + "\n{")
+
+    assert learn_prior(str(results), 3) == pytest.approx([0.2, 0.2, 0.6])
@@ -0,0 +1,93 @@
+from concurrent import futures
+from unittest.mock import MagicMock, patch
+from ..app.benchmark import PHASES, compare, run_benchmark
+from ..app.cdp import CDPTab, TEXT_SCRIPT
+from ..app.web_driver_utilities import CLICK_AND_CAPTURE_ALERT_SCRIPT
+
+
+def test_run_benchmark_times_every_phase(game_driver):
+    """
+    Test that every phase of the game is timed for each repetition.
+
+    Asserts:
+        Every phase has p50, p95 and p99, the game phases once per repetition.
+    """
+    drivers = []
+    factory = MagicMock(side_effect=lambda: drivers.append(game_driver()) or drivers[-1])
+
+    report = run_benchmark("http://localhost/", [0, 1, 2], [3, 4, 5], [6, 7, 8],
+                           repetitions=5, launches=2, factory=factory)
+
+    assert set(report["phases"]) == set(PHASES)
+    assert report["phases"]["launch"]["samples"] == 2
+    assert all(report["phases"][phase]["samples"] == 5 for phase in PHASES if phase != "launch")
+    assert all(driver.quit.called for driver in drivers)
+    drivers[-1].get.assert_called_with("http://localhost/")
+    assert report["weigh"]["fused.wait"]["samples"] == 5 and "fused.overhead" in report["weigh"]
+
+
+def make_tab(driver):
+    """
+    Creates a mocked DevTools tab whose page answers the scripts like the page of the given driver.
+
+    Returns:
+        A MagicMock standing in for a CDPTab.
+    """
+    tab = MagicMock()
+    tab.execute_script.side_effect = lambda script, *args: '<' if script == TEXT_SCRIPT else []
+    tab.execute_async_script.side_effect = driver.execute_async_script.side_effect
+
+    def send(method, params):
+        clicked = futures.Future()
+        clicked.set_result({"result": {"value": True}})
+        return clicked
+
+    tab.send.side_effect = send
+    tab.value.side_effect = CDPTab.value
+    tab.script_expression.side_effect = CDPTab.script_expression
+    return tab
+
+
+def test_run_benchmark_cdp_backend(game_driver):
+    """
+    Test that the cdp backend plays the phases on a DevTools tab of the launched browser.
+
+    Asserts:
+        The tab opens the page and is closed with the browser.
+    """
+    driver = game_driver()
+    tab = make_tab(driver)
+    with patch.object(CDPTab, "from_driver", return_value=tab) as from_driver:
+        report = run_benchmark("http://localhost/", [0, 1, 2], [3, 4, 5], [6, 7, 8],
+                               repetitions=2, launches=1, factory=lambda: driver, backend="cdp")
+
+    from_driver.assert_called_once_with(driver)
+    assert report["backend"] == "cdp"
+    assert all(report["phases"][phase]["samples"] == 2 for phase in PHASES if phase != "launch")
+    tab.get.assert_called_with("http://localhost/")
+    driver.get.assert_not_called()
+    tab.execute_async_script.assert_any_call(CLICK_AND_CAPTURE_ALERT_SCRIPT, "coin_0", 10000)
+    tab.quit.assert_called_once()
+    driver.quit.assert_called_once()
+
+
+def phases(value):
+    """
+    Builds a report where every percentile of the 'get' phase is the given value.
+    """
+    return {"phases": {"get": {"samples": 20, "mean": value, "p50": value, "p95": value, "p99": value}}}
+
+
+def test_compare_within_tolerance():
+    """
+    Test that a phase within the tolerance is no regression.
+    """
+    assert compare(phases(11.0), phases(10.0)) == []
+
+
+def test_compare_regression():
+    """
+    Test that a slower phase, or a missing one, is reported.
+    """
+    assert len(compare(phases(20.0), phases(10.0))) == 3
+    assert compare({"phases": {}}, phases(10.0)) == ["get: not measured"]
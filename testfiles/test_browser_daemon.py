@@ -0,0 +1,104 @@
+import os
+import sys
+from unittest.mock import MagicMock
+import pytest
+from ..app import GoldBarWeighing
+from ..app.browser_daemon import BrowserDaemon, read_state
+
+# Stands in for Chrome, a process that keeps running until it is stopped
+BROWSER = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """
+    A started daemon, whose browser is a sleeping process.
+
+    Returns:
+        An instance of the BrowserDaemon class.
+    """
+    daemon = BrowserDaemon(port=9555, idle_timeout=60, state_file=str(tmp_path / "browser.json"),
+                           command=BROWSER)
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+def test_start_writes_state(daemon):
+    """
+    Test that the games can read the debugger address of a running daemon.
+    """
+    state = read_state(daemon.state_file)
+
+    assert state["debugger_address"] == "127.0.0.1:9555"
+    assert state["pid"] == os.getpid()
+    assert state["chrome_pid"] == daemon.process.pid
+
+
+def test_stop_removes_state(daemon):
+    """
+    Test that stopping the daemon quits the browser and removes the state file.
+    """
+    daemon.stop()
+
+    assert daemon.process.poll() is not None
+    assert read_state(daemon.state_file) is None
+    assert not os.path.exists(daemon.state_file)
+
+
+def test_crashed_browser_restarts(daemon):
+    """
+    Test that a browser that exits is started again and the state file follows it.
+    """
+    crashed = daemon.process
+    crashed.kill()
+    crashed.wait()
+
+    assert daemon.check() is True
+    assert daemon.restarts == 1
+    assert daemon.process is not crashed and daemon.process.poll() is None
+    assert read_state(daemon.state_file)["chrome_pid"] == daemon.process.pid
+
+
+def test_gives_up_after_max_restarts(daemon):
+    """
+    Test that a browser crashing over and over stops the daemon.
+    """
+    daemon.max_restarts = 0
+    daemon.process.kill()
+    daemon.process.wait()
+
+    assert daemon.check() is False
+
+
+def test_idle_shutdown(daemon):
+    """
+    Test that the daemon stops when no game tab was open for the idle timeout.
+    """
+    daemon.game_tabs = MagicMock(return_value=1)
+    daemon.idle_timeout = 0
+    assert daemon.check() is True
+
+    daemon.game_tabs.return_value = 0
+    assert daemon.check() is False
+
+
+def test_read_state_of_dead_daemon(tmp_path):
+    """
+    Test that a state file left by a daemon that died is ignored.
+    """
+    state_file = tmp_path / "browser.json"
+    state_file.write_text('{"pid": 999999999, "debugger_address": "127.0.0.1:9222"}')
+
+    assert read_state(str(state_file)) is None
+
+
+def test_attached_game_closes_only_its_tab():
+    """
+    Test that a game attached to the daemon closes its tab and keeps the browser running.
+    """
+    driver = MagicMock()
+    with GoldBarWeighing(driver, logger=MagicMock(), attached=True):
+        pass
+
+    assert [call[0] for call in driver.method_calls] == ["close", "quit"]
@@ -0,0 +1,184 @@
+import json
+import threading
+from concurrent import futures
+import pytest
+import trio
+import trio_websocket
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from ..app.cdp import CDPError, CDPTab, CDPUtility
+
+
+class FakeChrome:
+    """
+    A DevTools websocket that answers commands from a table, in a background thread.
+    A Runtime.evaluate whose expression contains 'coin_' opens an alert, and is only
+    answered once the alert is accepted, like in Chrome.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.received = []
+        started = futures.Future()
+        self.thread = threading.Thread(target=trio.run, args=(self.serve, started), daemon=True)
+        self.thread.start()
+        self.port = started.result(5)
+
+    async def serve(self, started):
+        async with trio.open_nursery() as nursery:
+            self.nursery = nursery
+            server = await nursery.start(trio_websocket.serve_websocket, self.handle, "127.0.0.1", 0, None)
+            self.token = trio.lowlevel.current_trio_token()
+            started.set_result(server.port)
+
+    async def handle(self, request):
+        websocket = await request.accept()
+        held = None
+        while True:
+            try:
+                message = json.loads(await websocket.get_message())
+            except trio_websocket.ConnectionClosed:
+                return
+            self.received.append(message)
+            method = message["method"]
+            expression = message["params"].get("expression", "")
+            if method == "Runtime.evaluate" and "coin_" in expression:
+                held = message["id"]
+                await websocket.send_message(json.dumps({
+                    "method": "Page.javascriptDialogOpening", "params": {"message": "Yay! You find it!"}}))
+                continue
+            if method == "Page.handleJavaScriptDialog" and held is not None:
+                await websocket.send_message(json.dumps({"id": held, "result": {"result": {"value": True}}}))
+                held = None
+            if method == "Page.navigate":
+                await websocket.send_message(json.dumps({"method": "Page.loadEventFired", "params": {}}))
+            await websocket.send_message(json.dumps({"id": message["id"], **self.answer(method, expression)}))
+
+    def answer(self, method, expression):
+        if method == "Broken.method":
+            return {"error": {"code": -32601, "message": "'Broken.method' wasn't found"}}
+        if method != "Runtime.evaluate":
+            return {"result": {}}
+        if "throw" in expression:
+            return {"result": {"result": {}, "exceptionDetails": {"text": "Uncaught Error: boom"}}}
+        for marker, value in self.values.items():
+            if marker in expression:
+                return {"result": {"result": {"value": value}}}
+        return {"result": {"result": {"value": None}}}
+
+    def stop(self):
+        trio.from_thread.run_sync(self.nursery.cancel_scope.cancel, trio_token=self.token)
+        self.thread.join(5)
+
+
+@pytest.fixture
+def chrome():
+    chrome = FakeChrome({'"result"': "<", '"missing"': None, "querySelectorAll": ["[0] < [1]", "[2] = [3]"],
+                         '"weigh"': True, '"left_0"': True})
+    yield chrome
+    chrome.stop()
+
+
+@pytest.fixture
+def tab(chrome):
+    tab = CDPTab(f"ws://127.0.0.1:{chrome.port}/devtools/page/1")
+    yield tab
+    tab.quit()
+
+
+def test_tab_enables_page_events(chrome, tab):
+    """
+    Test that the tab asks for page events as it connects.
+    """
+    assert chrome.received[0]["method"] == "Page.enable"
+
+
+def test_execute_script_wraps_arguments(chrome, tab):
+    """
+    Test that a WebDriver script gets its arguments, and its value is returned.
+    """
+    assert tab.execute_script("return arguments[0];", "result") == "<"
+    expression = chrome.received[-1]["params"]["expression"]
+    assert expression.endswith('.apply(null, ["result"])')
+    assert chrome.received[-1]["params"]["returnByValue"] is True
+
+
+def test_execute_async_script_awaits_promise(chrome, tab):
+    """
+    Test that an asynchronous script gets a callback and its promise is awaited.
+    """
+    tab.execute_async_script("arguments[arguments.length - 1](1);", "result")
+
+    params = chrome.received[-1]["params"]
+    assert params["expression"].startswith("new Promise")
+    assert params["awaitPromise"] is True
+
+
+def test_errors_are_raised(tab):
+    """
+    Test that protocol errors and script exceptions are raised.
+    """
+    with pytest.raises(CDPError):
+        tab.execute("Broken.method")
+    with pytest.raises(JavascriptException):
+        tab.execute_script("throw new Error('boom');")
+
+
+def test_get_waits_for_load(chrome, tab):
+    """
+    Test that opening a page waits for its load event.
+    """
+    tab.get("http://localhost/")
+
+    assert chrome.received[-1] == {"id": chrome.received[-1]["id"], "method": "Page.navigate",
+                                   "params": {"url": "http://localhost/"}}
+
+
+def test_utility_reads_and_clicks(chrome, tab):
+    """
+    Test that the utility reads text and clicks with one websocket message each.
+    """
+    utility = CDPUtility(tab)
+    sent = len(chrome.received)
+
+    assert utility.get_text("result") == "<"
+    utility.click_button_by_id("weigh")
+    assert [element.text for element in utility.get_elements_by_css("div.game-info ol li")] == \
+           ["[0] < [1]", "[2] = [3]"]
+    assert len(chrome.received) - sent == 3
+
+
+def test_utility_missing_element(tab):
+    """
+    Test that a missing element raises NoSuchElementException like WebDriverUtility.
+    """
+    utility = CDPUtility(tab)
+
+    with pytest.raises(NoSuchElementException):
+        utility.get_text("missing")
+    with pytest.raises(NoSuchElementException):
+        utility.click_button_by_id("missing")
+
+
+def test_utility_set_text_inserts(chrome, tab):
+    """
+    Test that typing focuses the field and inserts the text.
+    """
+    CDPUtility(tab).set_text("left_0", "4")
+
+    assert chrome.received[-1]["method"] == "Input.insertText"
+    assert chrome.received[-1]["params"] == {"text": "4"}
+
+
+def test_utility_click_opening_alert(chrome, tab):
+    """
+    Test that a click which opens an alert returns, the alert is read from the dialog event
+    and accepting it lets the click finish.
+    """
+    utility = CDPUtility(tab)
+
+    utility.click_button_by_id("coin_4")
+    assert utility.get_alert_text() == "Yay! You find it!"
+    utility.accept_alert()
+
+    assert chrome.received[-1]["method"] == "Page.handleJavaScriptDialog"
+    assert not utility.dialog.done()
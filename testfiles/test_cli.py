@@ -0,0 +1,77 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from ..app import cli, runner, web_driver_pool
+
+
+def test_simulate_command(capsys):
+    """
+    Test that the simulate command plays every fake bar and prints the report.
+    """
+    assert cli.main(["simulate", "27", "--bowl-capacity", "9"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["n"] == 27
+    assert report["games"] == report["solved"] == 27
+    assert report["max_weighings"] == 3
+
+
+def test_prior_command(capsys):
+    """
+    Test that the prior command compares the prior-aware strategy with the uniform one.
+    """
+    assert cli.main(["prior", "--weights", "50", "1", "1", "1", "1", "1", "1", "1", "1", "--slack", "1"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["uniform_expected_weighings"] == pytest.approx(2)
+    assert report["saved_per_game"] > 0.5
+    assert cli.main(["prior"]) == 1
+
+
+def test_run_command(capsys, tmp_path):
+    """
+    Test that the run command plays the games of the config on a pool and prints the summary.
+    """
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"isheadless": True, "url": "http://localhost/", "pool_size": 3,
+                                  "log": {"path": str(tmp_path / "goldbar.log")}}))
+    game_runner = MagicMock()
+    game_runner.return_value.run.return_value = {"summary": {"games": 4, "errors": 0}, "results": []}
+
+    with patch.object(web_driver_pool, "WebDriverPool") as pool, \
+            patch.object(runner, "ConcurrentGameRunner", game_runner):
+        assert cli.main(["run", "--games", "4", "--config", str(config)]) == 0
+
+    assert pool.call_args.kwargs["size"] == 3
+    assert len(game_runner.return_value.run.call_args.args[0]) == 4
+    assert json.loads(capsys.readouterr().out) == {"games": 4, "errors": 0}
+
+
+def test_unknown_command():
+    """
+    Test that a missing or unknown subcommand is rejected.
+    """
+    with pytest.raises(SystemExit):
+        cli.main(["fly"])
+
+
+def test_lazy_exports():
+    """
+    Test that the package exports load on first use, and unknown names still fail.
+    """
+    from .. import app
+
+    assert app.SimulatedScale.__name__ == "SimulatedScale"
+    with pytest.raises(AttributeError):
+        app.NoSuchName
+
+
+@pytest.mark.parametrize("module, budget", sorted(cli.IMPORT_BUDGET_MS.items()))
+def test_import_budget(module, budget):
+    """
+    Test that the solver entry points import within their budget, without Selenium.
+    """
+    times = cli.import_times(module)
+
+    assert not [name for name in times if name.split(".")[0] == "selenium"]
+    assert times[module] <= budget
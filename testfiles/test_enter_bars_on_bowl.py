@@ -25,14 +25,62 @@ def gold_bar_weighing():
 
 def test_enter_bars_on_bowl_success(gold_bar_weighing):
     """
-    Test that `enter_bars_on_bowl` correctly interacts with web elements
-    for a valid input range.
+    Test that `enter_bars_on_bowl` fills every grid cell of the bowl in one script call.
 
     Asserts:
-        The method correctly calls `find_element` and `send_keys` for each bar index.
+        The method calls `execute_script` once with the value of each cell
+        and does not type into the cells one by one.
     """
     bars = [3, 4, 5]
+    gold_bar_weighing.driver.execute_script.return_value = []
     gold_bar_weighing.enter_bars_on_bowl(bars, 'left')
-    expected_calls = [call(f"left_{i}", str(bar)) for i, bar in enumerate(bars)]
-    gold_bar_weighing.webutils.set_text.assert_has_calls(expected_calls)
 
+    gold_bar_weighing.driver.execute_script.assert_called_once()
+    values = gold_bar_weighing.driver.execute_script.call_args.args[1]
+    assert values == {f"left_{i}": str(bar) for i, bar in enumerate(bars)}
+    gold_bar_weighing.webutils.set_text.assert_not_called()
+
+
+def test_enter_bars_on_bowl_fallback(gold_bar_weighing):
+    """
+    Test that `enter_bars_on_bowl` types into the cells that did not take the value.
+
+    Asserts:
+        The method calls `set_text` only for the failed cell.
+    """
+    gold_bar_weighing.driver.execute_script.return_value = ["right_1"]
+    gold_bar_weighing.enter_bars_on_bowl([3, 4, 5], 'right')
+
+    assert gold_bar_weighing.webutils.set_text.call_args_list == [call("right_1", "4")]
+
+
+def test_enter_bars_on_bowl_writes_changed_cells(gold_bar_weighing):
+    """
+    Test that only the cells that differ from the last weighing are written, and cells left
+    over from a larger weighing are cleared.
+
+    Asserts:
+        The second and third fills only send the changed and cleared cells.
+    """
+    gold_bar_weighing.driver.execute_script.return_value = []
+    gold_bar_weighing.enter_bars_on_bowl([0, 1, 2], 'left')
+    gold_bar_weighing.enter_bars_on_bowl([0, 1, 5], 'left')
+    assert gold_bar_weighing.driver.execute_script.call_args.args[1] == {"left_2": "5"}
+
+    gold_bar_weighing.enter_bars_on_bowl([0], 'left')
+    assert gold_bar_weighing.driver.execute_script.call_args.args[1] == {"left_1": "", "left_2": ""}
+    assert gold_bar_weighing.grid == {"left_0": "0"}
+
+
+def test_enter_bars_on_bowl_overwrite_rejected(gold_bar_weighing):
+    """
+    Test that a cell the page would not overwrite is reported, as typing can only add to it.
+
+    Asserts:
+        The method returns False.
+    """
+    gold_bar_weighing.driver.execute_script.return_value = []
+    assert gold_bar_weighing.enter_bars_on_bowl([3, 4, 5], 'right') is True
+
+    gold_bar_weighing.driver.execute_script.return_value = ["right_1"]
+    assert gold_bar_weighing.enter_bars_on_bowl([3, 7, 5], 'right') is False
@@ -84,3 +84,35 @@ def test_find_fake_bar_less_less(gold_bar_weighing):
 
     fake_bar = gold_bar_weighing.find_fake_bar(left, right, remaining)
     assert fake_bar == 0
+
+
+def test_find_fake_bar_twenty_seven_bars(gold_bar_weighing):
+    """
+    Test the identification of the fake bar among 27 bars, which needs three weighings.
+
+    Asserts:
+        The suspected groups are split in thirds and weighed until one bar is left.
+    """
+    gold_bar_weighing.weigh.side_effect = ['>', '=', '<']
+    gold_bar_weighing.find_suspected_bars.side_effect = [
+        list(range(9, 18))
+    ]
+
+    fake_bar = gold_bar_weighing.find_fake_bar(
+        list(range(9)), list(range(9, 18)), list(range(18, 27)))
+    assert fake_bar == 15
+    gold_bar_weighing.weigh.assert_any_call([9, 10, 11], [12, 13, 14])
+    gold_bar_weighing.weigh.assert_any_call([15], [16])
+    assert gold_bar_weighing.weigh.call_count == 3
+
+
+def test_find_fake_bar_invalid_values(gold_bar_weighing):
+    """
+    Test that invalid bar values raise a ValueError before any weighing.
+
+    Asserts:
+        A ValueError is raised and nothing is weighed.
+    """
+    with pytest.raises(ValueError):
+        gold_bar_weighing.find_fake_bar([0, 1], [2], [3, 4])
+    gold_bar_weighing.weigh.assert_not_called()
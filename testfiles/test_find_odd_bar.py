@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from ..app import GoldBarWeighing
+
+
+def balance(fake_bar, direction):
+    """
+    Builds a weigh function for a scale with the given fake bar.
+
+    Returns:
+        A function that compares two lists of bars like the web page does.
+    """
+    def weigh(left, right):
+        delta = -1 if direction == 'lighter' else 1
+        left_weight = sum(delta for bar in left if bar == fake_bar)
+        right_weight = sum(delta for bar in right if bar == fake_bar)
+        if left_weight < right_weight:
+            return '<'
+        if left_weight > right_weight:
+            return '>'
+        return '='
+    return weigh
+
+
+@pytest.fixture
+def gold_bar_weighing():
+    """
+    Creates a test fixture with a mocked GoldBarWeighing instance.
+
+    Returns:
+        An instance of the GoldBarWeighing class equipped with a mocked WebDriver.
+    """
+    with patch('selenium.webdriver.Chrome') as MockWebDriver:
+        gb = GoldBarWeighing(MockWebDriver())
+        gb.weigh = MagicMock()
+        return gb
+
+
+@pytest.mark.parametrize("direction", ['lighter', 'heavier'])
+def test_find_odd_bar_twelve_bars(gold_bar_weighing, direction):
+    """
+    Test that every fake bar among 12 bars is found with its direction.
+
+    Asserts:
+        The fake bar and direction are correct and at most 3 weighings are used.
+    """
+    for fake_bar in range(12):
+        gold_bar_weighing.weigh.reset_mock()
+        gold_bar_weighing.weigh.side_effect = balance(fake_bar, direction)
+
+        assert gold_bar_weighing.find_odd_bar(list(range(12))) == (fake_bar, direction)
+        assert gold_bar_weighing.weigh.call_count <= 3
+
+
+def test_find_odd_bar_thirteen_bars_with_genuine(gold_bar_weighing):
+    """
+    Test that 13 bars need only 3 weighings when a genuine bar can be used as a reference.
+
+    Asserts:
+        Every fake bar is found in at most 3 weighings.
+    """
+    for fake_bar in range(13):
+        for direction in ('lighter', 'heavier'):
+            gold_bar_weighing.weigh.reset_mock()
+            gold_bar_weighing.weigh.side_effect = balance(fake_bar, direction)
+
+            result = gold_bar_weighing.find_odd_bar(list(range(13)), genuine=[13])
+            assert result == (fake_bar, direction)
+            assert gold_bar_weighing.weigh.call_count <= 3
+
+
+def test_find_odd_bar_bowl_capacity():
+    """
+    Test that the weighings respect the bowl capacity.
+
+    Asserts:
+        No bowl holds more than 3 bars and the fake bar is still found.
+    """
+    with patch('selenium.webdriver.Chrome') as MockWebDriver:
+        gb = GoldBarWeighing(MockWebDriver(), bowl_capacity=3)
+    gb.weigh = MagicMock(side_effect=balance(20, 'heavier'))
+
+    assert gb.find_odd_bar(list(range(30))) == (20, 'heavier')
+    for weighing in gb.weigh.call_args_list:
+        left, right = weighing.args
+        assert len(left) == len(right) <= 3
+
+
+def test_find_odd_bar_too_few_bars(gold_bar_weighing):
+    """
+    Test that 2 bars without a genuine bar raise a ValueError.
+
+    Asserts:
+        A ValueError is raised because the direction can not be found.
+    """
+    with pytest.raises(ValueError):
+        gold_bar_weighing.find_odd_bar([0, 1])
+
+
+def test_find_odd_bar_inconsistent_results(gold_bar_weighing):
+    """
+    Test that results that do not match any fake bar raise a ValueError.
+
+    Asserts:
+        A ValueError is raised when every weighing is balanced.
+    """
+    gold_bar_weighing.weigh.return_value = '='
+    with pytest.raises(ValueError):
+        gold_bar_weighing.find_odd_bar(list(range(9)))
@@ -0,0 +1,160 @@
+import json
+import os
+import pytest
+from unittest.mock import MagicMock
+from ..app.batch import BatchRunner
+from ..app.goldbar import GoldBarWeighing
+from ..app.governor import ResourceGovernor, process_tree, read_stat
+from ..app.tabs import TabScheduler
+from ..app.web_driver_pool import WebDriverPool
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+SCENARIO = {"left_bar": [0, 1, 2], "right_bar": [3, 4, 5], "remaining": [6, 7, 8]}
+
+
+def write_stat(proc, pid, ppid, ticks, rss_pages, name="chrome"):
+    """
+    Writes a /proc/<pid>/stat file with the parent, CPU ticks and resident pages of a process.
+    """
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(ticks), "0"] + ["0"] * 8 + [str(rss_pages)] + ["0"] * 20
+    (proc / str(pid)).mkdir(exist_ok=True)
+    (proc / str(pid) / "stat").write_text(f"{pid} ({name}) {' '.join(fields)}\n")
+
+
+@pytest.fixture
+def proc(tmp_path):
+    """
+    A fake procfs: chromedriver 10 started Chrome 11, which started renderer 12. Process 20 is
+    unrelated.
+
+    Returns:
+        The path of the fake procfs.
+    """
+    write_stat(tmp_path, 10, 1, 100, 1000, "chromedriver")
+    write_stat(tmp_path, 11, 10, 200, 20000, "chrome")
+    write_stat(tmp_path, 12, 11, 300, 30000, "Web Content (renderer)")
+    write_stat(tmp_path, 20, 1, 999, 99999, "python")
+    return tmp_path
+
+
+def make_driver(pid=10):
+    driver = MagicMock()
+    driver.service.process.pid = pid
+    driver.execute_script.return_value = 1
+    return driver
+
+
+def test_process_tree(proc):
+    """
+    Test that the tree holds chromedriver and every process below it, and only those.
+    """
+    assert [stat.pid for stat in process_tree(10, str(proc))] == [10, 11, 12]
+    assert read_stat(12, str(proc)).rss_pages == 30000
+    assert process_tree(99, str(proc)) == []
+
+
+def test_real_process_tree():
+    """
+    Test that the running process can be read from the real procfs.
+    """
+    if not os.path.isdir("/proc/self"):
+        pytest.skip("No procfs")
+    tree = process_tree(os.getpid())
+    assert tree[0].pid == os.getpid() and tree[0].rss_pages > 0
+
+
+def test_sample_sums_the_tree(proc, tmp_path):
+    """
+    Test that a sample adds up the memory and CPU of the tree, and is written to the samples file.
+    """
+    samples = tmp_path / "resources.jsonl"
+    governor = ResourceGovernor(proc=str(proc), samples_path=str(samples))
+
+    sample = governor.sample(make_driver())
+
+    assert (sample.processes, sample.rss_bytes) == (3, 51000 * PAGE_SIZE)
+    assert sample.cpu_seconds == pytest.approx(600 / governor.tick)
+    assert json.loads(samples.read_text())["rss_bytes"] == 51000 * PAGE_SIZE
+    assert governor.sample(make_driver(pid=None)) is None
+
+
+def test_after_game_samples_every_n_games(proc):
+    """
+    Test that a driver is only sampled every `sample_every` games, and flagged over the memory limit.
+    """
+    governor = ResourceGovernor(sample_every=3, max_rss_mb=51000 * PAGE_SIZE / 1024 / 1024 - 1, proc=str(proc))
+    driver = make_driver()
+
+    assert [governor.after_game(driver) for _ in range(3)] == [False, False, True]
+    assert len(governor.samples) == 1
+    assert governor.summary()["recycled"] == {"rss": 1, "cpu": 0}
+
+
+def test_pool_recycles_driver_over_limit(proc):
+    """
+    Test that the pool replaces a driver whose browser is over the memory limit, between games.
+    """
+    governor = ResourceGovernor(sample_every=1, max_rss_mb=1, proc=str(proc))
+    factory = MagicMock(side_effect=lambda: make_driver())
+    pool = WebDriverPool("http://localhost/", size=1, max_uses=50, factory=factory, governor=governor)
+    pool.start()
+
+    with pool.checkout() as driver:
+        pass
+
+    assert driver.quit.called
+    assert pool.recycled == 1 and factory.call_count == 2
+    assert governor.games == {}
+
+
+def test_over_limit(proc):
+    """
+    Test that a driver is flagged only when its process tree is over a limit.
+    """
+    rss_mb = 51000 * PAGE_SIZE / 1024 / 1024
+
+    assert ResourceGovernor(max_rss_mb=rss_mb - 1, proc=str(proc)).over_limit(make_driver()) is True
+    assert ResourceGovernor(max_rss_mb=rss_mb + 1, proc=str(proc)).over_limit(make_driver()) is False
+    assert ResourceGovernor(max_rss_mb=1, proc=str(proc)).over_limit(make_driver(pid=None)) is False
+
+
+def test_batch_restarts_browser_over_limit(proc, tmp_path, game_driver):
+    """
+    Test that a batch quits a browser over the memory limit between games and goes on in a new one.
+    """
+    scenarios = tmp_path / "scenarios.jsonl"
+    scenarios.write_text("".join(json.dumps({"id": game, **SCENARIO}) + "\n" for game in range(3)))
+    first, second = game_driver(pid=10), game_driver(pid=10)
+    governor = ResourceGovernor(sample_every=2, max_rss_mb=1, proc=str(proc))
+
+    runner = BatchRunner(GoldBarWeighing(first), "http://localhost/", governor, factory=lambda: second)
+    summary = runner.run(str(scenarios), str(tmp_path / "results.jsonl"))
+
+    assert (summary["found"], summary["restarts"]) == (3, 1)
+    assert first.quit.called and first.get.call_count == 2
+    assert second.get.call_count == 1 and not second.quit.called
+
+
+def test_tabs_restart_browser_over_limit(proc, fake_browser):
+    """
+    Test that a browser over the memory limit gets no new tabs, and is replaced once its games end.
+    """
+    browsers = []
+
+    def launch():
+        browser = fake_browser([2, 6], delay=0)
+        browser.service = MagicMock()
+        browser.service.process.pid = 10
+        browser.quit = MagicMock()
+        browsers.append(browser)
+        return browser
+
+    governor = ResourceGovernor(sample_every=2, max_rss_mb=1, proc=str(proc))
+    scheduler = TabScheduler(launch(), "http://localhost/", tabs=2, poll_interval=0,
+                             governor=governor, factory=launch)
+
+    report = scheduler.run([SCENARIO] * 4)
+
+    assert (report["summary"]["found"], report["summary"]["restarts"]) == (4, 1)
+    assert len(browsers) == 2 and browsers[0].quit.called and not browsers[0].pages
+    assert scheduler.driver is browsers[1]
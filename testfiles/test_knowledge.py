@@ -0,0 +1,119 @@
+import time
+from unittest.mock import MagicMock
+import pytest
+from ..app import GoldBarWeighing, SimulatedScale
+from ..app.knowledge import WeighingKnowledge
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    ([0, 1], [2, 3], "<"),
+    ([1, 0], [3, 2], "<"),
+    ([2, 3], [0, 1], ">"),
+    ([3, 2], [1, 0], ">"),
+])
+def test_lookup_repeated_and_mirrored(left, right, expected):
+    """
+    Test that a weighing made before is answered in any bar order, flipped when mirrored.
+    """
+    knowledge = WeighingKnowledge()
+    knowledge.record([0, 1], [2, 3], "<")
+
+    assert knowledge.lookup(left, right) == expected
+    assert knowledge.stats() == {"weighed": 1, "cached": 1, "deduced": 0, "saved": 1}
+
+
+def test_lookup_unknown_weighing():
+    """
+    Test that a new weighing goes to the scale when the candidates give different results.
+    """
+    knowledge = WeighingKnowledge.lighter(range(9))
+
+    assert knowledge.lookup([0, 1, 2], [3, 4, 5]) is None
+    assert knowledge.saved() == 0
+
+
+def test_lookup_deduced_from_eliminated_candidates():
+    """
+    Test that bowls without any candidate balance, and that the last candidate decides a weighing.
+    """
+    knowledge = WeighingKnowledge.lighter(range(9))
+    knowledge.record([0, 1, 2], [3, 4, 5], "<")
+
+    assert knowledge.candidates == {(0, "lighter"), (1, "lighter"), (2, "lighter")}
+    assert knowledge.lookup([3], [4]) == "="
+    assert knowledge.lookup([6, 7], [8, 3]) == "="
+
+    knowledge.record([0], [1], ">")
+    assert knowledge.lookup([1], [2]) == "<"
+    assert knowledge.lookup([2], [1]) == ">"
+    assert (knowledge.deduced, knowledge.cached) == (3, 1)
+
+
+def test_lookup_either_direction():
+    """
+    Test that a bar that may be heavier or lighter is only deduced once its direction is known.
+    """
+    knowledge = WeighingKnowledge.either([0, 1, 2])
+    knowledge.record([0], [1], "=")
+
+    assert knowledge.candidates == {(2, "lighter"), (2, "heavier")}
+    assert knowledge.lookup([2], [0]) is None
+    assert knowledge.lookup([0], [1]) == "="
+
+    knowledge.record([2], [0], ">")
+    assert knowledge.lookup([0], [2]) == "<"
+
+
+def test_lookup_unequal_bowls_not_deduced():
+    """
+    Test that bowls of different sizes are not deduced, the bar counts decide them.
+    """
+    knowledge = WeighingKnowledge.lighter([0])
+
+    assert knowledge.lookup([1], [2, 3]) is None
+
+
+def test_weigh_known_skips_the_scale():
+    """
+    Test that GoldBarWeighing only weighs on the scale when the result is not known yet.
+    """
+    gb = GoldBarWeighing(logger=MagicMock())
+    gb.weigh = MagicMock(return_value="<")
+    gb.knowledge = WeighingKnowledge.lighter(range(6))
+
+    assert gb.weigh_known([0, 1], [2, 3]) == "<"
+    assert gb.weigh_known([3, 2], [1, 0]) == ">"
+    assert gb.weigh_known([4], [5]) == "="
+    assert gb.weigh.call_count == 1
+    assert gb.knowledge.saved() == 2
+
+
+def test_find_odd_bar_starts_new_knowledge():
+    """
+    Test that every game starts with its own knowledge, and still finds the fake bar.
+    """
+    scale = SimulatedScale(12, fake_bar=7, heavier=True)
+    gb = GoldBarWeighing(logger=MagicMock(), scale=scale)
+
+    assert gb.find_odd_bar(range(12)) == (7, "heavier")
+    first = gb.knowledge
+    assert first.weighed == len(scale.history)
+
+    scale.new_game(3)
+    assert gb.find_odd_bar(range(12)) == (3, "heavier")
+    assert gb.knowledge is not first
+
+
+def test_large_game_stays_fast():
+    """
+    Test that the knowledge adds little to a large game: each weighing checks the candidates
+    against sets, and large candidate sets are not deduced from.
+    """
+    n = 30000
+    scale = SimulatedScale(n, fake_bar=n - 5)
+    gb = GoldBarWeighing(logger=MagicMock(), scale=scale)
+    third = n // 3
+
+    start = time.perf_counter()
+    assert gb.find_fake_bar(list(range(third)), list(range(third, 2 * third)), list(range(2 * third, n))) == n - 5
+    assert time.perf_counter() - start < 1.0
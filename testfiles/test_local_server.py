@@ -0,0 +1,128 @@
+import json
+import re
+import pytest
+from urllib.request import Request, urlopen
+from ..app.local_server import LocalGameServer
+
+
+@pytest.fixture
+def server():
+    """
+    A local game server of 9 bars where bar 4 is fake.
+
+    Returns:
+        A running instance of the LocalGameServer class.
+    """
+    with LocalGameServer(bars=9, fake_bar=4) as game_server:
+        yield game_server
+
+
+def new_game(server):
+    """
+    Loads the page, which starts a game.
+
+    Returns:
+        The page and the ID of its game.
+    """
+    with urlopen(server.url) as response:
+        page = response.read().decode()
+    return page, int(re.search(r"const gameId = (\d+);", page).group(1))
+
+
+def post_weighing(server, game_id, left, right):
+    """
+    Sends a weighing to the server, as the page does.
+
+    Returns:
+        The decoded JSON response.
+    """
+    body = json.dumps({"game": game_id, "left": left, "right": right}).encode()
+    request = Request(server.url + "weigh", data=body, headers={"Content-Type": "application/json"})
+    with urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_page_keeps_dom_contract(server):
+    """
+    Test that the page has the grids, buttons and history the automation relies on.
+    """
+    page, _ = new_game(server)
+
+    for i in range(9):
+        assert f'id="left_{i}"' in page
+        assert f'id="right_{i}"' in page
+        assert f'id="coin_{i}"' in page
+    assert 'id="weigh"' in page
+    # The result comes before the reset button, both with the ID 'reset'
+    assert page.index('<button id="reset" disabled>') < page.index('<button id="reset" class="button">')
+    assert 'class="game-info"' in page
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    ([0, 1, 2], [3, 4, 5], ">"),
+    ([3, 4, 5], [0, 1, 2], "<"),
+    ([0, 1, 2], [6, 7, 8], "="),
+])
+def test_weigh(server, left, right, expected):
+    """
+    Test that the server weighs the bowls with a lighter fake bar.
+    """
+    _, game_id = new_game(server)
+
+    assert post_weighing(server, game_id, left, right) == {"result": expected}
+
+
+def test_weigh_heavier_fake_bar():
+    """
+    Test that a heavier fake bar tips its bowl down.
+    """
+    with LocalGameServer(bars=9, fake_bar=4, heavier=True) as game_server:
+        _, game_id = new_game(game_server)
+
+        assert post_weighing(game_server, game_id, [3, 4, 5], [0, 1, 2]) == {"result": ">"}
+
+
+def test_weigh_invalid_bars(server):
+    """
+    Test that duplicate or out of range bars are reported to the page.
+    """
+    _, game_id = new_game(server)
+
+    assert "error" in post_weighing(server, game_id, [0, 1], [1, 2])
+    assert "error" in post_weighing(server, game_id, [0], [9])
+
+
+@pytest.mark.parametrize("bar, found", [(4, True), (5, False)])
+def test_guess(server, bar, found):
+    """
+    Test that a guess tells whether the bar is the fake one.
+    """
+    _, game_id = new_game(server)
+
+    with urlopen(f"{server.url}guess?game={game_id}&bar={bar}") as response:
+        assert json.loads(response.read()) == {"found": found}
+
+
+def test_random_fake_bar_is_reproducible():
+    """
+    Test that games with a random fake bar repeat with the same seed.
+    """
+    first = LocalGameServer(bars=27, seed=7)
+    second = LocalGameServer(bars=27, seed=7)
+    try:
+        first_bars = [first.games[first.new_game()] for _ in range(5)]
+        second_bars = [second.games[second.new_game()] for _ in range(5)]
+    finally:
+        first.httpd.server_close()
+        second.httpd.server_close()
+
+    assert first_bars == second_bars
+    assert all(0 <= bar < 27 for bar in first_bars)
+
+
+def test_invalid_fake_bar():
+    """
+    Test that a fake bar outside the bars is rejected.
+    """
+    with pytest.raises(ValueError):
+        LocalGameServer(bars=9, fake_bar=9)
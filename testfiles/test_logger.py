@@ -0,0 +1,112 @@
+import json
+import os
+import pytest
+from ..app.logger import (configure_logging, dump_recent, game_logger, in_phase, log_phase,
+                          recent_events, shutdown_logging)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """
+    The application logger writing to a temporary file.
+
+    Returns:
+        The path of the log file.
+    """
+    path = tmp_path / "goldbar.log"
+    configure_logging(str(path), max_bytes=2000, backup_count=2, ring_size=5)
+    yield path
+    shutdown_logging()
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_records_are_json_with_game_and_phase(log_file):
+    """
+    Test that every record is written as JSON with its game ID and the phase it was logged in.
+    """
+    logger = game_logger(3)
+    with log_phase("weigh"):
+        logger.error("Some error occurred. %s", "boom")
+    logger.info("done")
+    shutdown_logging()
+
+    records = read_records(log_file)
+    assert [(record["message"], record["game_id"], record["phase"]) for record in records] == \
+           [("Some error occurred. boom", 3, "weigh"), ("done", 3, None)]
+    assert records[0]["level"] == "ERROR"
+
+
+def test_exception_is_structured(log_file):
+    """
+    Test that a traceback is kept in its own field, not in the message.
+    """
+    logger = game_logger(1)
+    try:
+        raise ValueError("bad bars")
+    except ValueError:
+        logger.exception("failed")
+    shutdown_logging()
+
+    record = read_records(log_file)[0]
+    assert record["message"] == "failed"
+    assert "ValueError: bad bars" in record["exception"]
+
+
+def test_in_phase_decorator():
+    """
+    Test that a decorated function logs in its phase, and the phase ends with the call.
+    """
+    @in_phase("validate")
+    def validate():
+        game_logger(2).warning("wrong bar")
+
+    with log_phase("solve"):
+        validate()
+        game_logger(2).info("next")
+
+    assert [event["phase"] for event in recent_events()[-2:]] == ["validate", "solve"]
+
+
+def test_file_is_rotated(log_file):
+    """
+    Test that the log file is rotated when it gets too large.
+    """
+    logger = game_logger(0)
+    for i in range(100):
+        logger.info("weighing %d", i)
+    shutdown_logging()
+
+    assert (log_file.parent / "goldbar.log.1").exists()
+    assert not (log_file.parent / "goldbar.log.3").exists()
+
+
+def test_recent_events_dumped(log_file, tmp_path):
+    """
+    Test that only the most recent records are kept, and they can be dumped on failure.
+    """
+    logger = game_logger(5)
+    for i in range(8):
+        logger.info("step %d", i)
+
+    path = dump_recent(str(tmp_path / "recent.jsonl"))
+
+    assert [record["message"] for record in read_records(tmp_path / "recent.jsonl")] == \
+           [f"step {i}" for i in range(3, 8)]
+    assert path.endswith("recent.jsonl")
+
+
+def test_recent_dumps_do_not_overwrite(log_file, tmp_path, monkeypatch):
+    """
+    Test that failed games dump the recent records to files of their own, named after the
+    process and the game.
+    """
+    monkeypatch.chdir(tmp_path)
+    game_logger(1).info("first")
+
+    paths = {dump_recent(game_id=1), dump_recent(game_id=2), dump_recent()}
+
+    assert len(paths) == 3
+    assert all(str(os.getpid()) in path and os.path.exists(path) for path in paths)
@@ -0,0 +1,93 @@
+import pytest
+from ..app.metrics import AdaptiveTimeout, LatencyWindow, PhaseTimer, percentile
+
+
+def test_percentile_interpolates():
+    """
+    Test that percentiles interpolate between the closest ranks.
+
+    Asserts:
+        The median of 1..4 is 2.5 and the extremes are the minimum and maximum.
+    """
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert percentile(values, 50) == pytest.approx(2.5)
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 4.0
+
+
+def test_percentile_empty():
+    """
+    Test that the percentile of no samples is 0.
+
+    Asserts:
+        0.0 is returned.
+    """
+    assert percentile([], 99) == 0.0
+
+
+def test_latency_window_keeps_recent_samples():
+    """
+    Test that the window drops the oldest samples.
+
+    Asserts:
+        Only the last 3 samples are kept.
+    """
+    window = LatencyWindow(size=3)
+    for seconds in [10.0, 1.0, 2.0, 3.0]:
+        window.add(seconds)
+    assert len(window) == 3
+    assert window.percentile(100) == 3.0
+
+
+def test_adaptive_timeout_initial():
+    """
+    Test that the initial timeout is used until enough latencies are observed.
+
+    Asserts:
+        The timeout stays at the initial value.
+    """
+    timeout = AdaptiveTimeout(initial=10.0, min_samples=5)
+    for _ in range(4):
+        timeout.record(0.2)
+    assert timeout.timeout() == 10.0
+
+
+def test_adaptive_timeout_follows_p99():
+    """
+    Test that the timeout is a multiple of the rolling p99 latency, within its limits.
+
+    Asserts:
+        The timeout adapts, and is clamped to the minimum and maximum.
+    """
+    timeout = AdaptiveTimeout(multiplier=4.0, minimum=0.5, maximum=30.0, min_samples=5)
+    for _ in range(5):
+        timeout.record(1.0)
+    assert timeout.timeout() == pytest.approx(4.0)
+
+    fast = AdaptiveTimeout(minimum=0.5, min_samples=1)
+    fast.record(0.01)
+    assert fast.timeout() == 0.5
+
+    slow = AdaptiveTimeout(maximum=30.0, min_samples=1)
+    slow.record(20.0)
+    assert slow.timeout() == 30.0
+
+
+def test_phase_timer_summary():
+    """
+    Test that the phase timer keeps a sample per block and skips failed blocks.
+
+    Asserts:
+        The successful samples are counted and summarized.
+    """
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.measure("get"):
+            pass
+    with pytest.raises(RuntimeError):
+        with timer.measure("get"):
+            raise RuntimeError("failed")
+
+    summary = timer.summary()
+    assert summary["get"]["samples"] == 3
+    assert 0 <= summary["get"]["p50"] <= summary["get"]["p99"]
@@ -0,0 +1,163 @@
+import pytest
+from ..app.planner import OddBarPlanner, PriorSearchPlanner, TernarySearchPlanner
+
+
+@pytest.fixture
+def planner():
+    """
+    A TernarySearchPlanner without a bowl capacity.
+
+    Returns:
+        An instance of the TernarySearchPlanner class.
+    """
+    return TernarySearchPlanner()
+
+
+def test_split_nine_bars(planner):
+    """
+    Test that 9 bars are split into three groups of 3.
+
+    Asserts:
+        The bars are split in order into equal thirds.
+    """
+    left, right, remaining = planner.split(list(range(9)))
+    assert left == [0, 1, 2]
+    assert right == [3, 4, 5]
+    assert remaining == [6, 7, 8]
+
+
+def test_split_odd_size(planner):
+    """
+    Test that 100 bars are split into near-equal thirds with equal bowls.
+
+    Asserts:
+        Both bowls hold 34 bars and the remaining group holds the rest.
+    """
+    left, right, remaining = planner.split(list(range(100)))
+    assert len(left) == len(right) == 34
+    assert len(remaining) == 32
+    assert sorted(left + right + remaining) == list(range(100))
+
+
+def test_split_two_bars(planner):
+    """
+    Test that 2 bars are weighed against each other.
+
+    Asserts:
+        One bar goes in each bowl and none remain.
+    """
+    assert planner.split([4, 7]) == ([4], [7], [])
+
+
+def test_split_single_bar(planner):
+    """
+    Test that splitting a single bar raises a ValueError.
+
+    Asserts:
+        A ValueError is raised because no weighing is needed.
+    """
+    with pytest.raises(ValueError):
+        planner.split([1])
+
+
+@pytest.mark.parametrize("n, expected", [(1, 0), (3, 1), (9, 2), (10, 3), (27, 3), (81, 4), (100, 5)])
+def test_max_weighings(planner, n, expected):
+    """
+    Test that the worst case number of weighings is ceil(log3 N).
+
+    Asserts:
+        The planner needs the optimal number of weighings.
+    """
+    assert planner.max_weighings(n) == expected
+
+
+def test_split_respects_bowl_capacity():
+    """
+    Test that the bowls never hold more bars than the bowl capacity.
+
+    Asserts:
+        With a capacity of 9, 81 bars are split into 9, 9 and 63 bars.
+    """
+    planner = TernarySearchPlanner(bowl_capacity=9)
+    left, right, remaining = planner.split(list(range(81)))
+    assert len(left) == len(right) == 9
+    assert len(remaining) == 63
+    assert planner.max_weighings(81) == 6
+
+
+def test_invalid_bowl_capacity():
+    """
+    Test that a bowl capacity below 1 raises a ValueError.
+
+    Asserts:
+        A ValueError is raised.
+    """
+    with pytest.raises(ValueError):
+        TernarySearchPlanner(bowl_capacity=0)
+
+
+@pytest.mark.parametrize("n, genuine, expected", [(3, (), 2), (12, (), 3), (13, (), 4), (13, (13,), 3), (39, (), 4)])
+def test_odd_min_weighings(n, genuine, expected):
+    """
+    Test the least number of weighings for a fake bar that may be heavier or lighter.
+
+    Asserts:
+        The planner reaches the information limit of 3^w answers.
+    """
+    state = OddBarPlanner.start(list(range(n)), genuine)
+    assert OddBarPlanner.min_weighings(state) == expected
+
+
+def test_odd_update_unbalanced():
+    """
+    Test that an unbalanced weighing marks the bars as possibly light or possibly heavy.
+
+    Asserts:
+        Bars on the lighter side can only be light, bars on the heavier side can only be heavy,
+        and bars off the scale are genuine.
+    """
+    state = OddBarPlanner.start(list(range(12)))
+    state = OddBarPlanner.update(state, [0, 1, 2, 3], [4, 5, 6, 7], '<')
+    assert state.unknown == []
+    assert state.light == [0, 1, 2, 3]
+    assert state.heavy == [4, 5, 6, 7]
+    assert state.genuine == [8, 9, 10, 11]
+
+
+def test_odd_update_unexpected_result():
+    """
+    Test that an unexpected result raises a ValueError.
+
+    Asserts:
+        A ValueError is raised due to the unexpected result.
+    """
+    state = OddBarPlanner.start(list(range(12)))
+    with pytest.raises(ValueError):
+        OddBarPlanner.update(state, [0], [1], '?')
+
+
+def test_prior_planner_singles_out_likely_bar():
+    """
+    Test that a bar that is far more likely than the others is singled out by the first weighing.
+
+    Asserts:
+        One outcome of the first weighing leaves only the likely bar, and the plan saves
+        weighings on average.
+    """
+    planner = PriorSearchPlanner([1, 1, 1, 1, 50, 1, 1, 1, 1], slack=1)
+
+    runs = planner.split(0, 9, planner.max_weighings)
+    assert planner.order[0] == 4 and (0, 1) in runs
+    assert planner.expected_weighings() < 2
+
+
+def test_prior_planner_limits():
+    """
+    Test that the plan keeps the uniform worst case, and rejects bad probabilities.
+    """
+    assert PriorSearchPlanner([1] * 27).max_weighings == 3
+    assert PriorSearchPlanner([1] * 27, bowl_capacity=4).limit(3) == 17
+    with pytest.raises(ValueError):
+        PriorSearchPlanner([0, 0, 0])
+    with pytest.raises(ValueError):
+        PriorSearchPlanner([1, -1, 1])
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from ..app import GoldBarWeighing
+from ..app.runner import ConcurrentGameRunner
+from ..app.web_driver_pool import WebDriverPool
+
+SCENARIO = {"left_bar": [0, 1, 2], "right_bar": [3, 4, 5], "remaining": [6, 7, 8]}
+
+
+def make_driver():
+    """
+    Creates a mocked driver that answers the health check.
+
+    Returns:
+        A MagicMock standing in for a Selenium WebDriver.
+    """
+    driver = MagicMock()
+    driver.execute_script.return_value = 1
+    return driver
+
+
+@pytest.fixture
+def runner():
+    """
+    A runner over a pool of 3 mocked drivers.
+
+    Returns:
+        An instance of the ConcurrentGameRunner class.
+    """
+    pool = WebDriverPool("http://localhost/", size=3, factory=make_driver)
+    pool.start()
+    return ConcurrentGameRunner(pool)
+
+
+def test_run_reports_throughput_and_latency(runner):
+    """
+    Test that the runner plays every game and summarizes the run.
+
+    Asserts:
+        Every game is played and found, and throughput and latency percentiles are reported.
+    """
+    with patch.object(GoldBarWeighing, 'reset'), \
+            patch.object(GoldBarWeighing, 'find_fake_bar', return_value=4), \
+            patch.object(GoldBarWeighing, 'validate_answer', return_value=True):
+        report = runner.run([SCENARIO] * 10)
+
+    summary = report["summary"]
+    assert summary["games"] == 10
+    assert summary["found"] == 10
+    assert summary["errors"] == 0
+    assert summary["games_per_second"] > 0
+    assert summary["latency_p50"] <= summary["latency_p95"] <= summary["latency_p99"]
+    assert [result["game"] for result in report["results"]] == list(range(10))
+
+
+def test_run_respects_concurrency(runner):
+    """
+    Test that no more games run at once than the concurrency limit, each on its own driver.
+
+    Asserts:
+        At most 3 games overlap and no driver is shared by two running games.
+    """
+    lock = threading.Lock()
+    running = set()
+    overlap = []
+
+    def find_fake_bar(self, left, right, remaining):
+        with lock:
+            assert id(self.driver) not in running
+            running.add(id(self.driver))
+            overlap.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.discard(id(self.driver))
+        return 0
+
+    with patch.object(GoldBarWeighing, 'reset'), \
+            patch.object(GoldBarWeighing, 'find_fake_bar', find_fake_bar), \
+            patch.object(GoldBarWeighing, 'validate_answer', return_value=True):
+        report = runner.run([SCENARIO] * 12)
+
+    assert report["summary"]["found"] == 12
+    assert max(overlap) <= 3
+
+
+def test_run_records_errors(runner, tmp_path, monkeypatch):
+    """
+    Test that a failing game is reported without stopping the other games.
+
+    Asserts:
+        The failing game has an error, its recent log records are dumped and the driver is recycled.
+    """
+    monkeypatch.chdir(tmp_path)
+    with patch.object(GoldBarWeighing, 'reset'), \
+            patch.object(GoldBarWeighing, 'find_fake_bar', side_effect=[ValueError("bad bars"), 1]), \
+            patch.object(GoldBarWeighing, 'validate_answer', return_value=True):
+        runner.concurrency = 1
+        report = runner.run([SCENARIO] * 2)
+
+    assert report["results"][0]["error"] == "bad bars"
+    with open(report["results"][0]["recent_events"]) as recent:
+        messages = [json.loads(line)["message"] for line in recent]
+    assert "Some error occurred while playing the game: bad bars" in messages
+    assert report["results"][1]["found"] is True
+    assert "recent_events" not in report["results"][1]
+    assert report["summary"]["errors"] == 1
+    assert runner.pool.recycled == 1
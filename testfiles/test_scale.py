@@ -0,0 +1,91 @@
+import pytest
+from ..app import GoldBarWeighing, Scale, SimulatedScale
+from ..app.scale import WeighingRecord, simulate
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    ([0, 1, 2], [3, 4, 5], "<"),
+    ([3, 4, 5], [0, 1, 2], ">"),
+    ([3, 4, 5], [6, 7, 8], "="),
+    ([1], [2, 3], "<"),
+])
+def test_simulated_scale_weigh(left, right, expected):
+    """
+    Test that the simulated scale weighs like the web page, with bar 0 lighter.
+    """
+    scale = SimulatedScale(9, fake_bar=0)
+
+    assert scale.weigh(left, right) == expected
+    assert scale.weighings() == [f"[{','.join(map(str, left))}] {expected} [{','.join(map(str, right))}]"]
+
+
+def test_simulated_scale_heavier():
+    """
+    Test that a heavier fake bar tips its bowl down.
+    """
+    scale = SimulatedScale(9, fake_bar=4, heavier=True)
+
+    assert scale.weigh([4], [5]) == ">"
+    assert scale.guess(4) is True
+    assert scale.guess(5) is False
+
+
+@pytest.mark.parametrize("left, right", [([0, 1], [1, 2]), ([0], [9]), ([0, 1, 2, 3], [4, 5, 6, 7])])
+def test_simulated_scale_invalid_bars(left, right):
+    """
+    Test that duplicate, out of range or too many bars are rejected.
+    """
+    scale = SimulatedScale(9, bowl_capacity=3)
+
+    with pytest.raises(ValueError):
+        scale.weigh(left, right)
+
+
+def test_gold_bar_weighing_is_a_scale():
+    """
+    Test that the Selenium GoldBarWeighing implements the Scale interface and weighs on itself.
+    """
+    gb = GoldBarWeighing()
+
+    assert isinstance(gb, Scale)
+    assert gb.scale is gb
+
+
+@pytest.mark.parametrize("fake_bar", range(27))
+def test_find_fake_bar_on_simulated_scale(fake_bar):
+    """
+    Test that the solver finds every fake bar among 27 without a browser.
+    """
+    scale = SimulatedScale(27, fake_bar=fake_bar)
+    gb = GoldBarWeighing(scale=scale)
+
+    found = gb.find_fake_bar(list(range(9)), list(range(9, 18)), list(range(18, 27)))
+
+    assert found == fake_bar
+    assert gb.validate_answer(found) is True
+    assert len(scale.weighings()) == 3
+
+
+def test_simulate():
+    """
+    Test that a simulation plays every position of the fake bar and solves them all.
+    """
+    report = simulate(100, rounds=2)
+
+    assert report["games"] == 200
+    assert report["solved"] == 200
+    assert report["max_weighings"] == 5
+    assert report["games_per_second"] > 0
+
+
+def test_weighing_records():
+    """
+    Test that weighings are kept as their bowls and result, and formatted like the page lists them.
+    """
+    scale = SimulatedScale(9, fake_bar=4)
+    scale.weigh([0, 1, 2], [3, 4, 5])
+    scale.weigh([3], [4])
+
+    records = scale.weighing_records()
+    assert records == [WeighingRecord([0, 1, 2], [3, 4, 5], ">"), WeighingRecord([3], [4], ">")]
+    assert scale.weighings() == ["[0,1,2] > [3,4,5]", "[3] > [4]"]
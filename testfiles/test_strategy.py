@@ -0,0 +1,230 @@
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from ..app import GoldBarWeighing
+from ..app.strategy import (PRIOR_MAX_BARS, StrategyCache, StrategyTable, compare_prior,
+                            compile_prior_strategy, compile_strategy, expected_weighings)
+
+
+def follow(table, fake_bar, direction='lighter'):
+    """
+    Follows a strategy against a scale with the given fake bar.
+
+    Returns:
+        The answer of the strategy and the number of weighings used.
+    """
+    delta = -1 if direction == 'lighter' else 1
+    node, weighings = 0, 0
+    weighing = table.weighing(node)
+    while weighing is not None:
+        left, right = weighing
+        left_weight = delta * left.count(fake_bar)
+        right_weight = delta * right.count(fake_bar)
+        result = '<' if left_weight < right_weight else '>' if left_weight > right_weight else '='
+        node = table.child(node, result)
+        weighings += 1
+        weighing = table.weighing(node)
+    return table.answer(node), weighings
+
+
+@pytest.mark.parametrize("n", [1, 2, 9, 27, 100])
+def test_compile_lighter_strategy(n):
+    """
+    Test that a compiled strategy finds every lighter fake bar.
+
+    Asserts:
+        Every answer is correct within the table's worst case number of weighings.
+    """
+    table = compile_strategy(n)
+    for fake_bar in range(n):
+        answer, weighings = follow(table, fake_bar)
+        assert answer == (fake_bar, 'lighter')
+        assert weighings <= table.max_weighings
+
+
+def test_compile_either_strategy():
+    """
+    Test that a compiled strategy for 12 bars finds every fake bar and its direction.
+
+    Asserts:
+        Every answer is correct and the worst case is 3 weighings.
+    """
+    table = compile_strategy(12, 'either')
+    assert table.max_weighings == 3
+    for fake_bar in range(12):
+        for direction in ('lighter', 'heavier'):
+            assert follow(table, fake_bar, direction)[0] == (fake_bar, direction)
+
+
+def test_save_and_load(tmp_path):
+    """
+    Test that a saved strategy is memory-mapped back with the same decisions.
+
+    Asserts:
+        The loaded table matches the compiled one.
+    """
+    path = str(tmp_path / "lighter.gbst")
+    table = compile_strategy(27, 'lighter', bowl_capacity=9)
+    table.save(path)
+
+    loaded = StrategyTable.load(path)
+    assert loaded.to_bytes() == table.to_bytes()
+    assert loaded.n == 27
+    assert loaded.bowl_capacity == 9
+    assert loaded.weighing(0) == table.weighing(0)
+    loaded.close()
+
+
+def test_load_other_version(tmp_path):
+    """
+    Test that a file that is not a strategy of this version is rejected.
+
+    Asserts:
+        A ValueError is raised.
+    """
+    path = tmp_path / "old.gbst"
+    path.write_bytes(b"GBST" + b"\x00" * 40)
+    with pytest.raises(ValueError):
+        StrategyTable.load(str(path))
+
+
+def test_child_impossible_result():
+    """
+    Test that a result which no fake bar can produce raises a ValueError.
+
+    Asserts:
+        '=' is impossible when 2 bars are weighed against each other.
+    """
+    table = compile_strategy(2)
+    with pytest.raises(ValueError):
+        table.child(0, '=')
+
+
+def test_cache_compiles_once(tmp_path):
+    """
+    Test that the cache stores a compiled strategy and reuses the file later.
+
+    Asserts:
+        The second cache loads the file instead of compiling again.
+    """
+    StrategyCache(str(tmp_path)).get(12, 'either')
+    cache = StrategyCache(str(tmp_path))
+    assert os.path.exists(cache.path(12, 'either', None))
+
+    with patch(f'{StrategyCache.__module__}.compile_strategy') as mock_compile:
+        table = cache.get(12, 'either')
+        mock_compile.assert_not_called()
+    assert table.max_weighings == 3
+    cache.close()
+
+
+def test_cache_replaces_corrupt_file(tmp_path):
+    """
+    Test that the cache recompiles a strategy when the stored file can not be read.
+
+    Asserts:
+        The corrupt file is replaced by a valid strategy.
+    """
+    cache = StrategyCache(str(tmp_path))
+    path = cache.path(9, 'lighter', None)
+    with open(path, "wb") as strategy_file:
+        strategy_file.write(b"corrupt")
+
+    assert cache.get(9).max_weighings == 2
+    assert StrategyTable.load(path).n == 9
+
+
+def test_gold_bar_weighing_uses_cache(tmp_path):
+    """
+    Test that GoldBarWeighing follows strategies from its cache.
+
+    Asserts:
+        The strategy file is written and the fake bar is found.
+    """
+    with patch('selenium.webdriver.Chrome') as MockWebDriver:
+        cache = StrategyCache(str(tmp_path))
+        gb = GoldBarWeighing(MockWebDriver(), strategy_cache=cache)
+    gb.weigh = MagicMock(side_effect=['<', '>'])
+
+    assert gb.find_fake_bar([0, 1, 2], [3, 4, 5], [6, 7, 8]) == 1
+    assert os.path.exists(cache.path(3, 'lighter', None))
+
+
+@pytest.mark.parametrize("weights, capacity", [([5, 1, 1, 1, 1, 1, 1, 1, 1], None),
+                                               ([1] * 20 + [40] * 3 + [0] * 4, 4),
+                                               ([1], None)])
+def test_compile_prior_strategy(weights, capacity):
+    """
+    Test that a prior-aware strategy finds every lighter fake bar, even ones the prior rules out.
+
+    Asserts:
+        Every answer is correct, within the worst case of the uniform strategy.
+    """
+    table = compile_prior_strategy(weights, capacity)
+    uniform = compile_strategy(len(weights), bowl_capacity=capacity)
+    for fake_bar in range(len(weights)):
+        answer, weighings = follow(table, fake_bar)
+        assert answer == (fake_bar, 'lighter')
+        assert weighings <= uniform.max_weighings
+
+
+def test_compare_prior():
+    """
+    Test that the prior-aware strategy never takes more weighings on average than the uniform one,
+    and saves weighings on a skewed prior when the worst case may grow.
+    """
+    uniform = compare_prior([1] * 9)
+    assert uniform["expected_weighings"] == pytest.approx(uniform["uniform_expected_weighings"])
+
+    skewed = compare_prior([30, 20, 10] + [1] * 24, bowl_capacity=4)
+    assert skewed["saved_per_game"] > 1
+    assert skewed["max_weighings"] <= skewed["uniform_max_weighings"]
+
+    slack = compare_prior([50] + [1] * 8, slack=1)
+    assert slack["max_weighings"] == 3 and slack["expected_weighings"] < 1.5
+    assert expected_weighings(compile_strategy(9), [1] * 9) == pytest.approx(2)
+
+
+def test_gold_bar_weighing_uses_prior():
+    """
+    Test that with a prior the suspected bars are searched by it, and every fake bar is still found.
+    """
+    from ..app.scale import SimulatedScale
+
+    scale = SimulatedScale(9)
+    gb = GoldBarWeighing(scale=scale, prior=[1, 1, 1, 1, 1, 1, 50, 1, 1], prior_slack=1)
+    for fake_bar in range(9):
+        scale.new_game(fake_bar)
+        assert gb.find_fake_bar([0, 1, 2], [3, 4, 5], [6, 7, 8]) == fake_bar
+    scale.new_game(6)
+    gb.find_fake_bar([0, 1, 2], [3, 4, 5], [6, 7, 8])
+    assert len(scale.history) == 2
+    assert list(gb.prior_strategies) == [(0, 1, 2), (3, 4, 5), (6, 7, 8)]
+
+
+def test_large_prior_falls_back_to_uniform():
+    """
+    Test that more bars than PRIOR_MAX_BARS get the uniform strategy instead of a slow plan.
+    """
+    n = PRIOR_MAX_BARS * 4
+    table = compile_prior_strategy([1000] + [1] * (n - 1))
+
+    assert table.to_bytes() == compile_strategy(n).to_bytes()
+
+
+def test_cache_stores_prior_strategy(tmp_path):
+    """
+    Test that a prior-aware strategy is compiled once, stored, and loaded by a new cache,
+    and that another prior gets another file.
+    """
+    weights = [5, 1, 1, 1, 1, 1, 1, 1, 1]
+    table = StrategyCache(str(tmp_path)).get_prior(weights, slack=1)
+    assert len(os.listdir(tmp_path)) == 1
+
+    with patch('package.app.strategy.compile_prior_strategy') as compile_mock:
+        loaded = StrategyCache(str(tmp_path)).get_prior([10, 2, 2, 2, 2, 2, 2, 2, 2], slack=1)
+    compile_mock.assert_not_called()
+    assert loaded.to_bytes() == table.to_bytes()
+
+    StrategyCache(str(tmp_path)).get_prior(weights[::-1], slack=1)
+    assert len(os.listdir(tmp_path)) == 2
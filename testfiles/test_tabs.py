@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchWindowException
+from ..app.goldbar import GoldBarWeighing
+from ..app.tabs import TabScheduler
+
+SCENARIO = {"left_bar": [0, 1, 2], "right_bar": [3, 4, 5], "remaining": [6, 7, 8]}
+
+
+def test_games_share_one_browser(fake_browser):
+    """
+    Test that every game is found in its own tab, and at most `tabs` tabs are open at once.
+
+    Asserts:
+        Every fake bar found and every tab closed.
+    """
+    browser = fake_browser([8, 0, 4, 2, 6])
+
+    report = TabScheduler(browser, "http://localhost/", tabs=2, poll_interval=0).run([SCENARIO] * 5)
+
+    assert [result["fake_bar"] for result in report["results"]] == [8, 0, 4, 2, 6]
+    assert report["summary"]["found"] == 5 and report["summary"]["errors"] == 0
+    assert browser.pages == {}
+    assert browser.handles == 5 and browser.most_open == 2
+    assert browser.current == "home"
+
+
+def test_failed_tab_opening_fails_only_its_game(fake_browser):
+    """
+    Test that a tab that can not be opened fails its game, and the other games still run.
+    """
+    browser = fake_browser([8, 0])
+    new_window = browser.new_window
+    opened = []
+
+    def open_or_fail(kind):
+        if not opened:
+            opened.append(kind)
+            raise NoSuchWindowException("The browser could not open a tab")
+        new_window(kind)
+
+    browser.switch_to.new_window.side_effect = open_or_fail
+    report = TabScheduler(browser, "http://localhost/", tabs=1, poll_interval=0).run([SCENARIO] * 3)
+
+    assert [result["error"] is not None for result in report["results"]] == [True, False, False]
+    assert [result["fake_bar"] for result in report["results"][1:]] == [8, 0]
+
+
+def test_weighings_overlap_across_tabs(fake_browser):
+    """
+    Test that a tab starts its weighing while the weighing of another tab is pending.
+    """
+    browser = fake_browser([8, 0, 4])
+
+    TabScheduler(browser, "http://localhost/", tabs=3, poll_interval=0).run([SCENARIO] * 3)
+
+    first_result = browser.log.index(next(entry for entry in browser.log if entry[0] == "result"))
+    assert {tab for kind, tab in browser.log[:first_result] if kind == "start"} == {"tab1", "tab2", "tab3"}
+
+
+def test_timed_out_weighing_fails_the_game(fake_browser):
+    """
+    Test that a weighing that never finishes fails its game and its tab is closed.
+    """
+    browser = fake_browser([8, 0], delay=10 ** 9)
+    scheduler = TabScheduler(browser, "http://localhost/", tabs=2, poll_interval=0, weigh_timeout=0.05)
+
+    report = scheduler.run([SCENARIO] * 2)
+
+    assert report["summary"]["errors"] == 2
+    assert all("did not finish" in result["error"] for result in report["results"])
+    assert browser.pages == {}
+
+
+def test_fake_bar_steps_match_find_fake_bar():
+    """
+    Test that the solver steps yield the weighings find_fake_bar makes, and return its answer.
+    """
+    gb = GoldBarWeighing(MagicMock())
+    steps = gb.fake_bar_steps([0, 1, 2], [3, 4, 5], [6, 7, 8])
+
+    assert next(steps) == ([0, 1, 2], [3, 4, 5])
+    left, right = steps.send("=")
+    assert len(left) == len(right) == 1 and set(left + right) < {6, 7, 8}
+    with pytest.raises(StopIteration) as stop:
+        steps.send(">")
+    assert stop.value.value == right[0]
+
+
+def test_tabs_must_be_positive():
+    """
+    Test that a scheduler needs at least one tab.
+    """
+    with pytest.raises(ValueError):
+        TabScheduler(MagicMock(), "http://localhost/", tabs=0)
@@ -0,0 +1,107 @@
+import json
+import pytest
+from unittest.mock import patch
+from selenium.common.exceptions import TimeoutException
+from ..app import GoldBarWeighing
+from ..app.tracing import WEBUTILS_METHODS, Tracer
+from ..app.web_driver_utilities import WebDriverUtility
+
+
+@pytest.fixture
+def gold_bar_weighing():
+    """
+    A GoldBarWeighing on a mocked driver whose script calls go through `execute`, like Selenium.
+
+    Returns:
+        An instance of the GoldBarWeighing class equipped with a mocked WebDriver.
+    """
+    with patch('selenium.webdriver.Chrome') as MockWebDriver:
+        driver = MockWebDriver()
+
+        def execute_async_script(script, *args):
+            driver.execute("executeAsyncScript", {"script": script, "args": list(args)})
+            return {'matched': True, 'text': '<', 'elapsed': 5.0}
+
+        def execute_script(script, *args):
+            driver.execute("executeScript", {"script": script, "args": list(args)})
+            return []
+
+        driver.execute_async_script.side_effect = execute_async_script
+        driver.execute_script.side_effect = execute_script
+        driver.find_element.return_value.text = '<'
+        return GoldBarWeighing(driver)
+
+
+def spans(tracer, name):
+    return [event for event in tracer.events if event["name"] == name]
+
+
+def contains(outer, inner):
+    return outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_weigh_has_nested_spans(gold_bar_weighing):
+    """
+    Test that the WebDriver commands of a weighing are nested in its utility and weigh spans.
+
+    Asserts:
+        The script commands fall inside the wait span, which falls inside the weigh span.
+    """
+    tracer = Tracer()
+    tracer.instrument(gold_bar_weighing)
+
+    assert gold_bar_weighing.weigh([0, 1, 2], [3, 4, 5]) == '<'
+
+    weigh, = spans(tracer, "GoldBarWeighing.weigh")
+    wait, = spans(tracer, "WebDriverUtility.wait_for_condition")
+    commands = spans(tracer, "executeAsyncScript")
+    assert weigh["args"]["result"] == "'<'" and weigh["args"]["outcome"] == "ok"
+    assert wait["args"]["locator"] == "div.game-info ol li:nth-child(1)"
+    assert contains(weigh, wait)
+    assert commands and all(contains(wait, command) for command in commands)
+    assert len(spans(tracer, "GoldBarWeighing.enter_bars_on_bowl")) == 2
+    assert all(event["ph"] == "X" for event in tracer.events)
+
+
+def test_span_records_error(gold_bar_weighing):
+    """
+    Test that a failing call is recorded with its error.
+    """
+    tracer = Tracer()
+    tracer.instrument(gold_bar_weighing)
+    gold_bar_weighing.driver.execute_async_script.side_effect = None
+    gold_bar_weighing.driver.execute_async_script.return_value = {'matched': False, 'elapsed': 5.0}
+
+    with pytest.raises(TimeoutException):
+        gold_bar_weighing.weigh([0], [1])
+
+    weigh, = spans(tracer, "GoldBarWeighing.weigh")
+    assert weigh["args"]["outcome"] == "error: TimeoutException"
+
+
+def test_restore_and_save(gold_bar_weighing, tmp_path):
+    """
+    Test that the trace is written as trace-event JSON, and nothing is traced after a restore.
+    """
+    tracer = Tracer()
+    tracer.instrument(gold_bar_weighing)
+    gold_bar_weighing.reset()
+    tracer.restore()
+    gold_bar_weighing.reset()
+
+    path = tmp_path / "trace.json"
+    tracer.save(str(path))
+    trace = json.loads(path.read_text())
+    assert [event["name"] for event in trace["traceEvents"]].count("GoldBarWeighing.reset") == 1
+    assert gold_bar_weighing.reset.__func__ is GoldBarWeighing.reset
+
+
+def test_every_browser_method_is_traced():
+    """
+    Test that every public method of WebDriverUtility gets a span, besides its own bookkeeping.
+    """
+    bookkeeping = {"invalidate_cache", "cache_stats", "timeout_for"}
+    public = {name for name, value in vars(WebDriverUtility).items()
+              if callable(value) and not name.startswith("_")}
+
+    assert public - bookkeeping == set(WEBUTILS_METHODS)
@@ -73,4 +73,28 @@ def test_valid_bar_values_not_between_0_8(gold_bar_weighing):
 
     assert gold_bar_weighing.valid_bar_values(left, right, remaining) == expected
 
+def test_valid_bar_values_twenty_seven_bars(gold_bar_weighing):
+    """
+    Test that valid_bar_values accepts groups of any size for N bars
+
+    Asserts:
+        27 bars split into groups of 9 are valid.
+    """
+    left = list(range(9))
+    right = list(range(9, 18))
+    remaining = list(range(18, 27))
+
+    assert gold_bar_weighing.valid_bar_values(left, right, remaining) is True
+
+def test_valid_bar_values_over_bowl_capacity(gold_bar_weighing):
+    """
+    Test that valid_bar_values correctly returns False when a bowl holds more bars than its capacity
+
+    Asserts:
+        10 bars in a bowl with a capacity of 9 are not valid.
+    """
+    left = list(range(10))
+    right = list(range(10, 20))
+    remaining = [20]
 
+    assert gold_bar_weighing.valid_bar_values(left, right, remaining, bowl_capacity=9) is False
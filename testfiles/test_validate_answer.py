@@ -1,7 +1,10 @@
 import pytest
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (NoSuchElementException, TimeoutException,
+                                        UnexpectedAlertPresentException)
 from unittest.mock import MagicMock, patch
 from ..app import GoldBarWeighing
+from ..app.scale import WeighingRecord
+from ..app.web_driver_utilities import CLICK_AND_CAPTURE_ALERT_SCRIPT, WEIGHING_RECORDS_SCRIPT
 
 
 @pytest.fixture
@@ -25,11 +28,15 @@ def test_validate_answer_correct(gold_bar_weighing):
 
     Asserts:
         - The method returns True for correct fake bar identification.
-        - The alert is accepted once as expected.
+        - The click and the alert take one script call, and no native alert is left to accept.
     """
-    gold_bar_weighing.driver.switch_to.alert.text = "Yay! You find it!"
+    driver = gold_bar_weighing.driver
+    driver.execute_async_script.return_value = {"message": "Yay! You find it!", "elapsed": 3.0}
+
     assert gold_bar_weighing.validate_answer(3) is True
-    gold_bar_weighing.driver.switch_to.alert.accept.assert_called_once()
+    driver.execute_async_script.assert_called_once()
+    assert driver.execute_async_script.call_args[0][:2] == (CLICK_AND_CAPTURE_ALERT_SCRIPT, "coin_3")
+    driver.switch_to.alert.accept.assert_not_called()
 
 
 def test_validate_answer_incorrect(gold_bar_weighing):
@@ -38,9 +45,62 @@ def test_validate_answer_incorrect(gold_bar_weighing):
 
     Asserts:
         - The method returns False for incorrect fake bar identification.
-        - The alert is accepted once as expected.
     """
+    gold_bar_weighing.driver.execute_async_script.return_value = {"message": "Oops Try again!", "elapsed": 3.0}
 
-    gold_bar_weighing.driver.switch_to.alert.text = "Oops Try again!"
     assert gold_bar_weighing.validate_answer(3) is False
-    gold_bar_weighing.driver.switch_to.alert.accept.assert_called_once()
+
+
+def test_validate_answer_native_alert(gold_bar_weighing):
+    """
+    Test that an alert the page opened natively is still read and accepted.
+
+    Asserts:
+        - The method returns True and the alert is accepted once.
+    """
+    driver = gold_bar_weighing.driver
+    driver.execute_async_script.side_effect = UnexpectedAlertPresentException()
+    driver.switch_to.alert.text = "Yay! You find it!"
+
+    assert gold_bar_weighing.validate_answer(3) is True
+    driver.switch_to.alert.accept.assert_called_once()
+
+
+def test_guess_missing_button(gold_bar_weighing):
+    """
+    Test that guessing a bar without a button raises NoSuchElementException.
+    """
+    gold_bar_weighing.driver.execute_async_script.return_value = {"error": "missing", "elapsed": 0.1}
+
+    with pytest.raises(NoSuchElementException):
+        gold_bar_weighing.guess(30)
+
+
+def test_guess_without_alert(gold_bar_weighing):
+    """
+    Test that a click that opens no alert times out.
+    """
+    gold_bar_weighing.driver.execute_async_script.return_value = {"error": "timeout", "elapsed": 1000.0}
+
+    with pytest.raises(TimeoutException):
+        gold_bar_weighing.guess(3)
+
+
+def test_weighing_history_in_one_call(gold_bar_weighing):
+    """
+    Test that the whole weighing history is read in one script call, split into records by the
+    page, and that an entry that is not a weighing is rejected.
+    """
+    driver = gold_bar_weighing.driver
+    driver.execute_script.return_value = [{"left": [0, 1, 2], "right": [3, 4, 5], "result": "<"},
+                                          {"left": [0], "right": [1], "result": "="}]
+
+    assert gold_bar_weighing.weighing_records() == [WeighingRecord([0, 1, 2], [3, 4, 5], "<"),
+                                                    WeighingRecord([0], [1], "=")]
+    assert gold_bar_weighing.weighings() == ["[0,1,2] < [3,4,5]", "[0] = [1]"]
+    assert all(call[0][0] == WEIGHING_RECORDS_SCRIPT for call in driver.execute_script.call_args_list)
+    driver.find_elements.assert_not_called()
+
+    driver.execute_script.return_value = [None]
+    with pytest.raises(ValueError):
+        gold_bar_weighing.weighing_records()
@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import patch
+from ..app import GoldBarWeighing, SimulatedScale, TernarySearchPlanner
+from ..app.strategy import VARIANT_LIGHTER, StrategyCache, compile_strategy
+
+pytest.importorskip("numpy")
+from ..app.verify import play_table, simulate_partition, verify
+
+
+def broken_split(size):
+    """
+    Makes a TernarySearchPlanner.split that drops the last bar of every group of the given size.
+    """
+    split = TernarySearchPlanner.split
+
+    def split_dropping(planner, bars):
+        left, right, remaining = split(planner, bars)
+        return (left, right, remaining[:-1]) if len(bars) == size else (left, right, remaining)
+
+    return split_dropping
+
+
+@pytest.mark.parametrize("n, bowl_capacity", [(9, None), (28, None), (50, 3), (100, 9)])
+def test_simulate_partition_matches_solver(n, bowl_capacity):
+    """
+    Test that the batched games give the same weighings as find_fake_bar on a simulated scale.
+    """
+    partitions = min(n // 2, bowl_capacity) if bowl_capacity else n // 2
+    for k in range(1, partitions + 1):
+        scale = SimulatedScale(n, bowl_capacity=bowl_capacity)
+        gb = GoldBarWeighing(bowl_capacity=bowl_capacity, scale=scale)
+        weighings = []
+        for fake_bar in range(n):
+            scale.new_game(fake_bar)
+            gb.find_fake_bar(list(range(k)), list(range(k, 2 * k)), list(range(2 * k, n)))
+            weighings.append(len(scale.history))
+
+        report = simulate_partition(n, k, bowl_capacity, gb)
+
+        assert report["correct"] is True
+        assert report["worst_weighings"] == max(weighings)
+        assert report["total_weighings"] == sum(weighings)
+
+
+@pytest.mark.parametrize("bowl_capacity", [None, 1, 2, 9])
+def test_played_tables_match_planner(bowl_capacity):
+    """
+    Test that every compiled strategy finds every fake bar, within the planner's worst case.
+    """
+    planner = TernarySearchPlanner(bowl_capacity)
+
+    for n in range(1, 200):
+        weighings, found = play_table(compile_strategy(n, VARIANT_LIGHTER, bowl_capacity))
+
+        assert found.tolist() == list(range(n))
+        assert int(weighings.max()) == planner.max_weighings(n)
+
+
+def test_verify_every_partition():
+    """
+    Test that every group left by a first weighing of 27 bars is played and found correct.
+    """
+    report = verify(27)
+
+    assert report["correct"] is True
+    assert report["partitions"] == report["partitions_checked"] == 13
+    assert report["groups"] == report["groups_played"] == 19
+    assert report["positions_played"] == sum(range(1, 14)) + sum(range(15, 26, 2))
+    assert report["planner_partition"] == 9
+    assert report["planner_worst_weighings"] == 3
+    assert report["worst_weighings"] == 4
+
+
+def test_verify_with_bowl_capacity():
+    """
+    Test that many bars with a small bowl capacity are verified within the position limit.
+    """
+    planner = TernarySearchPlanner(9)
+
+    report = verify(3000, bowl_capacity=9, max_positions=10 ** 4)
+
+    assert report["correct"] is True
+    assert report["positions_played"] <= 10 ** 4
+    assert report["planner_worst_weighings"] == 1 + planner.max_weighings(3000 - 18)
+
+
+def test_verify_reads_the_strategy_files(tmp_path):
+    """
+    Test that the compiled strategy files are checked, and a wrong one is caught.
+    """
+    assert verify(27, strategy_cache=StrategyCache(str(tmp_path)))["correct"] is True
+
+    cache = StrategyCache(str(tmp_path))
+    with patch.object(TernarySearchPlanner, "split", broken_split(9)):
+        compile_strategy(9).save(cache.path(9, VARIANT_LIGHTER, None))
+    report = verify(27, strategy_cache=cache)
+
+    assert report["correct"] is False
+    assert report["failures"] == 1
+
+
+def test_verify_reads_the_planner():
+    """
+    Test that a planner splitting some group wrong is caught in the strategies it compiles.
+    """
+    with patch.object(TernarySearchPlanner, "split", broken_split(40)):
+        report = verify(120, max_positions=120)
+
+    assert report["planner_partition"] == 40
+    assert report["failures"] >= 1
+    assert report["correct"] is False
@@ -0,0 +1,162 @@
+import pytest
+from unittest.mock import MagicMock
+from ..app.web_driver_pool import WebDriverPool
+
+URL = "http://localhost/"
+
+
+def make_driver():
+    """
+    Creates a mocked driver that answers the health check.
+
+    Returns:
+        A MagicMock standing in for a Selenium WebDriver.
+    """
+    driver = MagicMock()
+    driver.execute_script.return_value = 1
+    return driver
+
+
+@pytest.fixture
+def pool():
+    """
+    A started pool of 2 mocked drivers.
+
+    Returns:
+        An instance of the WebDriverPool class.
+    """
+    factory = MagicMock(side_effect=lambda: make_driver())
+    pool = WebDriverPool(URL, size=2, max_uses=3, factory=factory)
+    pool.start()
+    return pool
+
+
+def test_start_launches_and_navigates(pool):
+    """
+    Test that starting the pool launches every driver and opens the game page.
+
+    Asserts:
+        2 drivers are launched, each on the game page.
+    """
+    assert pool.factory.call_count == 2
+    assert pool.idle.qsize() == 2
+    for driver in list(pool.idle.queue):
+        driver.get.assert_called_once_with(URL)
+
+
+def test_checkout_reuses_driver(pool):
+    """
+    Test that back-to-back checkouts reuse warm drivers.
+
+    Asserts:
+        No new driver is launched and the page is reloaded after each game.
+    """
+    with pool.checkout() as driver:
+        pass
+    assert pool.factory.call_count == 2
+    assert driver.get.call_count == 2
+    driver.quit.assert_not_called()
+
+
+def test_recycle_after_max_uses():
+    """
+    Test that a driver is replaced after max_uses games.
+
+    Asserts:
+        The worn driver is quit and a new one launched.
+    """
+    pool = WebDriverPool(URL, size=1, max_uses=3, factory=MagicMock(side_effect=make_driver))
+    pool.start()
+    first = pool.acquire()
+    pool.release(first)
+    for _ in range(2):
+        assert pool.acquire() is first
+        pool.release(first)
+
+    first.quit.assert_called_once()
+    assert pool.acquire() is not first
+    assert pool.recycled == 1
+    assert pool.launched == 1
+
+
+def test_recycle_on_error(pool):
+    """
+    Test that a driver whose game failed is replaced.
+
+    Asserts:
+        The error is raised, the driver is quit and a new one launched.
+    """
+    with pytest.raises(RuntimeError):
+        with pool.checkout() as driver:
+            raise RuntimeError("game failed")
+
+    driver.quit.assert_called_once()
+    assert pool.factory.call_count == 3
+    assert pool.idle.qsize() == 2
+
+
+def test_health_check_replaces_dead_driver(pool):
+    """
+    Test that a driver that fails the health check is not handed out.
+
+    Asserts:
+        A fresh driver is returned instead of the dead one.
+    """
+    dead = pool.idle.queue[0]
+    dead.execute_script.side_effect = Exception("browser gone")
+
+    driver = pool.acquire()
+
+    assert driver is not dead
+    dead.quit.assert_called_once()
+    assert pool.launched == 2
+
+
+def test_health_check_at_capacity_keeps_the_slot():
+    """
+    Test that a driver replaced after a failed health check keeps its slot while it is quit,
+    so a concurrent checkout of a full pool cannot launch another driver.
+
+    Asserts:
+        The concurrent reservation is refused, and the pool never holds more than its size.
+    """
+    factory = MagicMock(side_effect=lambda: make_driver())
+    pool = WebDriverPool(URL, size=1, factory=factory)
+    pool.start()
+    dead = pool.idle.queue[0]
+    dead.execute_script.side_effect = Exception("browser gone")
+    concurrent = []
+    dead.quit.side_effect = lambda: concurrent.append(pool._reserve())
+
+    driver = pool.acquire()
+
+    assert driver is not dead
+    assert concurrent == [False]
+    assert pool.launched == 1 and factory.call_count == 2
+
+
+def test_close_quits_idle_drivers(pool):
+    """
+    Test that closing the pool quits the idle drivers and refuses checkouts.
+
+    Asserts:
+        Every driver is quit and acquire raises a RuntimeError.
+    """
+    drivers = list(pool.idle.queue)
+    pool.close()
+
+    for driver in drivers:
+        driver.quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_invalid_size():
+    """
+    Test that a pool size below 1 raises a ValueError.
+
+    Asserts:
+        A ValueError is raised.
+    """
+    with pytest.raises(ValueError):
+        WebDriverPool(URL, size=0)
@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import MagicMock, patch
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from unittest.mock import MagicMock, PropertyMock, patch
+from selenium.common.exceptions import (NoAlertPresentException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException)
 from ..app import WebDriverUtility  
 from selenium.webdriver.common.by import By
 
@@ -72,7 +73,7 @@ def test_get_text_not_found(web_driver_utility):
 
 def test_wait_for_element_timeout(web_driver_utility):
     """Test waiting for an element where the element does not meet expected conditions."""
-    web_driver_utility.driver.find_element.side_effect = TimeoutException()
+    web_driver_utility.driver.execute_async_script.return_value = {'matched': False, 'elapsed': 10000.0}
 
     with pytest.raises(TimeoutException):
         web_driver_utility.wait_for_element("wait-element", ["valid", "values"])
@@ -131,3 +132,130 @@ def test_get_elements_by_css_not_found(web_driver_utility):
 
     with pytest.raises(NoSuchElementException):
         web_driver_utility.get_elements_by_css(".nonexistent-class")
+
+
+def test_set_texts_single_script(web_driver_utility):
+    """
+    Test setting text in many input fields with a single script call.
+    """
+    web_driver_utility.driver.execute_script.return_value = []
+
+    web_driver_utility.set_texts({"left_0": "1", "left_1": "2"})
+
+    web_driver_utility.driver.execute_script.assert_called_once()
+    assert web_driver_utility.driver.execute_script.call_args.args[1] == {"left_0": "1", "left_1": "2"}
+    web_driver_utility.driver.find_element.assert_not_called()
+
+
+def test_set_texts_fallback_not_found(web_driver_utility):
+    """
+    Test that a field missing from the page raises NoSuchElementException in the fallback.
+    """
+    web_driver_utility.driver.execute_script.return_value = ["left_9"]
+    web_driver_utility.driver.find_element.side_effect = NoSuchElementException()
+
+    with pytest.raises(NoSuchElementException):
+        web_driver_utility.set_texts({"left_9": "1"})
+
+
+def test_set_texts_empty(web_driver_utility):
+    """
+    Test that no script runs when there is nothing to set.
+    """
+    web_driver_utility.set_texts({})
+
+    web_driver_utility.driver.execute_script.assert_not_called()
+
+
+def test_fused_weigh_sets_script_timeout_once(web_driver_utility):
+    """
+    Test that the script timeout is only sent to the browser when it changes.
+    """
+    web_driver_utility.driver.execute_async_script.return_value = {'result': '=', 'timings': {'wait': 5.0}}
+
+    web_driver_utility.fused_weigh({"left_0": "0", "right_0": "1"})
+    outcome = web_driver_utility.fused_weigh({"left_0": "2", "right_0": "3"})
+
+    assert outcome['result'] == '='
+    web_driver_utility.driver.set_script_timeout.assert_called_once_with(15)
+
+
+def test_wait_for_element_success(web_driver_utility):
+    """Test that waiting for an element runs a single script with the expected texts."""
+    web_driver_utility.driver.execute_async_script.return_value = {'matched': True, 'text': '<', 'elapsed': 12.0}
+
+    web_driver_utility.wait_for_element("reset", ["<", ">", "="])
+
+    args = web_driver_utility.driver.execute_async_script.call_args.args
+    assert args[1:3] == ("reset", "id")
+    assert args[3]["texts"] == ["<", ">", "="]
+    web_driver_utility.driver.find_element.assert_not_called()
+
+
+def test_wait_for_condition_adaptive_timeout(web_driver_utility):
+    """Test that the wait timeout adapts to the observed latencies."""
+    web_driver_utility.driver.execute_async_script.return_value = {'matched': True, 'text': '', 'elapsed': 500.0}
+
+    for _ in range(20):
+        web_driver_utility.wait_for_condition("weigh", enabled=True)
+    web_driver_utility.wait_for_condition("weigh", enabled=True)
+
+    # 4 times the p99 of 0.5s instead of the initial 10s
+    assert web_driver_utility.driver.execute_async_script.call_args.args[4] == 2000
+    assert web_driver_utility.timeout_for("id:weigh").timeout() == pytest.approx(2.0)
+
+
+def test_get_alert_text_timeout(web_driver_utility):
+    """Test that waiting for an alert that never opens raises a TimeoutException."""
+    type(web_driver_utility.driver.switch_to).alert = PropertyMock(side_effect=NoAlertPresentException())
+
+    with pytest.raises(TimeoutException):
+        web_driver_utility.wait_for_alert(timeout=0.1)
+
+
+def test_element_cache_hit(web_driver_utility):
+    """Test that a second lookup of the same ID reuses the cached handle."""
+    mock_button = MagicMock()
+    web_driver_utility.driver.find_element.return_value = mock_button
+
+    web_driver_utility.click_button_by_id("weigh")
+    web_driver_utility.click_button_by_id("weigh")
+
+    web_driver_utility.driver.find_element.assert_called_once_with(By.ID, "weigh")
+    assert mock_button.click.call_count == 2
+    assert web_driver_utility.cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_element_cache_stale_retry(web_driver_utility):
+    """Test that a stale handle is found again and the action retried."""
+    stale_element = MagicMock()
+    stale_element.click.side_effect = StaleElementReferenceException()
+    fresh_element = MagicMock()
+    web_driver_utility.driver.find_element.side_effect = [stale_element, fresh_element]
+
+    web_driver_utility.click_button_by_id("weigh")
+
+    fresh_element.click.assert_called_once()
+    assert web_driver_utility.elements["weigh"] is fresh_element
+
+
+def test_navigate_invalidates_cache(web_driver_utility):
+    """Test that opening a page drops the cached handles."""
+    web_driver_utility.driver.find_element.return_value = MagicMock()
+    web_driver_utility.get_text("reset")
+
+    web_driver_utility.navigate("http://localhost/")
+    web_driver_utility.get_text("reset")
+
+    web_driver_utility.driver.get.assert_called_once_with("http://localhost/")
+    assert web_driver_utility.driver.find_element.call_count == 2
+
+
+def test_click_button_by_css_not_cached(web_driver_utility):
+    """Test that CSS lookups, which depend on the element state, are never cached."""
+    web_driver_utility.driver.find_element.return_value = MagicMock()
+
+    web_driver_utility.click_button_by_css("button#reset.button:not([disabled])")
+    web_driver_utility.click_button_by_css("button#reset.button:not([disabled])")
+
+    assert web_driver_utility.driver.find_element.call_count == 2
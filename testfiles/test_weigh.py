@@ -20,6 +20,7 @@ def gold_bar_weighing():
         gb.driver.find_element = MagicMock()
         gb.driver.find_element.return_value = mock_element
         mock_element.text = "="
+        gb.driver.execute_async_script.return_value = {'matched': True, 'text': '=', 'elapsed': 5.0}
         return gb
 
 
@@ -28,8 +29,8 @@ def test_weigh_success(gold_bar_weighing):
     Test the `weigh` method under successful conditions to ensure correct behavior.
     Asserts:
         - `enter_bars_on_bowl` is called with correct parameters for left and right bars.
-        - The 'weigh' and 'reset' buttons are accessed and clicked as expected.
-        - The final weighing result text is retrieved and actions are taken based on this result.
+        - The 'weigh' button is clicked.
+        - The result is read from the 'reset' element, which is not clicked.
     """
     gold_bar_weighing.enter_bars_on_bowl = MagicMock()
     gold_bar_weighing.driver.find_element().click = MagicMock()
@@ -44,3 +45,104 @@ def test_weigh_success(gold_bar_weighing):
     )
 
 
+
+
+def test_weigh_fused(gold_bar_weighing):
+    """
+    Test the fused `weigh` path, which runs the whole weighing in one script call.
+    Asserts:
+        - The result of the script is returned.
+        - No separate WebDriver commands are sent for the weigh and reset buttons.
+        - The in-page timings are recorded.
+    """
+    gold_bar_weighing.fused_weigh = True
+    gold_bar_weighing.driver.execute_async_script.return_value = {
+        'result': '<',
+        'timings': {'fill': 0.5, 'click': 0.1, 'wait': 20.0}
+    }
+
+    assert gold_bar_weighing.weigh([0, 1, 2], [3, 4, 5]) == '<'
+
+    values = gold_bar_weighing.driver.execute_async_script.call_args.args[1]
+    assert values == {'left_0': '0', 'left_1': '1', 'left_2': '2',
+                      'right_0': '3', 'right_1': '4', 'right_2': '5'}
+    gold_bar_weighing.driver.find_element.assert_not_called()
+    timings = gold_bar_weighing.weigh_timer.samples
+    assert set(timings) == {'fused', 'fused.fill', 'fused.click', 'fused.wait', 'fused.overhead'}
+    assert timings['fused.wait'] == [20.0]
+
+
+def test_weigh_fused_fill_rejected(gold_bar_weighing):
+    """
+    Test that the fused `weigh` path falls back to separate commands when the page
+    rejects the bar values.
+    Asserts:
+        The weigh button is clicked with a separate command and its result returned.
+    """
+    gold_bar_weighing.fused_weigh = True
+    gold_bar_weighing.driver.execute_async_script.side_effect = [
+        {'error': 'fill', 'failed': ['left_0'], 'timings': {'fill': 0.5}},
+        {'matched': True, 'text': '=', 'elapsed': 5.0}
+    ]
+
+    assert gold_bar_weighing.weigh([0], [1]) == '='
+    gold_bar_weighing.driver.find_element.assert_any_call(By.ID, "weigh")
+    assert list(gold_bar_weighing.weigh_timer.samples) == ['stepwise']
+
+
+def test_weigh_fused_timeout(gold_bar_weighing):
+    """
+    Test that the fused `weigh` path raises a TimeoutException when no result appears.
+    Asserts:
+        A TimeoutException is raised.
+    """
+    gold_bar_weighing.fused_weigh = True
+    gold_bar_weighing.driver.execute_async_script.return_value = {
+        'error': 'timeout', 'timings': {'wait': 10000.0}
+    }
+
+    with pytest.raises(TimeoutException):
+        gold_bar_weighing.weigh([0], [1])
+
+
+def test_weigh_without_reset(gold_bar_weighing):
+    """
+    Test that consecutive weighings keep the bowls, and wait for each new history entry.
+    Asserts:
+        - The reset button is not clicked.
+        - The second weighing only writes the changed cells.
+        - The second wait is for the second history entry.
+    """
+    gold_bar_weighing.driver.execute_script.return_value = []
+    gold_bar_weighing.driver.find_elements.return_value = []
+
+    gold_bar_weighing.weigh([0, 1, 2], [3, 4, 5])
+    gold_bar_weighing.weigh([0, 1, 2], [6, 7, 8])
+
+    gold_bar_weighing.driver.find_element.assert_has_calls([call(By.ID, "weigh")])
+    assert call(By.CSS_SELECTOR, "button#reset.button:not([disabled])") not in \
+        gold_bar_weighing.driver.find_element.call_args_list
+    fills = [c.args[1] for c in gold_bar_weighing.driver.execute_script.call_args_list]
+    assert fills[-1] == {'right_0': '6', 'right_1': '7', 'right_2': '8'}
+    waits = [c.args[1] for c in gold_bar_weighing.driver.execute_async_script.call_args_list]
+    assert waits == ["div.game-info ol li:nth-child(1)", "div.game-info ol li:nth-child(2)"]
+
+
+def test_weigh_resets_when_overwrite_rejected(gold_bar_weighing):
+    """
+    Test that the bowls are reset and filled again when the page does not take a new value.
+    Asserts:
+        The reset button is clicked and both bowls are written in full again.
+    """
+    gold_bar_weighing.driver.find_elements.return_value = []
+    gold_bar_weighing.driver.execute_script.return_value = []
+    gold_bar_weighing.weigh([0], [1])
+
+    gold_bar_weighing.driver.execute_script.side_effect = [["left_0"], [], [], []]
+    gold_bar_weighing.weigh([2], [1])
+
+    gold_bar_weighing.driver.find_element.assert_any_call(
+        By.CSS_SELECTOR, "button#reset.button:not([disabled])")
+    fills = [c.args[1] for c in gold_bar_weighing.driver.execute_script.call_args_list]
+    assert fills[-2:] == [{'left_0': '2'}, {'right_0': '1'}]
+    assert gold_bar_weighing.grid == {'left_0': '2', 'right_0': '1'}